@@ -13,9 +13,12 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 from pathlib import Path
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts" / "analysis"))
+from feature_store import get_store
+from style_basis import get_style_basis
 
 # Configuração visual
 sns.set_style("whitegrid")
@@ -24,8 +27,6 @@ plt.rcParams['font.size'] = 11
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent
-# analysis2/01_estilo_autoral/scripts -> linguistics_and_model_steering/metrics_filtered
-METRICS_FILE = BASE_DIR.parent.parent / "metrics_filtered" / "all_texts_filtered.csv"
 OUTPUT_DIR = BASE_DIR / "plots"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
@@ -39,11 +40,9 @@ print()
 
 # Carregar apenas textos originais
 print("[1/6] Carregando dados originais...")
-df = pd.read_csv(METRICS_FILE)
-df_orig = df[df['condition'] == 'original'].copy()
-
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-metric_cols = [col for col in df_orig.columns if col not in metadata_cols]
+store = get_store(dtype='float64')
+df_orig = store.frame('original')
+metric_cols = store.metric_cols
 
 print(f"   ✓ {len(df_orig)} textos originais")
 print(f"   ✓ {len(metric_cols)} métricas")
@@ -130,21 +129,15 @@ print("PC1 e PC2 capturam as direções de maior variação nos dados.")
 print("Autores próximos no gráfico = estilos similares.")
 print()
 
-# Normalizar métricas (tratar NaN: preencher com média da coluna)
-df_metrics = df_orig[metric_cols].copy()
-df_metrics = df_metrics.fillna(df_metrics.mean())
-
-scaler = StandardScaler()
-metrics_scaled = scaler.fit_transform(df_metrics)
-
-# PCA
-pca = PCA(n_components=2)
-pca_coords = pca.fit_transform(metrics_scaled)
+# Normalizar métricas (tratar NaN: preencher com média da coluna) e projetar
+# na base PCA dos originais (ajustada uma vez e compartilhada entre scripts)
+basis = get_style_basis()
+pca_coords = basis.project(store.filled('original'), n_components=2)
 
 df_orig['PC1'] = pca_coords[:, 0]
 df_orig['PC2'] = pca_coords[:, 1]
 
-var_explained = pca.explained_variance_ratio_
+var_explained = basis.explained_variance_ratio_[:2]
 print(f"Variância explicada:")
 print(f"   • PC1: {var_explained[0]*100:.2f}%")
 print(f"   • PC2: {var_explained[1]*100:.2f}%")
@@ -184,11 +177,7 @@ print("Loading alto (positivo ou negativo) = métrica importante para aquela dim
 print()
 
 # Extrair loadings
-loadings = pd.DataFrame(
-    pca.components_.T,
-    columns=['PC1', 'PC2'],
-    index=metric_cols
-)
+loadings = basis.loadings(n_components=2)
 
 # Top 10 métricas para PC1
 print("Top 10 métricas que mais contribuem para PC1:")
@@ -2,18 +2,20 @@
 Visualização das 3 métricas-chave dos textos originais.
 Padrão consistente com as comparações baseline/prompt/activation.
 """
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts" / "analysis"))
+from feature_store import get_store
+
 # Caminhos
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / 'plots'
 
 # Carregar dados originais
-df = pd.read_csv("../../metrics_filtered/all_texts_filtered.csv")
-df_orig = df[df['condition'] == 'original'].copy()
+df_orig = get_store().frame('original')
 
 # Métricas-chave (mesmas das outras análises)
 metrics = {
@@ -5,12 +5,16 @@ Análise detalhada do PC3: Repetição vs. Diversidade Lexical
 Objetivo: Entender como cada autor se comporta no eixo de variabilidade estilística.
 """
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts" / "analysis"))
+from feature_store import get_store
+from style_basis import get_style_basis
+
 # Configuração
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (14, 10)
@@ -24,27 +28,14 @@ print("ANÁLISE DETALHADA: PC3 - REPETIÇÃO VS. DIVERSIDADE")
 print("=" * 80)
 
 # Carregar dados originais com PC3
-df = pd.read_csv(BASE_DIR / "metrics_filtered/all_texts_filtered.csv")
-df_orig = df[df['condition'] == 'original'].copy()
-
-# Recarregar loadings e dados de PCA
-loadings = pd.read_csv(OUTPUT_DIR / "pca_loadings_5components.csv", index_col=0)
-
-# Recalcular PCA para obter PC3
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-metric_cols = [col for col in df_orig.columns if col not in metadata_cols]
-
-df_metrics = df_orig[metric_cols].copy()
-df_metrics = df_metrics.fillna(df_metrics.mean())
-
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
-
-scaler = StandardScaler()
-metrics_scaled = scaler.fit_transform(df_metrics)
-
-pca = PCA(n_components=5)
-pca_coords = pca.fit_transform(metrics_scaled)
+store = get_store(dtype='float64')
+df_orig = store.frame('original')
+
+# Loadings e coordenadas da base PCA compartilhada (5 componentes)
+metric_cols = store.metric_cols
+basis = get_style_basis()
+loadings = basis.loadings(n_components=5)
+pca_coords = basis.project(store.filled('original'), n_components=5)
 
 df_orig['PC3'] = pca_coords[:, 2]
 
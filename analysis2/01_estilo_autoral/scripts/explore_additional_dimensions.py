@@ -6,14 +6,16 @@ Objetivo: Identificar PCs adicionais interpretáveis (PC3, PC4, PC5) e métricas
 individuais que tenham interpretação direta e diferenças significativas entre autores.
 """
 
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 from pathlib import Path
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
-from scipy import stats
+
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts" / "analysis"))
+from feature_store import get_store
+from style_basis import get_style_basis
+from batched_tests import group_tests
 
 # Configuração visual
 sns.set_style("whitegrid")
@@ -22,7 +24,6 @@ plt.rcParams['font.size'] = 10
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent
-METRICS_FILE = BASE_DIR / "metrics_filtered/all_texts_filtered.csv"
 OUTPUT_DIR = BASE_DIR / "analysis2"
 
 print("=" * 80)
@@ -30,11 +31,9 @@ print("EXPLORAÇÃO: DIMENSÕES ADICIONAIS E MÉTRICAS INDIVIDUAIS")
 print("=" * 80)
 
 # Carregar dados
-df = pd.read_csv(METRICS_FILE)
-df_orig = df[df['condition'] == 'original'].copy()
-
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-metric_cols = [col for col in df_orig.columns if col not in metadata_cols]
+store = get_store(dtype='float64')
+df_orig = store.frame('original')
+metric_cols = store.metric_cols
 
 print(f"\n✓ {len(df_orig)} textos originais, {len(metric_cols)} métricas")
 
@@ -45,21 +44,14 @@ print("\n" + "=" * 80)
 print("[1/3] ANÁLISE DE 5 COMPONENTES PRINCIPAIS")
 print("=" * 80)
 
-# Preparar dados
-df_metrics = df_orig[metric_cols].copy()
-df_metrics = df_metrics.fillna(df_metrics.mean())
-
-scaler = StandardScaler()
-metrics_scaled = scaler.fit_transform(df_metrics)
-
-# PCA com 5 componentes
-pca = PCA(n_components=5)
-pca_coords = pca.fit_transform(metrics_scaled)
+# PCA com 5 componentes (NaN → média da coluna, z-score; base compartilhada)
+basis = get_style_basis()
+pca_coords = basis.project(store.filled('original'), n_components=5)
 
 for i in range(5):
     df_orig[f'PC{i+1}'] = pca_coords[:, i]
 
-var_explained = pca.explained_variance_ratio_
+var_explained = basis.explained_variance_ratio_[:5]
 
 print("\nVariância explicada por componente:")
 cumulative_var = 0
@@ -68,11 +60,7 @@ for i, var in enumerate(var_explained, 1):
     print(f"   PC{i}: {var*100:.2f}% (acumulado: {cumulative_var*100:.2f}%)")
 
 # Loadings para todos os PCs
-loadings = pd.DataFrame(
-    pca.components_.T,
-    columns=[f'PC{i}' for i in range(1, 6)],
-    index=metric_cols
-)
+loadings = basis.loadings(n_components=5)
 
 print("\n" + "-" * 80)
 print("LOADINGS: Top 10 métricas por componente")
@@ -100,44 +88,22 @@ print("=" * 80)
 print("\n[Conceito] ANOVA (Analysis of Variance):")
 print("Testa se as médias de uma métrica diferem significativamente entre autores.")
 print("p-value < 0.05 = diferença estatisticamente significativa")
+print("Kruskal-Wallis (postos) como alternativa não paramétrica; p_value_fdr / kruskal_p_fdr corrigidos por FDR")
 print()
 
-# ANOVA para cada métrica
-anova_results = []
+# ANOVA e Kruskal-Wallis para todas as métricas de uma vez (NaN ignorados por
+# métrica; eta² = SS_entre / SS_total sobre os valores observados; FDR de
+# Benjamini-Hochberg sobre as 65 métricas)
+anova_df = group_tests(df_orig, metric_cols, 'author')
 
-for metric in metric_cols:
-    # Separar dados por autor
-    groups = [df_orig[df_orig['author'] == author][metric].dropna() 
-              for author in df_orig['author'].unique()]
-    
-    # ANOVA
-    f_stat, p_value = stats.f_oneway(*groups)
-    
-    # Calcular effect size (eta-squared)
-    author_means = df_orig.groupby('author')[metric].mean()
-    overall_mean = df_orig[metric].mean()
-    
-    ss_between = sum(len(df_orig[df_orig['author'] == author]) * 
-                     (author_means[author] - overall_mean)**2 
-                     for author in df_orig['author'].unique())
-    ss_total = sum((df_orig[metric] - overall_mean)**2)
-    
-    eta_squared = ss_between / ss_total if ss_total > 0 else 0
-    
-    # CV inter-autor
-    cv = author_means.std() / author_means.mean() if author_means.mean() != 0 else 0
-    
-    anova_results.append({
-        'metric': metric,
-        'f_statistic': f_stat,
-        'p_value': p_value,
-        'eta_squared': eta_squared,
-        'cv': abs(cv),
-        'significant': 'Sim' if p_value < 0.05 else 'Não',
-        'type': 'Léxica' if metric.startswith('basic_') else 'Sintática'
-    })
-
-anova_df = pd.DataFrame(anova_results).sort_values('eta_squared', ascending=False)
+# CV inter-autor
+author_means = df_orig.groupby('author')[metric_cols].mean()
+cv = (author_means.std() / author_means.mean()).where(author_means.mean() != 0, 0)
+
+anova_df['cv'] = cv.abs().to_numpy()
+anova_df['significant'] = np.where(anova_df['p_value'] < 0.05, 'Sim', 'Não')
+anova_df['type'] = np.where(anova_df['metric'].str.startswith('basic_'), 'Léxica', 'Sintática')
+anova_df = anova_df.sort_values('eta_squared', ascending=False)
 
 print("Top 20 métricas com maior effect size (eta-squared):")
 print("(eta² > 0.14 = efeito grande, > 0.06 = médio, > 0.01 = pequeno)")
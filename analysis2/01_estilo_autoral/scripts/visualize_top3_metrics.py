@@ -11,16 +11,19 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 from pathlib import Path
 from scipy import stats
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts" / "analysis"))
+from feature_store import get_store
+
 # Configuração
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (18, 12)
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent
-METRICS_FILE = BASE_DIR / "metrics_filtered/all_texts_filtered.csv"
 OUTPUT_DIR = BASE_DIR / "analysis2"
 
 print("=" * 80)
@@ -28,8 +31,7 @@ print("VISUALIZAÇÕES: 3 MÉTRICAS INDIVIDUAIS MAIS INTERPRETÁVEIS")
 print("=" * 80)
 
 # Carregar dados
-df = pd.read_csv(METRICS_FILE)
-df_orig = df[df['condition'] == 'original'].copy()
+df_orig = get_store(dtype='float64').frame('original')
 
 colors = {'lispector': '#E63946', 'woolf': '#457B9D', 
           'wikipedia_pt': '#F1A208', 'wikipedia_eng': '#2A9D8F'}
@@ -2,22 +2,22 @@
 Comparação consolidada: Original vs Todos os Métodos de Steering
 Visualização unificada das 3 métricas-chave
 """
-import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts" / "analysis"))
+from feature_store import get_store
+
 # Criar diretórios
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / 'plots'
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-# Carregar dados
-df = pd.read_csv("../../metrics_filtered/all_texts_filtered.csv")
-
 # Filtrar condições relevantes
 conditions = ['original', 'baseline', 'prompt_steering', 'activation_steering']
-df_comp = df[df['condition'].isin(conditions)].copy()
+df_comp = get_store().frame(conditions)
 
 # Métricas padronizadas
 metrics = {
@@ -2,34 +2,32 @@
 Supervisualização PCA: Movimentação de todos os métodos de steering
 Mostra Original → Baseline, Prompt Steering e Activation Steering no mesmo espaço
 """
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from sklearn.decomposition import PCA
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scripts" / "analysis"))
+from feature_store import get_store
+from style_basis import get_style_basis, style_coordinates
+
 # Criar diretórios
 BASE_DIR = Path(__file__).parent.parent
 OUTPUT_DIR = BASE_DIR / 'plots'
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
 # Carregar dados
-df = pd.read_csv("../../metrics_filtered/all_texts_filtered.csv")
+store = get_store()
+authors = sorted(store.meta['author'].unique())
 
 # Preparar PCA (EXATAMENTE como nas análises individuais)
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-metric_cols = [col for col in df.columns if col not in metadata_cols]
-
-# Treinar StandardScaler e PCA APENAS nos ORIGINAIS
-df_orig = df[df['condition'] == 'original'].copy()
-df_metrics_orig = df_orig[metric_cols].fillna(df_orig[metric_cols].mean())
-
-from sklearn.preprocessing import StandardScaler
-scaler = StandardScaler()
-scaler.fit(df_metrics_orig)
+# StandardScaler e PCA treinados APENAS nos ORIGINAIS (base compartilhada)
+basis = get_style_basis()
 
-pca = PCA(n_components=2)
-pca.fit(scaler.transform(df_metrics_orig))
+# Projetar todos os textos de uma vez (NaN → média de cada autor × condição)
+# e calcular o centróide de cada autor em cada condição
+coords = style_coordinates(store, basis, by=('condition', 'author'))
+centroids = coords.join(store.meta[['author', 'condition']]).groupby(['author', 'condition']).mean()
 
 # Cores por autor
 colors = {
@@ -50,12 +48,9 @@ styles = {
 fig, ax = plt.subplots(figsize=(14, 10))
 
 # Processar cada autor
-for author in sorted(df['author'].unique()):
+for author in authors:
     # Original (ponto de partida)
-    df_author_orig = df[(df['author'] == author) & (df['condition'] == 'original')]
-    X_author_orig = df_author_orig[metric_cols].fillna(df_author_orig[metric_cols].mean())
-    orig_pca = pca.transform(scaler.transform(X_author_orig))
-    orig_mean = orig_pca.mean(axis=0)
+    orig_mean = centroids.loc[(author, 'original')].to_numpy()
     
     # Plotar ponto original
     ax.scatter(orig_mean[0], orig_mean[1], s=200, color=colors[author], 
@@ -71,11 +66,8 @@ for author in sorted(df['author'].unique()):
     
     # Para cada método de steering
     for method in ['baseline', 'prompt_steering', 'activation_steering']:
-        df_method = df[(df['author'] == author) & (df['condition'] == method)]
-        if len(df_method) > 0:
-            X_method = df_method[metric_cols].fillna(df_method[metric_cols].mean())
-            method_pca = pca.transform(scaler.transform(X_method))
-            method_mean = method_pca.mean(axis=0)
+        if (author, method) in centroids.index:
+            method_mean = centroids.loc[(author, method)].to_numpy()
             
             # Desenhar linha do original para o método (sem seta)
             dx = method_mean[0] - orig_mean[0]
@@ -95,9 +87,9 @@ for author in sorted(df['author'].unique()):
                       linewidth=1.5, alpha=0.9, zorder=7)
 
 # Configuração do gráfico
-ax.set_xlabel(f'PC1 - Complexidade Linguística ({pca.explained_variance_ratio_[0]*100:.1f}% da variância)', 
+ax.set_xlabel(f'PC1 - Complexidade Linguística ({basis.explained_variance_ratio_[0]*100:.1f}% da variância)', 
              fontsize=13, fontweight='bold')
-ax.set_ylabel(f'PC2 - Estilo Verbal/Nominal ({pca.explained_variance_ratio_[1]*100:.1f}% da variância)', 
+ax.set_ylabel(f'PC2 - Estilo Verbal/Nominal ({basis.explained_variance_ratio_[1]*100:.1f}% da variância)', 
              fontsize=13, fontweight='bold')
 ax.set_title('Movimentação no Espaço PCA: Original → Métodos de Steering', 
             fontsize=16, fontweight='bold', pad=20)
@@ -157,21 +149,15 @@ print("\n" + "="*80)
 print("ANÁLISE DE DESLOCAMENTOS NO ESPAÇO PCA")
 print("="*80 + "\n")
 
-for author in sorted(df['author'].unique()):
+for author in authors:
     print(f"\n{author.upper().replace('_', ' ')}:")
     print("-" * 60)
     
-    df_author_orig = df[(df['author'] == author) & (df['condition'] == 'original')]
-    X_author_orig = df_author_orig[metric_cols].fillna(df_author_orig[metric_cols].mean())
-    orig_pca = pca.transform(scaler.transform(X_author_orig))
-    orig_mean = orig_pca.mean(axis=0)
+    orig_mean = centroids.loc[(author, 'original')].to_numpy()
     
     for method in ['baseline', 'prompt_steering', 'activation_steering']:
-        df_method = df[(df['author'] == author) & (df['condition'] == method)]
-        if len(df_method) > 0:
-            X_method = df_method[metric_cols].fillna(df_method[metric_cols].mean())
-            method_pca = pca.transform(scaler.transform(X_method))
-            method_mean = method_pca.mean(axis=0)
+        if (author, method) in centroids.index:
+            method_mean = centroids.loc[(author, method)].to_numpy()
             
             displacement = np.linalg.norm(method_mean - orig_mean)
             direction_pc1 = method_mean[0] - orig_mean[0]
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Comparação: Original vs Métodos de Steering (motor único)
+
+Substitui os scripts copiados de 02_baseline_vs_original,
+03_prompt_steering_vs_original e 04_activation_steering_vs_original, que
+diferiam apenas no nome da condição. Todas as condições são processadas de
+uma vez:
+
+- Mudanças nas métricas-chave: média/desvio/n por condição × autor em um
+  único groupby
+- Movimento no espaço PCA dos originais: todos os textos em uma única
+  projeção (base compartilhada de `style_basis.py`), centros por
+  condição × autor em um único groupby
+- Decomposição do deslocamento em ΔPC1 / ΔPC2
+
+Cada condição continua gravando seus resultados na própria pasta
+(`dados/metric_changes.csv`, `dados/pca_movement.csv`,
+`dados/displacement_decomposition.csv` e os gráficos em `plots/`).
+Uma condição nova entra como mais um grupo no mesmo cálculo; sem entrada em
+METHODS, grava em `analysis2/<condição>_vs_original/`.
+
+Uso:
+    python compare_methods_vs_original.py
+    python compare_methods_vs_original.py --conditions baseline --no-plots
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.patches import Patch
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts" / "analysis"))
+from feature_store import FeatureStore, get_store
+from style_basis import StyleBasis, get_style_basis, style_coordinates
+
+ANALYSIS2_DIR = Path(__file__).resolve().parent
+
+# Pasta, rótulo e prefixo das colunas em pca_movement.csv de cada condição
+METHODS = {
+    'baseline': {'dir': '02_baseline_vs_original', 'label': 'Baseline', 'prefix': 'base'},
+    'prompt_steering': {'dir': '03_prompt_steering_vs_original', 'label': 'Prompt Steering', 'prefix': 'prompt'},
+    'activation_steering': {'dir': '04_activation_steering_vs_original', 'label': 'Activation Steering', 'prefix': 'act'},
+}
+
+# Métricas padronizadas
+KEY_METRICS = {
+    'basic_ttr': 'Riqueza Vocabular (TTR)',
+    'basic_tokens_per_sentence_mean': 'Tamanho de Frases',
+    'synt_UPOS_PRON_prop': 'Densidade de Pronomes'
+}
+
+COLORS = {'lispector': '#E63946', 'woolf': '#457B9D',
+          'wikipedia_pt': '#F1A208', 'wikipedia_eng': '#2A9D8F'}
+
+
+def method_info(condition: str) -> Dict[str, str]:
+    """Pasta/rótulo/prefixo da condição (padrão para condições novas)."""
+    return METHODS.get(condition, {
+        'dir': f'{condition}_vs_original',
+        'label': condition.replace('_', ' ').title(),
+        'prefix': condition
+    })
+
+
+# ============================================================================
+# CÁLCULO (todas as condições de uma vez)
+# ============================================================================
+
+def key_metric_stats(store: FeatureStore, conditions: List[str]) -> pd.DataFrame:
+    """
+    Média, desvio e n das métricas-chave por condição × autor.
+
+    Returns
+    -------
+    DataFrame com índice (condition, author) e colunas (métrica, estatística)
+    """
+    df = store.frame(['original'] + list(conditions))
+    return df.groupby(['condition', 'author'])[list(KEY_METRICS)].agg(['mean', 'std', 'count'])
+
+
+def metric_changes(stats: pd.DataFrame, conditions: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Mudança percentual da média de cada métrica-chave (original → condição).
+
+    Returns
+    -------
+    dict condição → DataFrame metric, author, original, <condição>, change_pct
+    (uma linha por métrica × autor, autores em ordem alfabética)
+    """
+    means = stats.xs('mean', axis=1, level=1)
+    orig = means.loc['original']
+    generated = means.loc[list(conditions)]
+    change = generated.sub(orig, level='author').div(orig, level='author') * 100
+
+    # (métrica, autor) na ordem de KEY_METRICS e autores ordenados
+    orig_long = orig.T.stack()
+    tables = {}
+    for condition in conditions:
+        gen_long = generated.loc[condition].T.stack().reindex(orig_long.index)
+        change_long = change.loc[condition].T.stack().reindex(orig_long.index)
+        tables[condition] = pd.DataFrame({
+            'metric': orig_long.index.get_level_values(0).map(KEY_METRICS),
+            'author': orig_long.index.get_level_values(1),
+            'original': orig_long.to_numpy(),
+            condition: gen_long.to_numpy(),
+            'change_pct': change_long.to_numpy()
+        })
+    return tables
+
+
+def pca_centers(store: FeatureStore, basis: StyleBasis, conditions: List[str]):
+    """
+    Coordenadas PC1/PC2 de todos os textos e centro de cada condição × autor.
+
+    NaN são preenchidos com a média da própria condição antes da projeção.
+
+    Returns
+    -------
+    (points, centers)
+        points: metadados + PC1, PC2 (originais e condições pedidas)
+        centers: índice (condition, author), colunas PC1, PC2
+    """
+    coords = style_coordinates(store, basis)
+    rows = store.rows(['original'] + list(conditions))
+    points = store.meta.iloc[rows].join(coords)
+    centers = points.groupby(['condition', 'author'])[['PC1', 'PC2']].mean()
+    return points, centers
+
+
+def pca_movement(centers: pd.DataFrame, authors: List[str], conditions: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Deslocamento do centro de cada autor (original → condição) no plano PC1 × PC2.
+
+    Returns
+    -------
+    dict condição → (pca_movement, displacement_decomposition)
+    """
+    orig = centers.loc['original'].reindex(authors)
+    generated = centers.loc[list(conditions)]
+    delta = generated.sub(orig, level='author')
+    distance = np.sqrt(delta['PC1'] ** 2 + delta['PC2'] ** 2)
+
+    results = {}
+    for condition in conditions:
+        prefix = method_info(condition)['prefix']
+        gen = generated.loc[condition].reindex(authors)
+        d = delta.loc[condition].reindex(authors)
+        dist = distance.loc[condition].reindex(authors)
+
+        movement = pd.DataFrame({
+            'author': authors,
+            'orig_PC1': orig['PC1'].to_numpy(),
+            'orig_PC2': orig['PC2'].to_numpy(),
+            f'{prefix}_PC1': gen['PC1'].to_numpy(),
+            f'{prefix}_PC2': gen['PC2'].to_numpy(),
+            'distance': dist.to_numpy(),
+            'delta_PC1': d['PC1'].to_numpy(),
+            'delta_PC2': d['PC2'].to_numpy()
+        })
+        decomposition = pd.DataFrame({
+            'author': authors,
+            'delta_PC1': d['PC1'].to_numpy(),
+            'delta_PC2': d['PC2'].to_numpy(),
+            'abs_delta_PC1': d['PC1'].abs().to_numpy(),
+            'abs_delta_PC2': d['PC2'].abs().to_numpy(),
+            'distance_total': dist.to_numpy()
+        })
+        results[condition] = (movement.sort_values('distance', ascending=False), decomposition)
+    return results
+
+
+# ============================================================================
+# VISUALIZAÇÃO (uma figura por condição)
+# ============================================================================
+
+def plot_key_metrics(stats: pd.DataFrame, condition: str, output_path: Path) -> None:
+    """Barras original vs condição (média ± erro padrão) para as 3 métricas-chave."""
+    label = method_info(condition)['label']
+    authors = sorted(stats.loc['original'].index)
+    x_orig = np.arange(len(authors))
+    x_method = x_orig + 0.35
+    width = 0.35
+
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+
+    for idx, (metric_key, metric_name) in enumerate(KEY_METRICS.items()):
+        ax = axes[idx]
+        for i, author in enumerate(authors):
+            for x, cond, style in [(x_orig[i], 'original', dict(alpha=0.7)),
+                                   (x_method[i], condition, dict(alpha=0.3, hatch='//'))]:
+                mean, std, n = stats.loc[(cond, author), metric_key]
+                # Usar erro padrão da média (SEM) ao invés de std
+                ax.bar(x, mean, width, yerr=std / np.sqrt(n), color=COLORS[author],
+                       edgecolor='black', linewidth=1.5, capsize=4, **style)
+
+        ax.set_ylabel(metric_name, fontsize=12, weight='bold')
+        ax.set_title(metric_name, fontsize=13, weight='bold')
+        ax.set_xticks(list(x_orig) + list(x_method))
+        ax.set_xticklabels(authors + authors, fontsize=8, rotation=15, ha='right')
+        ax.grid(True, alpha=0.3, axis='y')
+
+    legend_elements = [
+        Patch(facecolor='gray', alpha=0.7, label='Original'),
+        Patch(facecolor='gray', alpha=0.3, hatch='//', label=label)
+    ]
+    fig.legend(handles=legend_elements, loc='upper center', ncol=2,
+               fontsize=11, bbox_to_anchor=(0.5, 0.98))
+
+    plt.suptitle(f'Métricas-Chave: Original vs {label}\n(Barras cheias=Original, Barras listradas={label})',
+                 fontsize=14, weight='bold', y=1.05)
+    plt.tight_layout()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+def plot_pca_movement(
+    points: pd.DataFrame,
+    centers: pd.DataFrame,
+    basis: StyleBasis,
+    condition: str,
+    output_path: Path
+) -> None:
+    """Dispersão completa + movimento dos centros (com ΔPC1/ΔPC2) de uma condição."""
+    label = method_info(condition)['label']
+    authors = sorted(centers.loc['original'].index)
+    var = basis.explained_variance_ratio_
+
+    fig, axes = plt.subplots(1, 2, figsize=(18, 8))
+
+    # Plot 1: Scatter com todos os pontos
+    ax = axes[0]
+    for author in authors:
+        # Originais - pontos grandes
+        orig_data = points[(points['condition'] == 'original') & (points['author'] == author)]
+        ax.scatter(orig_data['PC1'], orig_data['PC2'],
+                   c=COLORS[author], s=150, alpha=0.8,
+                   edgecolors='black', linewidth=2, label=f'{author} (orig)',
+                   marker='o')
+
+        # Método - pontos pequenos com transparência
+        method_data = points[(points['condition'] == condition) & (points['author'] == author)]
+        ax.scatter(method_data['PC1'], method_data['PC2'],
+                   c=COLORS[author], s=30, alpha=0.3,
+                   edgecolors='none', marker='o')
+
+    ax.axhline(y=0, color='gray', linestyle='--', linewidth=1, alpha=0.5)
+    ax.axvline(x=0, color='gray', linestyle='--', linewidth=1, alpha=0.5)
+    ax.set_xlabel(f'PC1 ({var[0]*100:.1f}%) - Complexidade Sintática', fontsize=12, weight='bold')
+    ax.set_ylabel(f'PC2 ({var[1]*100:.1f}%) - Verbal vs Nominal', fontsize=12, weight='bold')
+    ax.set_title(f'Distribuição Completa: Original vs {label}\n'
+                 f'(Pontos grandes=Original, Pontos pequenos={label})',
+                 fontsize=13, weight='bold')
+    ax.legend(fontsize=9, loc='best')
+    ax.grid(True, alpha=0.3)
+
+    # Plot 2: Centros com setas de movimento
+    ax = axes[1]
+    for author in authors:
+        orig_center = tuple(centers.loc[('original', author)])
+        method_center = tuple(centers.loc[(condition, author)])
+
+        delta_pc1 = method_center[0] - orig_center[0]
+        delta_pc2 = method_center[1] - orig_center[1]
+
+        # Linhas tracejadas para componentes horizontal (ΔPC1) e vertical (ΔPC2)
+        ax.plot([orig_center[0], method_center[0]], [orig_center[1], orig_center[1]],
+                linestyle='--', color=COLORS[author], linewidth=2.5, alpha=0.5, zorder=5)
+        ax.plot([method_center[0], method_center[0]], [orig_center[1], method_center[1]],
+                linestyle='--', color=COLORS[author], linewidth=2.5, alpha=0.5, zorder=5)
+
+        # Plotar centros
+        ax.scatter(*orig_center, c=COLORS[author], s=300, alpha=0.8,
+                   edgecolors='black', linewidth=3, marker='o', zorder=10)
+        ax.scatter(*method_center, c=COLORS[author], s=300, alpha=0.4,
+                   edgecolors='black', linewidth=3, marker='s', zorder=10)
+
+        # Seta de movimento (diagonal - distância total)
+        ax.annotate('', xy=method_center, xytext=orig_center,
+                    arrowprops=dict(arrowstyle='->', lw=3, color=COLORS[author], alpha=0.7))
+
+        # Label do autor
+        ax.text(orig_center[0], orig_center[1] + 0.3, author,
+                ha='center', fontsize=10, weight='bold')
+
+        # Distância total (diagonal)
+        dist = np.sqrt(delta_pc1**2 + delta_pc2**2)
+        mid_x = (orig_center[0] + method_center[0]) / 2
+        mid_y = (orig_center[1] + method_center[1]) / 2
+        ax.text(mid_x, mid_y - 0.3, f'd={dist:.2f}',
+                ha='center', fontsize=9, style='italic', weight='bold',
+                bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.8))
+
+        # Label ΔPC1 (horizontal)
+        ax.text(mid_x, orig_center[1] - 0.25, f'Δ₁={abs(delta_pc1):.2f}',
+                fontsize=8, ha='center', style='italic', color=COLORS[author],
+                weight='bold', alpha=0.9)
+
+        # Label ΔPC2 (vertical)
+        v_mid_y = (orig_center[1] + method_center[1]) / 2
+        ax.text(method_center[0] + 0.35, v_mid_y, f'Δ₂={abs(delta_pc2):.2f}',
+                fontsize=8, va='center', style='italic', color=COLORS[author],
+                weight='bold', alpha=0.9)
+
+    ax.axhline(y=0, color='gray', linestyle='--', linewidth=1, alpha=0.5)
+    ax.axvline(x=0, color='gray', linestyle='--', linewidth=1, alpha=0.5)
+    ax.set_xlabel('PC1 - Complexidade Sintática', fontsize=12, weight='bold')
+    ax.set_ylabel('PC2 - Verbal vs Nominal', fontsize=12, weight='bold')
+    ax.set_title(f'Movimento dos Centros: Original → {label}\n(Círculos=Original, Quadrados={label})',
+                 fontsize=13, weight='bold')
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+# ============================================================================
+# EXECUÇÃO
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare steering conditions against the original texts')
+    parser.add_argument('--conditions', nargs='+', default=list(METHODS),
+                        help='Conditions to compare (default: baseline prompt_steering activation_steering)')
+    parser.add_argument('--no-plots', action='store_true', help='Only write the dados/ tables')
+
+    args = parser.parse_args()
+    conditions = args.conditions
+
+    store = get_store(dtype='float64')
+    missing = [c for c in conditions if len(store.rows(c)) == 0]
+    if missing:
+        parser.error(f"condições sem textos: {', '.join(missing)}")
+
+    print("=" * 70)
+    print(f"COMPARAÇÃO ORIGINAL VS {len(conditions)} CONDIÇÕES")
+    print("=" * 70)
+
+    print("\n[1/3] Métricas-chave por condição × autor...")
+    stats = key_metric_stats(store, conditions)
+    changes = metric_changes(stats, conditions)
+
+    print("[2/3] Projetando todos os textos na base PCA dos originais...")
+    basis = get_style_basis()
+    points, centers = pca_centers(store, basis, conditions)
+    authors = store.frame('original')['author'].unique().tolist()
+    movements = pca_movement(centers, authors, conditions)
+
+    print("[3/3] Gravando resultados por condição...")
+    for condition in conditions:
+        info = method_info(condition)
+        out_dir = ANALYSIS2_DIR / info['dir']
+        dados_dir = out_dir / "dados"
+        dados_dir.mkdir(parents=True, exist_ok=True)
+
+        changes_df = changes[condition]
+        movement_df, decomposition_df = movements[condition]
+        changes_df.to_csv(dados_dir / "metric_changes.csv", index=False)
+        movement_df.to_csv(dados_dir / "pca_movement.csv", index=False)
+        decomposition_df.to_csv(dados_dir / "displacement_decomposition.csv", index=False)
+
+        if not args.no_plots:
+            plot_key_metrics(stats, condition, out_dir / "plots/01_key_metrics_comparison.png")
+            plot_pca_movement(points, centers, basis, condition, out_dir / "plots/02_pca_movement.png")
+
+        print("\n" + "=" * 70)
+        print(f"MUDANÇAS: Original → {info['label']}")
+        print("=" * 70)
+        for metric_name, rows in changes_df.groupby('metric', sort=False):
+            print(f"\n{metric_name}:")
+            for row in rows.itertuples(index=False):
+                print(f"  {row.author:20s} {row.original:7.3f} → {getattr(row, condition):7.3f} "
+                      f"({row.change_pct:+6.1f}%)")
+
+        print("\nMOVIMENTO NO ESPAÇO PCA:")
+        print(movement_df.to_string(index=False))
+        print(f"\n✓ {info['dir']}/dados: metric_changes.csv, pca_movement.csv, displacement_decomposition.csv")
+        if not args.no_plots:
+            print(f"✓ {info['dir']}/plots: 01_key_metrics_comparison.png, 02_pca_movement.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,26 @@
 Análise de Qualidade das Métricas Extraídas
 
 Identifica métricas problemáticas:
-- Valores ausentes (NaN)
+- Valores ausentes (NaN), separando métrica ausente no texto de etapa que
+  falhou na extração (ledger `metrics/failures.csv`)
 - Variância zero ou muito baixa
 - Correlações altas (redundância)
 """
 
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).parent))
+from correlation_engine import high_correlation_pairs
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent
 METRICS_FILE = BASE_DIR / "metrics/full_text/individual/all_texts.csv"
+FAILURES_FILE = BASE_DIR / "metrics/failures.csv"
 OUTPUT_DIR = BASE_DIR / "analysis/01_metrics_quality"
 DATA_DIR = OUTPUT_DIR / "data"
 
@@ -40,29 +46,53 @@ print(f"   ✓ {len(metric_cols)} métricas para análise")
 
 # 2. Análise de valores ausentes
 print("\n[2/5] Analisando valores ausentes...")
+
+# Textos cuja etapa falhou na extração: NaN neles é falha, não métrica ausente
+STAGE_PREFIXES = {'basic': 'basic_', 'syntactic': 'synt_'}
+failed_ids = {stage: set() for stage in STAGE_PREFIXES}
+if FAILURES_FILE.exists():
+    failures = pd.read_csv(FAILURES_FILE)
+    failures = failures[failures['phase'] == 'full_text']
+    for stage, group in failures.groupby('stage'):
+        failed_ids.setdefault(stage, set()).update(group['text_id'])
+failed_masks = {stage: df['text_id'].isin(ids) for stage, ids in failed_ids.items()}
+no_failures = pd.Series(False, index=df.index)
+for stage in STAGE_PREFIXES:
+    print(f"   ✓ Textos com etapa {stage} falha (ledger): {failed_masks[stage].sum()}")
+
 nan_stats = []
 for col in metric_cols:
-    n_nan = df[col].isna().sum()
-    pct_nan = (n_nan / len(df)) * 100
+    stage = next((s for s, prefix in STAGE_PREFIXES.items() if col.startswith(prefix)), None)
+    failed = failed_masks.get(stage, no_failures)
+    is_nan = df[col].isna()
+    n_nan = is_nan.sum()
+    n_failed = (is_nan & failed).sum()
+    n_processed = len(df) - failed.sum()
     nan_stats.append({
         'metric': col,
         'n_nan': n_nan,
-        'pct_nan': pct_nan
+        'pct_nan': (n_nan / len(df)) * 100,
+        'n_failed': n_failed,
+        'n_absent': n_nan - n_failed,
+        # Ausência legítima: entre os textos em que a etapa rodou
+        'pct_absent': ((n_nan - n_failed) / n_processed) * 100 if n_processed else np.nan
     })
 
-nan_df = pd.DataFrame(nan_stats).sort_values('pct_nan', ascending=False)
+nan_df = pd.DataFrame(nan_stats).sort_values('pct_absent', ascending=False)
 nan_df.to_csv(DATA_DIR / "nan_percentage.csv", index=False)
 
-# Contagem por categoria
-n_perfect = (nan_df['pct_nan'] == 0).sum()
-n_good = ((nan_df['pct_nan'] > 0) & (nan_df['pct_nan'] < 5)).sum()
-n_acceptable = ((nan_df['pct_nan'] >= 5) & (nan_df['pct_nan'] < 20)).sum()
-n_problematic = (nan_df['pct_nan'] >= 20).sum()
+# Contagem por categoria (ausência legítima; falhas de extração à parte)
+n_perfect = (nan_df['pct_absent'] == 0).sum()
+n_good = ((nan_df['pct_absent'] > 0) & (nan_df['pct_absent'] < 5)).sum()
+n_acceptable = ((nan_df['pct_absent'] >= 5) & (nan_df['pct_absent'] < 20)).sum()
+n_problematic = (nan_df['pct_absent'] >= 20).sum()
+n_with_failures = (nan_df['n_failed'] > 0).sum()
 
 print(f"   ✓ Métricas perfeitas (0% NaN): {n_perfect}")
 print(f"   ✓ Métricas boas (<5% NaN): {n_good}")
 print(f"   ✓ Métricas aceitáveis (5-20% NaN): {n_acceptable}")
 print(f"   ⚠ Métricas problemáticas (≥20% NaN): {n_problematic}")
+print(f"   ⚠ Métricas com NaN por falha de extração: {n_with_failures}")
 
 # 3. Análise de variância
 print("\n[3/5] Analisando variância...")
@@ -95,29 +125,17 @@ print(f"   ⚠ Métricas com variância muito baixa (<0.001): {n_very_low}")
 # 4. Análise de correlações
 print("\n[4/5] Analisando correlações...")
 # Apenas métricas com <20% NaN para correlação confiável
-valid_metrics = nan_df[nan_df['pct_nan'] < 20]['metric'].tolist()
-df_valid = df[valid_metrics].dropna()
+# (observações completas par a par: um NaN não descarta o texto inteiro)
+valid_metrics = nan_df[nan_df['pct_absent'] < 20]['metric'].tolist()
 
 print(f"   ✓ Calculando correlações para {len(valid_metrics)} métricas...")
 
-corr_matrix = df_valid.corr()
-
-# Encontrar pares com alta correlação (r ≥ 0.95)
-high_corr_pairs = []
-for i in range(len(corr_matrix.columns)):
-    for j in range(i+1, len(corr_matrix.columns)):
-        corr_value = corr_matrix.iloc[i, j]
-        if abs(corr_value) >= 0.95:
-            high_corr_pairs.append({
-                'metric_1': corr_matrix.columns[i],
-                'metric_2': corr_matrix.columns[j],
-                'correlation': corr_value
-            })
-
-corr_df = pd.DataFrame(high_corr_pairs).sort_values('correlation', ascending=False, key=abs)
+# Encontrar pares com alta correlação (r ≥ 0.95), triângulo superior em blocos
+corr_df = high_correlation_pairs(df, valid_metrics, threshold=0.95)
+corr_df = corr_df.sort_values('correlation', ascending=False, key=abs)
 corr_df.to_csv(DATA_DIR / "correlations_high.csv", index=False)
 
-print(f"   ⚠ Pares com correlação |r| ≥ 0.95: {len(high_corr_pairs)}")
+print(f"   ⚠ Pares com correlação |r| ≥ 0.95: {len(corr_df)}")
 
 # 5. Gerar relatório
 print("\n[5/5] Gerando relatório...")
@@ -130,7 +148,9 @@ report = f"""# Análise de Qualidade das Métricas
 - N métricas: {len(metric_cols)}
 
 ## Método
-Análise exploratória para identificar métricas problemáticas: valores ausentes (NaN), variância zero, e alta correlação (redundância).
+Análise exploratória para identificar métricas problemáticas: valores ausentes (NaN), variância zero, e alta correlação (redundância). Correlações de Pearson calculadas com observações completas par a par.
+
+Os percentuais de NaN contam apenas ausência legítima (a métrica não ocorre no texto), entre os textos em que a etapa que a produz rodou. NaN de textos cuja etapa falhou na extração (`metrics/failures.csv`) são contados à parte.
 
 ## Resultados
 
@@ -143,11 +163,15 @@ Análise exploratória para identificar métricas problemáticas: valores ausent
 | Aceitáveis (5-20% NaN) | {n_acceptable} | {n_acceptable/len(metric_cols)*100:.1f}% |
 | **Problemáticas (≥20% NaN)** | **{n_problematic}** | **{n_problematic/len(metric_cols)*100:.1f}%** |
 
+**Falhas de extração:** {failed_masks['basic'].sum()} textos com etapa léxica falha, {failed_masks['syntactic'].sum()} com etapa sintática falha ({n_with_failures} métricas afetadas).
+
 **Top 10 métricas com mais NaN:**
 """
 
 for idx, row in nan_df.head(10).iterrows():
-    report += f"\n- `{row['metric']}`: {row['pct_nan']:.1f}% NaN"
+    report += f"\n- `{row['metric']}`: {row['pct_absent']:.1f}% NaN"
+    if row['n_failed'] > 0:
+        report += f" (+ {row['n_failed']} textos com falha)"
 
 report += f"""
 
@@ -162,7 +186,7 @@ report += f"""
 
 ### 3. Correlações Altas
 
-- **N pares com \\|r\\| ≥ 0.95:** {len(high_corr_pairs)}
+- **N pares com \\|r\\| ≥ 0.95:** {len(corr_df)}
 - Indicam redundância: métricas medem praticamente a mesma coisa
 
 **Exemplo de pares altamente correlacionados:**
@@ -10,17 +10,41 @@ Critérios:
 3. Remover: Correlação |r| ≥ 0.95 (manter 1 por grupo)
 4. Remover: Contagens absolutas (manter apenas proporções)
 5. Remover: Métricas language-specific inconsistentes
+
+O resultado é gravado como spec (metrics_filtered/filter_spec.json), aplicada
+pelas etapas seguintes como projeção de colunas (ver filter_spec.py).
+
+Uso:
+    python 02_filter_metrics.py [--corr-threshold 0.95] [--priority REGEX ...] [--no-materialize]
 """
 
+import argparse
 import pandas as pd
 import numpy as np
+import sys
+from datetime import datetime
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).parent))
+from correlation_engine import high_correlation_pairs
+from filter_spec import (DEFAULT_PRIORITY, MATERIALIZED_FILE, SOURCE_FILE, SPEC_FILE,
+                         file_sha1, redundancy_clusters, save_filter_spec)
+
+parser = argparse.ArgumentParser(description='Filter metrics and write the filter spec')
+parser.add_argument('--corr-threshold', type=float, default=0.95,
+                    help='|r| threshold linking redundant metrics (default: 0.95)')
+parser.add_argument('--priority', type=str, nargs='+', default=DEFAULT_PRIORITY,
+                    help='Regex patterns, most preferred first, used to pick the kept metric of each redundant group')
+parser.add_argument('--no-materialize', dest='materialize', action='store_false',
+                    help=f'Do not rewrite {MATERIALIZED_FILE} (fallback when the full table is absent, '
+                         'and input of analysis2/)')
+args = parser.parse_args()
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent
-METRICS_FILE = BASE_DIR / "metrics/full_text/individual/all_texts.csv"
+METRICS_FILE = BASE_DIR / SOURCE_FILE
 QUALITY_DIR = BASE_DIR / "analysis/01_metrics_quality/data"
 OUTPUT_DIR = BASE_DIR / "metrics_filtered"
 
@@ -43,11 +67,13 @@ print(f"   ✓ {len(metric_cols)} métricas iniciais")
 # Carregar análises de qualidade
 nan_df = pd.read_csv(QUALITY_DIR / "nan_percentage.csv")
 var_df = pd.read_csv(QUALITY_DIR / "variance_stats.csv")
-corr_df = pd.read_csv(QUALITY_DIR / "correlations_high.csv")
 
 # 2. Filtro 1: Remover métricas com ≥20% NaN
+# Mesmo critério do 01: NaN de textos cuja etapa falhou na extração não
+# conta como ausência (pct_absent); relatórios antigos só têm pct_nan
 print("\n[2/6] Filtro 1: Valores ausentes...")
-problematic_nan = nan_df[nan_df['pct_nan'] >= 20]['metric'].tolist()
+absent_col = 'pct_absent' if 'pct_absent' in nan_df.columns else 'pct_nan'
+problematic_nan = nan_df[nan_df[absent_col] >= 20]['metric'].tolist()
 metrics_to_keep = [m for m in metric_cols if m not in problematic_nan]
 print(f"   ✗ Removidas: {len(problematic_nan)} métricas (≥20% NaN)")
 print(f"   ✓ Restantes: {len(metrics_to_keep)}")
@@ -69,52 +95,46 @@ print(f"   ✓ Restantes: {len(metrics_to_keep)}")
 # 5. Filtro 4: Resolver correlações altas (manter métricas mais interpretáveis)
 print("\n[5/6] Filtro 4: Correlações altas...")
 
-# Regras de preferência:
-# - Proporções > Distâncias médias
-# - DEPREL/UPOS props (mais interpretáveis)
-# - Remover total_words (redundante)
-
-to_remove_corr = set()
-
-# Priorizar proporções sobre distâncias médias
-for _, row in corr_df.iterrows():
-    m1, m2 = row['metric_1'], row['metric_2']
-    
-    # Se ambas estão na lista atual
-    if m1 in metrics_to_keep and m2 in metrics_to_keep:
-        # total_words é redundante (mesmo valor em DEPREL e UPOS)
-        if 'total_words' in m1:
-            to_remove_corr.add(m1)
-        elif 'total_words' in m2:
-            to_remove_corr.add(m2)
-        # Preferir proporção sobre distância média
-        elif m1.endswith('_md'):
-            to_remove_corr.add(m1)
-        elif m2.endswith('_md'):
-            to_remove_corr.add(m2)
-        # Se ambas são proporções, manter DEPREL (mais específico)
-        elif m1.startswith('synt_UPOS') and m2.startswith('synt_DEPREL'):
-            to_remove_corr.add(m1)
-        elif m2.startswith('synt_UPOS') and m1.startswith('synt_DEPREL'):
-            to_remove_corr.add(m2)
+# Grafo |r| ≥ limiar → componentes conexas (union-find); um representante
+# por componente, escolhido pela lista de prioridade (padrão: proporções >
+# léxicas/MDD > distâncias médias > total_words; ver DEFAULT_PRIORITY)
+corr_pairs = high_correlation_pairs(df, metrics_to_keep, threshold=args.corr_threshold)
+clusters = redundancy_clusters(corr_pairs, metrics_to_keep,
+                               threshold=args.corr_threshold, priority=args.priority)
+to_remove_corr = {m for cluster in clusters for m in cluster['removed']}
 
 metrics_to_keep = [m for m in metrics_to_keep if m not in to_remove_corr]
+print(f"   ✓ {len(corr_pairs)} pares |r| ≥ {args.corr_threshold} → {len(clusters)} grupos redundantes")
 print(f"   ✗ Removidas: {len(to_remove_corr)} métricas (correlação)")
 print(f"   ✓ Restantes: {len(metrics_to_keep)}")
 
-# 6. Criar dataset filtrado
-print("\n[6/6] Criando datasets filtrados...")
-
-# Dataset completo
-df_filtered = df[metadata_cols + metrics_to_keep].copy()
-df_filtered.to_csv(OUTPUT_DIR / "all_texts_filtered.csv", index=False)
-print(f"   ✓ all_texts_filtered.csv: {len(df_filtered)} × {len(df_filtered.columns)}")
-
-# Por condição
-for condition in ['original', 'baseline', 'prompt_steering', 'activation_steering']:
-    df_cond = df_filtered[df_filtered['condition'] == condition].copy()
-    df_cond.to_csv(OUTPUT_DIR / f"{condition}_filtered.csv", index=False)
-    print(f"   ✓ {condition}_filtered.csv: {len(df_cond)} × {len(df_cond.columns)}")
+# 6. Gravar spec de filtragem
+print("\n[6/6] Gravando spec de filtragem...")
+
+spec = {
+    'version': 1,
+    'created': datetime.now().isoformat(timespec='seconds'),
+    'source': str(SOURCE_FILE),
+    'source_sha1': file_sha1(METRICS_FILE),
+    'metadata_columns': metadata_cols,
+    'metrics': metrics_to_keep,
+    'removed': {
+        'nan': problematic_nan,
+        'constant': constant_metrics,
+        'count': count_metrics,
+        'correlation': [m for m in metric_cols if m in to_remove_corr]
+    },
+    'corr_threshold': args.corr_threshold,
+    'priority': list(args.priority),
+    'clusters': clusters
+}
+save_filter_spec(spec, BASE_DIR / SPEC_FILE)
+print(f"   ✓ {SPEC_FILE.name}: {len(metadata_cols)} metadados + {len(metrics_to_keep)} métricas")
+
+if args.materialize:
+    df_filtered = df[metadata_cols + metrics_to_keep]
+    df_filtered.to_csv(BASE_DIR / MATERIALIZED_FILE, index=False)
+    print(f"   ✓ {MATERIALIZED_FILE.name}: {len(df_filtered)} × {len(df_filtered.columns)}")
 
 # 7. Relatório de filtragem
 print("\n[7/7] Gerando relatório de filtragem...")
@@ -128,7 +148,7 @@ report = f"""# Filtragem de Métricas
 - **Redução: {len(metric_cols) - len(metrics_to_keep)} métricas ({(len(metric_cols) - len(metrics_to_keep))/len(metric_cols)*100:.1f}%)**
 
 ## Método
-Aplicação sequencial de filtros para remover métricas problemáticas.
+Aplicação sequencial de filtros para remover métricas problemáticas. Redundâncias (|r| ≥ {args.corr_threshold}) agrupadas em componentes conexas; cada grupo mantém um representante segundo a lista de prioridade. Resultado gravado em `{SPEC_FILE}`.
 
 ## Resultados
 
@@ -140,8 +160,18 @@ Aplicação sequencial de filtros para remover métricas problemáticas.
 | 1 | NaN ≥ 20% | {len(problematic_nan)} | {len(metric_cols) - len(problematic_nan)} |
 | 2 | Variância = 0 | {len(constant_metrics)} | {len(metric_cols) - len(problematic_nan) - len(constant_metrics)} |
 | 3 | Contagens absolutas | {len(count_metrics)} | {len(metric_cols) - len(problematic_nan) - len(constant_metrics) - len(count_metrics)} |
-| 4 | Correlação \\|r\\| ≥ 0.95 | {len(to_remove_corr)} | {len(metrics_to_keep)} |
+| 4 | Correlação \\|r\\| ≥ {args.corr_threshold} | {len(to_remove_corr)} | {len(metrics_to_keep)} |
+
+### Grupos Redundantes
+
+| Mantida | Removidas |
+|---------|-----------|
+"""
+
+for cluster in clusters:
+    report += f"| `{cluster['kept']}` | {', '.join(f'`{m}`' for m in cluster['removed'])} |\n"
 
+report += """
 ### Métricas Finais por Categoria
 
 **Léxicas básicas:**
@@ -171,7 +201,7 @@ report += f"""
 
 ## Interpretação Técnica
 
-Redução de {len(metric_cols)} para {len(metrics_to_keep)} métricas ({(len(metrics_to_keep)/len(metric_cols))*100:.1f}% retidos). Priorizadas métricas normalizadas (proporções), linguisticamente interpretáveis (UPOS/DEPREL principais), e com dados completos (<20% NaN). Redundâncias resolvidas mantendo medidas mais diretas (proporções > distâncias, DEPREL > UPOS quando correlacionados).
+Redução de {len(metric_cols)} para {len(metrics_to_keep)} métricas ({(len(metrics_to_keep)/len(metric_cols))*100:.1f}% retidos). Priorizadas métricas normalizadas (proporções), linguisticamente interpretáveis (UPOS/DEPREL principais), e com dados completos (<20% NaN). Redundâncias resolvidas mantendo medidas mais diretas (proporções > distâncias; entre proporções correlacionadas, DEPREL > UPOS).
 
 ## Interpretação Simplificada
 
@@ -191,10 +221,8 @@ print("✅ FILTRAGEM CONCLUÍDA")
 print("=" * 70)
 print(f"\n📊 Métricas finais: {len(metrics_to_keep)} (redução de {(len(metric_cols) - len(metrics_to_keep))/len(metric_cols)*100:.1f}%)")
 print(f"\nOutputs em: {OUTPUT_DIR.relative_to(BASE_DIR)}/")
-print(f"  • all_texts_filtered.csv")
-print(f"  • original_filtered.csv")
-print(f"  • baseline_filtered.csv")
-print(f"  • prompt_steering_filtered.csv")
-print(f"  • activation_steering_filtered.csv")
+print(f"  • {SPEC_FILE.name}")
+if args.materialize:
+    print(f"  • {MATERIALIZED_FILE.name}")
 print(f"  • filtering_report.md")
 print()
@@ -9,13 +9,17 @@ Gera perfis quantitativos e visualizações (radar charts).
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+import sys
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).parent))
+from feature_store import get_store
+from streaming_profiles import AuthorProfiles
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent
-METRICS_FILE = BASE_DIR / "metrics_filtered/original_filtered.csv"
 OUTPUT_DIR = BASE_DIR / "analysis/02_author_profiles"
 DATA_DIR = OUTPUT_DIR / "data"
 PLOTS_DIR = OUTPUT_DIR / "plots"
@@ -31,44 +35,27 @@ print("=" * 70)
 
 # 1. Carregar dados
 print("\n[1/4] Carregando dados originais...")
-df = pd.read_csv(METRICS_FILE)
+store = get_store(BASE_DIR, dtype='float64')
+df, METRICS_SOURCE = store.frame('original'), store.source
 print(f"   ✓ {len(df)} textos originais")
 print(f"   ✓ Autores: {df['author'].unique().tolist()}")
 
 # Separar metadados
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-metric_cols = [col for col in df.columns if col not in metadata_cols]
+metric_cols = store.metric_cols
 print(f"   ✓ {len(metric_cols)} métricas filtradas")
 
 # 2. Calcular estatísticas por autor
 print("\n[2/4] Calculando perfis por autor...")
 
-profiles = []
-for author in df['author'].unique():
-    df_author = df[df['author'] == author][metric_cols]
-    
-    profile = {
-        'author': author,
-        'n_texts': len(df_author)
-    }
-    
-    # Estatísticas por métrica
-    for col in metric_cols:
-        values = df_author[col].dropna()
-        if len(values) > 0:
-            profile[f'{col}_mean'] = values.mean()
-            profile[f'{col}_std'] = values.std()
-            profile[f'{col}_cv'] = values.std() / values.mean() if values.mean() != 0 else np.nan
-        else:
-            profile[f'{col}_mean'] = np.nan
-            profile[f'{col}_std'] = np.nan
-            profile[f'{col}_cv'] = np.nan
-    
-    profiles.append(profile)
-    print(f"   ✓ {author}: {profile['n_texts']} textos")
+# Média, desvio e CV por (autor, métrica) em acumuladores incrementais
+# (novos textos ou perfis de outras partes do corpus podem ser incorporados
+# sem recalcular tudo; ver streaming_profiles.py)
+profiles = AuthorProfiles(metric_cols).add_frame(df)
+for author in profiles.authors:
+    print(f"   ✓ {author}: {profiles[author].n_texts} textos")
 
-profiles_df = pd.DataFrame(profiles)
-profiles_df.to_csv(DATA_DIR / "profiles_by_author.csv", index=False)
+profiles.save(DATA_DIR / "profiles_by_author.csv")
+profiles_df = profiles.to_frame()
 
 # 3. Criar radar charts (top 10 métricas mais discriminativas)
 print("\n[3/4] Gerando radar charts...")
@@ -149,13 +136,13 @@ for author in df['author'].unique():
 print("\n[4/4] Gerando relatório...")
 
 # Identificar características distintivas de cada autor
+author_means = profiles.statistic('mean')
+overall_means = pd.Series(profiles.total().statistics()['mean'], index=metric_cols)
+
 author_characteristics = {}
 for author in df['author'].unique():
-    df_author = df[df['author'] == author][metric_cols]
-    
     # Top 5 métricas mais altas (percentil 75+)
-    means = df_author.mean()
-    overall_means = df[metric_cols].mean()
+    means = author_means.loc[author]
     
     high_metrics = []
     low_metrics = []
@@ -183,7 +170,7 @@ for author in df['author'].unique():
 report = f"""# Perfis Estilísticos dos Autores Originais
 
 ## Dados
-- Arquivo: `metrics_filtered/original_filtered.csv`
+- Arquivo: `{METRICS_SOURCE}` (condição original, métricas de `metrics_filtered/filter_spec.json`)
 - N textos: {len(df)}
 - N autores: {len(df['author'].unique())}
 - N métricas: {len(metric_cols)}
@@ -14,19 +14,25 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 from pathlib import Path
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import pairwise_distances
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).parent))
+from feature_store import get_store
+from bootstrap import bootstrap_ci_table
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent
-METRICS_FILE = BASE_DIR / "metrics_filtered/all_texts_filtered.csv"
 OUTPUT_DIR = BASE_DIR / "analysis/03_method_comparison"
 DATA_DIR = OUTPUT_DIR / "data"
 PLOTS_DIR = OUTPUT_DIR / "plots"
 
+# Bootstrap por sample (IC 95% das médias por método)
+N_BOOTSTRAP = 10000
+BOOTSTRAP_SEED = 42
+
 # Criar diretórios
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(exist_ok=True)
@@ -38,63 +44,35 @@ print("=" * 70)
 
 # 1. Carregar dados
 print("\n[1/5] Carregando dados...")
-df = pd.read_csv(METRICS_FILE)
+store = get_store(BASE_DIR, dtype='float64')
+df, METRICS_SOURCE = store.frame(), store.source
 print(f"   ✓ {len(df)} textos")
 print(f"   ✓ Condições: {df['condition'].unique().tolist()}")
 
 # Separar metadados
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-metric_cols = [col for col in df.columns if col not in metadata_cols]
+metric_cols = store.metric_cols
 print(f"   ✓ {len(metric_cols)} métricas")
 
 # 2. Calcular distâncias estilísticas
 print("\n[2/5] Calculando distâncias estilísticas...")
 
-# Normalizar métricas (z-score)
-scaler = StandardScaler()
-df_metrics = df[metric_cols].copy()
-df_metrics_scaled = pd.DataFrame(
-    scaler.fit_transform(df_metrics),
-    columns=metric_cols,
-    index=df.index
-)
+# Normalizar métricas (z-score sobre todos os textos; NaN ignorados no ajuste)
+scaled = store.standardized(None, fill=False)
+
+# Emparelhar cada texto gerado com seu original (mesmo author + title + sample_idx);
+# em caso de originais repetidos, vale o primeiro
+pairs = store.pairs()
+gen_pos = pairs['gen_row'].to_numpy()
+orig_pos = pairs['orig_row'].to_numpy()
+
+# Distância Euclidiana no espaço normalizado (todas as linhas de uma vez).
+# O produto interno em lote reproduz exatamente np.linalg.norm por vetor
+diff = scaled[gen_pos] - scaled[orig_pos]
+distance = np.sqrt((diff[:, None, :] @ diff[:, :, None]).ravel())
 
-# Para cada texto gerado, encontrar o original correspondente
-distances = []
-
-df_original = df[df['condition'] == 'original'].copy()
-df_generated = df[df['condition'] != 'original'].copy()
-
-for idx, gen_row in df_generated.iterrows():
-    # Identificar original correspondente (mesmo author + title + sample_idx)
-    orig_match = df_original[
-        (df_original['author'] == gen_row['author']) &
-        (df_original['title'] == gen_row['title']) &
-        (df_original['sample_idx'] == gen_row['sample_idx'])
-    ]
-    
-    if len(orig_match) > 0:
-        orig_idx = orig_match.index[0]
-        
-        # Distância Euclidiana no espaço normalizado
-        gen_vector = df_metrics_scaled.loc[idx].values
-        orig_vector = df_metrics_scaled.loc[orig_idx].values
-        
-        distance = np.linalg.norm(gen_vector - orig_vector)
-        
-        distances.append({
-            'text_id_gen': gen_row['text_id'],
-            'text_id_orig': orig_match.iloc[0]['text_id'],
-            'author': gen_row['author'],
-            'title': gen_row['title'],
-            'sample_idx': gen_row['sample_idx'],
-            'rep': gen_row['rep'],
-            'method': gen_row['condition'],
-            'lang': gen_row['lang'],
-            'euclidean_distance': distance
-        })
-
-distances_df = pd.DataFrame(distances)
+distances_df = pairs[['text_id_gen', 'text_id_orig', 'author', 'title',
+                      'sample_idx', 'rep', 'condition', 'lang']].rename(columns={'condition': 'method'})
+distances_df['euclidean_distance'] = distance
 distances_df.to_csv(DATA_DIR / "distances_to_original.csv", index=False)
 
 print(f"   ✓ Distâncias calculadas: {len(distances_df)} pares")
@@ -116,49 +94,50 @@ preservation_stats = distances_df.groupby('method').agg({
 }).round(3)
 preservation_stats.to_csv(DATA_DIR / "preservation_scores.csv")
 
-print("   ✓ Preservation scores por método:")
+# IC 95%: reamostra samples (author + title + sample_idx) com reposição; as 3
+# repetições e os 3 métodos de cada sample entram juntos. max_dist fica fixo
+preservation_ci = bootstrap_ci_table(
+    distances_df, ['euclidean_distance', 'preservation_score'], 'method',
+    ['baseline', 'prompt_steering', 'activation_steering'],
+    n_resamples=N_BOOTSTRAP, seed=BOOTSTRAP_SEED
+)
+preservation_ci.to_csv(DATA_DIR / "preservation_ci.csv", index=False)
+ci = preservation_ci.set_index(['method', 'statistic'])
+
+print(f"   ✓ Preservation scores por método (IC 95%, {N_BOOTSTRAP} réplicas bootstrap):")
 for method in ['baseline', 'prompt_steering', 'activation_steering']:
-    score = distances_df[distances_df['method'] == method]['preservation_score'].mean()
-    print(f"     • {method}: {score:.3f}")
+    score = ci.loc[(method, 'preservation_score')]
+    print(f"     • {method}: {score['mean']:.3f} [{score['ci_low']:.3f}, {score['ci_high']:.3f}]")
 
 # 4. Divergências por métrica
 print("\n[4/5] Analisando divergências por métrica...")
 
 # Para cada métrica, calcular diferença média |generated - original|
+# (diferenças calculadas sobre a matriz emparelhada; agregação por métrica × método)
+values = store.matrix()
+gen_values = values[gen_pos]
+orig_values = values[orig_pos]
+
+valid = ~(np.isnan(gen_values) | np.isnan(orig_values))
+abs_diff = np.abs(gen_values - orig_values)
+with np.errstate(divide='ignore', invalid='ignore'):
+    rel_diff = np.where(orig_values != 0, abs_diff / np.abs(orig_values), 0.0)
+
+pair_method = distances_df['method'].to_numpy()
 divergences = []
 
-for metric in metric_cols:
+for j, metric in enumerate(metric_cols):
     for method in ['baseline', 'prompt_steering', 'activation_steering']:
-        df_method = df[df['condition'] == method].copy()
-        
-        diffs = []
-        for idx, gen_row in df_method.iterrows():
-            orig_match = df_original[
-                (df_original['author'] == gen_row['author']) &
-                (df_original['title'] == gen_row['title']) &
-                (df_original['sample_idx'] == gen_row['sample_idx'])
-            ]
-            
-            if len(orig_match) > 0:
-                gen_val = gen_row[metric]
-                orig_val = orig_match.iloc[0][metric]
-                
-                if pd.notna(gen_val) and pd.notna(orig_val):
-                    diff = abs(gen_val - orig_val)
-                    rel_diff = diff / abs(orig_val) if orig_val != 0 else 0
-                    diffs.append({
-                        'absolute_diff': diff,
-                        'relative_diff': rel_diff
-                    })
-        
-        if len(diffs) > 0:
-            diffs_df = pd.DataFrame(diffs)
+        rows = (pair_method == method) & valid[:, j]
+        if rows.any():
+            metric_abs = pd.Series(abs_diff[rows, j])
+            metric_rel = pd.Series(rel_diff[rows, j])
             divergences.append({
                 'metric': metric,
                 'method': method,
-                'mean_abs_diff': diffs_df['absolute_diff'].mean(),
-                'mean_rel_diff': diffs_df['relative_diff'].mean(),
-                'std_abs_diff': diffs_df['absolute_diff'].std()
+                'mean_abs_diff': metric_abs.mean(),
+                'mean_rel_diff': metric_rel.mean(),
+                'std_abs_diff': metric_abs.std()
             })
 
 divergences_df = pd.DataFrame(divergences)
@@ -233,25 +212,26 @@ print("\n[6/6] Gerando relatório...")
 report = f"""# Comparação dos Métodos de Geração vs Original
 
 ## Dados
-- Arquivo: `metrics_filtered/all_texts_filtered.csv`
-- N textos originais: {len(df_original)}
-- N textos gerados: {len(df_generated)}
+- Arquivo: `{METRICS_SOURCE}` (métricas de `metrics_filtered/filter_spec.json`)
+- N textos originais: {len(store.rows('original'))}
+- N textos gerados: {len(df) - len(store.rows('original'))}
 - N métricas: {len(metric_cols)}
 
 ## Método
-Cálculo de distância Euclidiana entre cada texto gerado e seu original correspondente no espaço de métricas normalizado (z-score). Preservation score = 1 - (distance / max_distance). Divergência por métrica = diferença relativa média |gerado - original| / |original|.
+Cálculo de distância Euclidiana entre cada texto gerado e seu original correspondente no espaço de métricas normalizado (z-score). Preservation score = 1 - (distance / max_distance). IC 95% por bootstrap percentil ({N_BOOTSTRAP} réplicas) reamostrando samples (author + title + sample_idx) com reposição, mantendo juntas as 3 repetições e os 3 métodos de cada sample (max_distance fixo). Divergência por métrica = diferença relativa média |gerado - original| / |original|.
 
 ## Resultados
 
 ### 1. Distâncias Estilísticas Globais
 
-| Método | Distância Média | Desvio Padrão | Min | Max |
-|--------|----------------|---------------|-----|-----|
+| Método | Distância Média | IC 95% | Desvio Padrão | Min | Max |
+|--------|----------------|--------|---------------|-----|-----|
 """
 
 for method in ['baseline', 'prompt_steering', 'activation_steering']:
     dist_method = distances_df[distances_df['method'] == method]['euclidean_distance']
-    report += f"| {method} | {dist_method.mean():.3f} | {dist_method.std():.3f} | {dist_method.min():.3f} | {dist_method.max():.3f} |\n"
+    dist_ci = ci.loc[(method, 'euclidean_distance')]
+    report += f"| {method} | {dist_method.mean():.3f} | [{dist_ci['ci_low']:.3f}, {dist_ci['ci_high']:.3f}] | {dist_method.std():.3f} | {dist_method.min():.3f} | {dist_method.max():.3f} |\n"
 
 report += """
 
@@ -259,13 +239,14 @@ report += """
 
 ### 2. Preservation Scores
 
-| Método | Preservation Score Médio |
-|--------|--------------------------|
+| Método | Preservation Score Médio | IC 95% |
+|--------|--------------------------|--------|
 """
 
 for method in ['baseline', 'prompt_steering', 'activation_steering']:
     score = distances_df[distances_df['method'] == method]['preservation_score'].mean()
-    report += f"| {method} | {score:.3f} |\n"
+    score_ci = ci.loc[(method, 'preservation_score')]
+    report += f"| {method} | {score:.3f} | [{score_ci['ci_low']:.3f}, {score_ci['ci_high']:.3f}] |\n"
 
 report += """
 
@@ -313,6 +294,7 @@ print(f"\nMelhor preservação: {best_method} ({best_score:.3f})")
 print(f"\nOutputs:")
 print(f"  • {(DATA_DIR / 'distances_to_original.csv').relative_to(BASE_DIR)}")
 print(f"  • {(DATA_DIR / 'preservation_scores.csv').relative_to(BASE_DIR)}")
+print(f"  • {(DATA_DIR / 'preservation_ci.csv').relative_to(BASE_DIR)}")
 print(f"  • {(DATA_DIR / 'metrics_divergence.csv').relative_to(BASE_DIR)}")
 print(f"  • {PLOTS_DIR.relative_to(BASE_DIR)}/*.png (3 gráficos)")
 print(f"  • {report_file.relative_to(BASE_DIR)}")
@@ -15,18 +15,26 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import sys
 from pathlib import Path
 from scipy import stats
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).parent))
+from feature_store import get_store
+from bootstrap import bootstrap_group_means, percentile_ci
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent
-METRICS_FILE = BASE_DIR / "metrics_filtered/all_texts_filtered.csv"
 OUTPUT_DIR = BASE_DIR / "analysis/05_consistency"
 DATA_DIR = OUTPUT_DIR / "data"
 PLOTS_DIR = OUTPUT_DIR / "plots"
 
+# Bootstrap por sample (IC 95% do CV médio por método)
+N_BOOTSTRAP = 10000
+BOOTSTRAP_SEED = 42
+
 # Criar diretórios
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 DATA_DIR.mkdir(exist_ok=True)
@@ -38,7 +46,8 @@ print("=" * 70)
 
 # 1. Carregar dados
 print("\n[1/4] Carregando dados...")
-df = pd.read_csv(METRICS_FILE)
+store = get_store(BASE_DIR, dtype='float64')
+df, METRICS_SOURCE = store.frame(), store.source
 
 # Apenas textos gerados (têm 3 repetições)
 df_generated = df[df['condition'] != 'original'].copy()
@@ -46,8 +55,7 @@ print(f"   ✓ {len(df_generated)} textos gerados")
 print(f"   ✓ Métodos: {df_generated['condition'].unique().tolist()}")
 
 # Separar metadados
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-metric_cols = [col for col in df.columns if col not in metadata_cols]
+metric_cols = store.metric_cols
 print(f"   ✓ {len(metric_cols)} métricas")
 
 # 2. Calcular CV por sample (3 repetições)
@@ -110,6 +118,24 @@ for condition in ['baseline', 'prompt_steering', 'activation_steering']:
     print(f"     - Métricas mais consistentes: {cv_means.nsmallest(3).index.tolist()}")
 
 method_stats_df = pd.DataFrame(method_stats)
+
+# IC 95% do CV global: reamostra samples (author + title + sample_idx) com
+# reposição, os 3 métodos juntos; cada réplica recalcula CV médio por métrica
+# e a média entre métricas
+methods = ['baseline', 'prompt_steering', 'activation_steering']
+_, cv_replicates = bootstrap_group_means(
+    cv_df[cv_cols].to_numpy(dtype=np.float64),
+    pd.Categorical(cv_df['condition'], categories=methods).codes,
+    cv_df.groupby(['author', 'title', 'sample_idx'], sort=False).ngroup().to_numpy(),
+    len(methods), n_resamples=N_BOOTSTRAP, seed=BOOTSTRAP_SEED
+)
+cv_ci_low, cv_ci_high = percentile_ci(np.nanmean(cv_replicates, axis=2))
+method_stats_df['cv_ci_low'] = method_stats_df['method'].map(dict(zip(methods, cv_ci_low)))
+method_stats_df['cv_ci_high'] = method_stats_df['method'].map(dict(zip(methods, cv_ci_high)))
+for _, row in method_stats_df.iterrows():
+    print(f"   • {row['method']}: CV global {row['mean_cv_global']:.4f} "
+          f"[IC 95%: {row['cv_ci_low']:.4f}, {row['cv_ci_high']:.4f}]")
+
 method_stats_df.to_csv(DATA_DIR / "consistency_by_method.csv", index=False)
 
 # Teste estatístico: Comparar CV entre métodos
@@ -199,24 +225,24 @@ best_cv = method_stats_df['mean_cv_global'].min()
 report = f"""# Análise de Consistência Intra-Método
 
 ## Dados
-- Arquivo: `metrics_filtered/all_texts_filtered.csv`
+- Arquivo: `{METRICS_SOURCE}` (métricas de `metrics_filtered/filter_spec.json`)
 - N samples: {len(cv_df)} (cada sample com 3 repetições)
 - N métodos: 3 (baseline, prompt_steering, activation_steering)
 - N métricas: {len(metric_cols)}
 
 ## Método
-Para cada sample, calcular coeficiente de variação (CV = std/mean) entre as 3 repetições. CV baixo indica consistência (gerações similares), CV alto indica variabilidade (gerações divergentes). Teste de Kruskal-Wallis para comparar CV entre métodos.
+Para cada sample, calcular coeficiente de variação (CV = std/mean) entre as 3 repetições. CV baixo indica consistência (gerações similares), CV alto indica variabilidade (gerações divergentes). Teste de Kruskal-Wallis para comparar CV entre métodos. IC 95% do CV médio por bootstrap percentil ({N_BOOTSTRAP} réplicas), reamostrando samples com reposição (os 3 métodos de cada sample entram juntos).
 
 ## Resultados
 
 ### 1. Consistência Global por Método
 
-| Método | N Samples | CV Médio | Desvio Padrão | Min CV | Max CV |
-|--------|-----------|----------|---------------|--------|--------|
+| Método | N Samples | CV Médio | IC 95% | Desvio Padrão | Min CV | Max CV |
+|--------|-----------|----------|--------|---------------|--------|--------|
 """
 
 for _, row in method_stats_df.iterrows():
-    report += f"| {row['method']} | {row['n_samples']} | {row['mean_cv_global']:.4f} | {row['std_cv_global']:.4f} | {row['min_cv']:.4f} | {row['max_cv']:.4f} |\n"
+    report += f"| {row['method']} | {row['n_samples']} | {row['mean_cv_global']:.4f} | [{row['cv_ci_low']:.4f}, {row['cv_ci_high']:.4f}] | {row['std_cv_global']:.4f} | {row['min_cv']:.4f} | {row['max_cv']:.4f} |\n"
 
 report += f"""
 
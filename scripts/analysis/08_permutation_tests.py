@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Testes de Permutação entre Métodos
+
+Para cada métrica e par de métodos, testa se a divergência ao original
+(|gerado − original|) difere entre os métodos. Cada par X vs Y usa só os
+textos de X e Y, e os rótulos X/Y são permutados apenas dentro do mesmo
+estrato (author, title, sample_idx), ou seja, entre textos gerados a partir
+do mesmo prefixo original.
+
+Métricas:
+- Divergência média por método e métrica
+- Diferença entre métodos (X − Y) e p-valor bilateral por permutação
+- Contagem de métricas significativas por par de métodos
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+from feature_store import get_store
+from permutation_tests import method_divergence_tests
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent.parent
+OUTPUT_DIR = BASE_DIR / "analysis/07_permutation_tests"
+DATA_DIR = OUTPUT_DIR / "data"
+
+METHODS = ['baseline', 'prompt_steering', 'activation_steering']
+ALPHA = 0.05
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stratified permutation tests of per-metric divergence between methods')
+    parser.add_argument('--permutations', type=int, default=10000,
+                        help='Number of permutations (default: 10000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes; 0 = all CPUs (default: 1)')
+    args = parser.parse_args()
+    n_jobs = args.jobs or os.cpu_count()
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    DATA_DIR.mkdir(exist_ok=True)
+
+    print("=" * 70)
+    print("TESTES DE PERMUTAÇÃO ENTRE MÉTODOS")
+    print("=" * 70)
+
+    # 1. Carregar dados
+    print("\n[1/3] Carregando dados...")
+    store = get_store(BASE_DIR, dtype='float64')
+    metric_cols = store.metric_cols
+    print(f"   ✓ {len(store.meta)} textos, {len(metric_cols)} métricas")
+
+    # Divergência de cada texto gerado ao seu original, por métrica
+    pairs = store.pairs()
+    values = store.matrix()
+    divergence = pairs[['author', 'title', 'sample_idx', 'rep', 'condition']].rename(columns={'condition': 'method'})
+    divergence = pd.concat([
+        divergence,
+        pd.DataFrame(np.abs(values[pairs['gen_row'].to_numpy()] - values[pairs['orig_row'].to_numpy()]),
+                     columns=metric_cols, index=divergence.index)
+    ], axis=1)
+    n_strata = divergence.groupby(['author', 'title', 'sample_idx']).ngroups
+    print(f"   ✓ {len(divergence)} pares gerado → original em {n_strata} estratos")
+
+    # 2. Testes
+    print(f"\n[2/3] Rodando {args.permutations} permutações ({n_jobs} processo(s))...")
+    start = time.perf_counter()
+    results = method_divergence_tests(
+        divergence, metric_cols, METHODS,
+        n_permutations=args.permutations, seed=args.seed, n_jobs=n_jobs
+    )
+    elapsed = time.perf_counter() - start
+    results.to_csv(DATA_DIR / "permutation_pvalues.csv", index=False)
+    print(f"   ✓ {len(results)} testes em {elapsed:.2f}s")
+    print("   ✓ Salvo: permutation_pvalues.csv")
+
+    summary = results.assign(significant=results['p_value'] < ALPHA)
+    summary = summary.groupby(['method_x', 'method_y'], sort=False).apply(
+        lambda g: pd.Series({
+            'n_metrics': g['p_value'].notna().sum(),
+            'n_significant': g['significant'].sum(),
+            'x_better': (g['significant'] & (g['better'] == g.name[0])).sum(),
+            'y_better': (g['significant'] & (g['better'] == g.name[1])).sum()
+        }),
+        include_groups=False
+    ).reset_index()
+    summary.to_csv(DATA_DIR / "permutation_summary.csv", index=False)
+    print("   ✓ Salvo: permutation_summary.csv")
+
+    for _, row in summary.iterrows():
+        print(f"   • {row['method_x']} vs {row['method_y']}: {row['n_significant']}/{row['n_metrics']} "
+              f"significativas ({row['x_better']} a favor de {row['method_x']}, "
+              f"{row['y_better']} a favor de {row['method_y']})")
+
+    # 3. Relatório
+    print("\n[3/3] Gerando relatório...")
+
+    report = f"""# Testes de Permutação entre Métodos
+
+## Dados
+- Arquivo: `{store.source}` (métricas de `metrics_filtered/filter_spec.json`)
+- N pares gerado → original: {len(divergence)} ({n_strata} estratos author + title + sample_idx)
+- N métodos: {len(METHODS)} ({', '.join(METHODS)})
+- N métricas: {len(metric_cols)}
+
+## Método
+Para cada texto gerado, divergência por métrica = |gerado − original|. Estatística: diferença entre as divergências médias de dois métodos (negativa = primeiro método mais próximo do original). Nula, por par: X e Y permutáveis dentro de cada estrato (textos gerados a partir do mesmo prefixo); cada par é testado só com os textos dos dois métodos, e o terceiro método não entra na permutação. P-valor bilateral com {args.permutations} permutações (semente {args.seed}): p = (1 + #{{|T_perm| ≥ |T_obs|}}) / (1 + N). Sem correção para comparações múltiplas.
+
+## Resultados
+
+### 1. Métricas Significativas por Par (p < {ALPHA})
+
+| Método X | Método Y | N Métricas | Significativas | X Melhor | Y Melhor |
+|----------|----------|------------|----------------|----------|----------|
+"""
+
+    for _, row in summary.iterrows():
+        report += (f"| {row['method_x']} | {row['method_y']} | {row['n_metrics']} | {row['n_significant']} "
+                   f"| {row['x_better']} | {row['y_better']} |\n")
+
+    report += """
+
+### 2. Menores P-valores por Par
+
+"""
+
+    for (method_x, method_y), group in results.groupby(['method_x', 'method_y'], sort=False):
+        report += f"""#### {method_x} vs {method_y}
+
+| Métrica | Div. {method_x} | Div. {method_y} | Diferença | Melhor | p |
+|---------|------|------|-----------|--------|---|
+"""
+        for _, row in group.nsmallest(10, 'p_value').iterrows():
+            report += (f"| {row['metric']} | {row['mean_abs_diff_x']:.4f} | {row['mean_abs_diff_y']:.4f} "
+                       f"| {row['diff']:+.4f} | {row['better']} | {row['p_value']:.4f} |\n")
+        report += "\n"
+
+    report += """
+## Arquivos Gerados
+- `data/permutation_pvalues.csv`: diferença e p-valor por métrica e par de métodos
+- `data/permutation_summary.csv`: contagem de métricas significativas por par
+"""
+
+    with open(OUTPUT_DIR / "report.md", 'w', encoding='utf-8') as f:
+        f.write(report)
+
+    print("   ✓ Relatório salvo: report.md")
+    print("\n" + "=" * 70)
+    print("✅ TESTES DE PERMUTAÇÃO COMPLETOS")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Atribuição de Autoria dos Textos Gerados
+
+Em vez de medir só a distância ao próprio original, pergunta em que autor
+cada texto gerado "cai" no espaço estilístico dos originais (métricas
+filtradas, z-score dos originais).
+
+Métricas:
+- Autor mais próximo por centróide (top-k) e por voto kNN entre os originais
+- Acurácia de atribuição por método (centróide, top-k, kNN)
+- Margem ao autor verdadeiro (positiva = atribuído corretamente)
+- Matriz de confusão autor verdadeiro × autor atribuído por método
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+sys.path.append(str(Path(__file__).parent))
+from feature_store import get_store
+from style_knn import StyleIndex, attribution_accuracy
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent.parent
+OUTPUT_DIR = BASE_DIR / "analysis/08_author_attribution"
+DATA_DIR = OUTPUT_DIR / "data"
+PLOTS_DIR = OUTPUT_DIR / "plots"
+
+METHODS = ['baseline', 'prompt_steering', 'activation_steering']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Attribute generated texts to the nearest author in style space')
+    parser.add_argument('--k', type=int, default=5, help='Neighbours in the kNN vote (default: 5)')
+    parser.add_argument('--top', type=int, default=3, help='Nearest authors reported per text (default: 3)')
+    parser.add_argument('--chunk-size', type=int, default=4096,
+                        help='Queries per distance batch (default: 4096)')
+    args = parser.parse_args()
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    DATA_DIR.mkdir(exist_ok=True)
+    PLOTS_DIR.mkdir(exist_ok=True)
+
+    print("=" * 70)
+    print("ATRIBUIÇÃO DE AUTORIA DOS TEXTOS GERADOS")
+    print("=" * 70)
+
+    # 1. Índice
+    print("\n[1/4] Construindo índice dos originais...")
+    store = get_store(BASE_DIR, dtype='float64')
+    index = StyleIndex.from_store(store)
+    print(f"   ✓ {index}")
+
+    # 2. Consultas: todos os textos gerados de uma vez
+    print("\n[2/4] Atribuindo textos gerados...")
+    rows = store.rows(METHODS)
+    meta = store.meta.iloc[rows]
+    attribution = index.attribute(store.matrix()[rows], meta['author'].to_numpy(),
+                                  k=args.k, top=args.top, chunk_size=args.chunk_size)
+    attribution.insert(0, 'method', meta['condition'].to_numpy())
+    for col in ['rep', 'sample_idx', 'title', 'author', 'text_id']:
+        attribution.insert(0, col, meta[col].to_numpy())
+    attribution.to_csv(DATA_DIR / "attribution_by_text.csv", index=False)
+    print(f"   ✓ {len(attribution)} textos atribuídos")
+    print("   ✓ Salvo: attribution_by_text.csv")
+
+    # 3. Acurácia e confusão
+    print("\n[3/4] Calculando acurácia por método...")
+    accuracy = attribution_accuracy(attribution, ['method'], top=args.top)
+    accuracy.to_csv(DATA_DIR / "attribution_accuracy.csv", index=False)
+    by_author = attribution_accuracy(attribution, ['method', 'author'], top=args.top)
+    by_author.to_csv(DATA_DIR / "attribution_accuracy_by_author.csv", index=False)
+
+    confusion = (attribution.groupby(['method', 'author', 'author_top1']).size()
+                 .rename('n_texts').reset_index()
+                 .rename(columns={'author': 'true_author', 'author_top1': 'attributed_author'}))
+    confusion.to_csv(DATA_DIR / "attribution_confusion.csv", index=False)
+    print("   ✓ Salvo: attribution_accuracy.csv, attribution_accuracy_by_author.csv, attribution_confusion.csv")
+
+    chance = 1 / len(index.authors)
+    for _, row in accuracy.iterrows():
+        print(f"   • {row['method']}: centróide {row['accuracy_centroid']:.3f}, "
+              f"kNN {row['accuracy_knn']:.3f}, margem média {row['mean_margin']:+.3f}")
+    print(f"   (acaso: {chance:.3f})")
+
+    # 4. Visualização e relatório
+    print("\n[4/4] Gerando visualização e relatório...")
+
+    fig, axes = plt.subplots(1, len(METHODS), figsize=(6 * len(METHODS), 5))
+    for ax, method in zip(np.atleast_1d(axes), METHODS):
+        matrix = (confusion[confusion['method'] == method]
+                  .pivot(index='true_author', columns='attributed_author', values='n_texts')
+                  .reindex(index=index.authors, columns=index.authors).fillna(0))
+        sns.heatmap(matrix, annot=True, fmt='.0f', cmap='Blues', cbar=False, ax=ax)
+        ax.set_title(method.replace('_', ' ').title(), fontsize=12, weight='bold')
+        ax.set_xlabel('Autor atribuído (centróide)')
+        ax.set_ylabel('Autor verdadeiro')
+    plt.tight_layout()
+    plt.savefig(PLOTS_DIR / "attribution_confusion.png", dpi=150, bbox_inches='tight')
+    plt.close()
+    print("   ✓ Plot salvo: attribution_confusion.png")
+
+    report = f"""# Atribuição de Autoria dos Textos Gerados
+
+## Dados
+- Arquivo: `{store.source}` (métricas de `metrics_filtered/filter_spec.json`)
+- Referência: {len(index.reference)} textos originais de {len(index.authors)} autores ({', '.join(index.authors)})
+- N textos gerados: {len(attribution)}
+- N métricas: {len(store.metric_cols)}
+
+## Método
+Originais padronizados com o z-score dos próprios originais formam a referência (BallTree + centróide por autor). Cada texto gerado é padronizado com o mesmo scaler (NaN → média dos originais) e atribuído (1) ao autor de centróide mais próximo e (2) por voto dos {args.k} originais mais próximos. Margem = distância ao autor incorreto mais próximo − distância ao autor verdadeiro (positiva = atribuição correta). Acaso = {chance:.3f}.
+
+## Resultados
+
+### 1. Acurácia por Método
+
+| Método | N | Centróide | Top-{args.top} | kNN (k={args.k}) | Margem Média | Margem Mediana |
+|--------|---|-----------|-------|-----|--------------|----------------|
+"""
+
+    for _, row in accuracy.iterrows():
+        report += (f"| {row['method']} | {row['n_texts']} | {row['accuracy_centroid']:.3f} "
+                   f"| {row[f'accuracy_top{args.top}']:.3f} | {row['accuracy_knn']:.3f} "
+                   f"| {row['mean_margin']:+.3f} | {row['median_margin']:+.3f} |\n")
+
+    report += """
+
+### 2. Acurácia por Método e Autor (centróide)
+
+"""
+
+    pivot = by_author.pivot(index='author', columns='method', values='accuracy_centroid').reindex(columns=METHODS)
+    report += "| Autor | " + " | ".join(METHODS) + " |\n"
+    report += "|-------|" + "|".join("-" * (len(m) + 2) for m in METHODS) + "|\n"
+    for author, row in pivot.iterrows():
+        report += f"| {author} | " + " | ".join(f"{v:.3f}" for v in row) + " |\n"
+
+    report += """
+
+### 3. Para Onde Vão os Textos Mal Atribuídos
+
+"""
+
+    wrong = confusion[confusion['true_author'] != confusion['attributed_author']]
+    for method in METHODS:
+        top_wrong = wrong[wrong['method'] == method].nlargest(3, 'n_texts')
+        if top_wrong.empty:
+            report += f"- **{method}:** nenhum texto mal atribuído\n"
+            continue
+        moves = ", ".join(f"{r['true_author']} → {r['attributed_author']} ({r['n_texts']})"
+                          for _, r in top_wrong.iterrows())
+        report += f"- **{method}:** {moves}\n"
+
+    report += """
+## Arquivos Gerados
+- `data/attribution_by_text.csv`: autores mais próximos, voto kNN, original mais próximo e margem de cada texto gerado
+- `data/attribution_accuracy.csv`: acurácia e margem por método
+- `data/attribution_accuracy_by_author.csv`: acurácia e margem por método e autor
+- `data/attribution_confusion.csv`: autor verdadeiro × autor atribuído (centróide) por método
+- `plots/attribution_confusion.png`: matrizes de confusão
+"""
+
+    with open(OUTPUT_DIR / "report.md", 'w', encoding='utf-8') as f:
+        f.write(report)
+
+    print("   ✓ Relatório salvo: report.md")
+    print("\n" + "=" * 70)
+    print("✅ ATRIBUIÇÃO DE AUTORIA COMPLETA")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Matrizes de Distância Texto × Texto
+
+Calcula matrizes completas de distância entre todos os textos (originais e
+gerados) para três distâncias (euclidiana, cosseno, Delta de Burrows), sobre
+as métricas filtradas em z-score, e resume:
+
+- Distância média entre grupos condição × autor (confusão entre autores)
+- Distância entre repetições do mesmo sample vs entre samples do mesmo autor
+- Agrupamento hierárquico dos originais: os clusters recuperam os autores?
+
+As matrizes ficam em `data/distances_{métrica}.npy` (float32, lidas com
+`np.load(..., mmap_mode='r')`); a ordem das linhas está em `data/texts.csv`.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.spatial.distance import squareform
+from sklearn.metrics import adjusted_rand_score
+
+sys.path.append(str(Path(__file__).parent))
+from feature_store import get_store
+from distance_engine import METRICS, distance_matrix, group_block_means
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent.parent
+OUTPUT_DIR = BASE_DIR / "analysis/09_distance_matrices"
+DATA_DIR = OUTPUT_DIR / "data"
+
+CONDITIONS = ['original', 'baseline', 'prompt_steering', 'activation_steering']
+
+
+def repetition_distances(matrix: np.ndarray, meta: pd.DataFrame) -> pd.DataFrame:
+    """Distâncias entre todas as repetições do mesmo sample e condição (um par por linha)."""
+    keys = ['author', 'title', 'sample_idx', 'condition']
+    rows = meta[keys].assign(row=np.arange(len(meta)))
+    pairs = rows.merge(rows, on=keys, suffixes=('_i', '_j'))
+    pairs = pairs[pairs['row_i'] < pairs['row_j']]
+    pairs['distance'] = np.asarray(matrix[pairs['row_i'].to_numpy(), pairs['row_j'].to_numpy()],
+                                   dtype=np.float64)
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='All-pairs text distance matrices (euclidean, cosine, Burrows delta)')
+    parser.add_argument('--metrics', nargs='+', choices=METRICS, default=list(METRICS),
+                        help='Distances to compute (default: all)')
+    parser.add_argument('--block-size', type=int, default=1024, help='Texts per block (default: 1024)')
+    args = parser.parse_args()
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    DATA_DIR.mkdir(exist_ok=True)
+
+    print("=" * 70)
+    print("MATRIZES DE DISTÂNCIA TEXTO × TEXTO")
+    print("=" * 70)
+
+    # 1. Carregar dados
+    print("\n[1/4] Carregando dados...")
+    store = get_store(BASE_DIR, dtype='float64')
+    meta = store.meta.reset_index(drop=True)
+    values = store.matrix()
+    meta.to_csv(DATA_DIR / "texts.csv", index=False)
+    print(f"   ✓ {len(meta)} textos × {len(store.metric_cols)} métricas")
+
+    # Grupos condição × autor
+    group_keys = meta[['condition', 'author']].drop_duplicates()
+    group_keys['condition'] = pd.Categorical(group_keys['condition'], categories=CONDITIONS)
+    group_keys = group_keys.sort_values(['condition', 'author']).reset_index(drop=True)
+    group_keys['condition'] = group_keys['condition'].astype(str)
+    group_codes = pd.MultiIndex.from_frame(group_keys).get_indexer(
+        pd.MultiIndex.from_frame(meta[['condition', 'author']]))
+
+    originals = np.flatnonzero(meta['condition'] == 'original')
+    n_authors = meta.loc[originals, 'author'].nunique()
+
+    group_rows, repetition_rows, cluster_rows = [], [], []
+
+    # 2. Matrizes
+    print(f"\n[2/4] Calculando matrizes ({', '.join(args.metrics)})...")
+    for metric in args.metrics:
+        print(f"   • {metric}")
+        matrix = distance_matrix(values, DATA_DIR / f"distances_{metric}.npy", metric, args.block_size)
+
+        # Confusão entre grupos (condição × autor)
+        block_means = group_block_means(matrix, group_codes, len(group_keys))
+        for a, (cond_a, author_a) in group_keys.iterrows():
+            for b, (cond_b, author_b) in group_keys.iterrows():
+                group_rows.append({
+                    'metric': metric,
+                    'condition_a': cond_a, 'author_a': author_a,
+                    'condition_b': cond_b, 'author_b': author_b,
+                    'mean_distance': block_means[a, b]
+                })
+
+        # Repetições do mesmo sample vs samples diferentes do mesmo autor
+        pairs = repetition_distances(matrix, meta)
+        for (condition, author), group in pairs.groupby(['condition', 'author'], sort=False):
+            g = group_keys.index[(group_keys['condition'] == condition) & (group_keys['author'] == author)][0]
+            repetition_rows.append({
+                'metric': metric,
+                'condition': condition,
+                'author': author,
+                'n_pairs': len(group),
+                'mean_within_sample': group['distance'].mean(),
+                'mean_within_author': block_means[g, g],
+                'ratio': group['distance'].mean() / block_means[g, g]
+            })
+
+        # Agrupamento hierárquico dos originais (average linkage, corte em n autores)
+        sub = np.asarray(matrix[np.ix_(originals, originals)], dtype=np.float64)
+        if not np.isnan(sub).any():
+            labels = fcluster(linkage(squareform(sub, checks=False), method='average'),
+                              n_authors, criterion='maxclust')
+            cluster_rows.append({
+                'metric': metric,
+                'n_clusters': n_authors,
+                'adjusted_rand': adjusted_rand_score(meta.loc[originals, 'author'], labels)
+            })
+        del matrix
+
+    # 3. Resumos
+    print("\n[3/4] Salvando resumos...")
+    group_df = pd.DataFrame(group_rows)
+    group_df.to_csv(DATA_DIR / "group_distances.csv", index=False)
+    repetition_df = pd.DataFrame(repetition_rows)
+    repetition_df.to_csv(DATA_DIR / "repetition_distances.csv", index=False)
+    cluster_df = pd.DataFrame(cluster_rows)
+    cluster_df.to_csv(DATA_DIR / "original_clustering.csv", index=False)
+    print("   ✓ Salvo: group_distances.csv, repetition_distances.csv, original_clustering.csv")
+
+    for _, row in cluster_df.iterrows():
+        print(f"   • {row['metric']}: ARI originais × autores = {row['adjusted_rand']:.3f}")
+
+    # 4. Relatório
+    print("\n[4/4] Gerando relatório...")
+
+    report = f"""# Matrizes de Distância Texto × Texto
+
+## Dados
+- Arquivo: `{store.source}` (métricas de `metrics_filtered/filter_spec.json`)
+- N textos: {len(meta)} ({', '.join(f"{c}: {(meta['condition'] == c).sum()}" for c in CONDITIONS)})
+- N métricas: {len(store.metric_cols)}
+- Distâncias: {', '.join(args.metrics)}
+
+## Método
+Métricas em z-score (média/desvio de todos os textos, NaN ignorados). Cada par de textos usa só as métricas válidas em ambos: euclidiana reescalada por m / n_comum, cosseno, e Delta de Burrows (média de |Δz|). Matrizes calculadas em blocos do triângulo superior e gravadas em `.npy` float32 (memmap). Repetições: distância média entre as repetições de um mesmo sample, comparada à distância média entre textos do mesmo autor e condição (razão < 1 = repetições mais parecidas entre si que textos diferentes do autor). Agrupamento: average linkage dos originais cortado em {n_authors} clusters, comparado aos autores pelo Adjusted Rand Index (1 = recupera os autores).
+
+## Resultados
+
+### 1. Agrupamento dos Originais
+
+| Distância | ARI |
+|-----------|-----|
+"""
+
+    for _, row in cluster_df.iterrows():
+        report += f"| {row['metric']} | {row['adjusted_rand']:.3f} |\n"
+
+    report += """
+
+### 2. Repetições vs Mesmo Autor (média entre autores)
+
+| Distância | Condição | Dentro do Sample | Dentro do Autor | Razão |
+|-----------|----------|------------------|-----------------|-------|
+"""
+
+    summary = repetition_df.groupby(['metric', 'condition'], sort=False)[
+        ['mean_within_sample', 'mean_within_author', 'ratio']].mean().reset_index()
+    for _, row in summary.iterrows():
+        report += (f"| {row['metric']} | {row['condition']} | {row['mean_within_sample']:.3f} "
+                   f"| {row['mean_within_author']:.3f} | {row['ratio']:.3f} |\n")
+
+    report += """
+
+### 3. Gerados vs Originais de Cada Autor
+
+Distância média de cada grupo de textos gerados aos originais de cada autor. O menor valor da linha indica de qual autor os textos ficaram mais próximos.
+
+"""
+
+    for metric in args.metrics:
+        sub = group_df[(group_df['metric'] == metric) & (group_df['condition_a'] != 'original')
+                       & (group_df['condition_b'] == 'original')]
+        table = sub.pivot_table(index=['condition_a', 'author_a'], columns='author_b',
+                                values='mean_distance', sort=False)
+        report += f"#### {metric}\n\n| Condição | Autor | " + " | ".join(table.columns) + " |\n"
+        report += "|----------|-------|" + "|".join("---" for _ in table.columns) + "|\n"
+        for (condition, author), row in table.iterrows():
+            best = row.idxmin()
+            cells = [f"**{v:.3f}**" if col == best else f"{v:.3f}" for col, v in row.items()]
+            report += f"| {condition} | {author} | " + " | ".join(cells) + " |\n"
+        report += "\n"
+
+    report += """## Arquivos Gerados
+- `data/texts.csv`: metadados na ordem das linhas/colunas das matrizes
+- `data/distances_{métrica}.npy`: matriz completa float32 (não versionada; `np.load(..., mmap_mode='r')`)
+- `data/group_distances.csv`: distância média entre grupos condição × autor
+- `data/repetition_distances.csv`: repetições do mesmo sample vs textos do mesmo autor
+- `data/original_clustering.csv`: ARI do agrupamento hierárquico dos originais
+"""
+
+    with open(OUTPUT_DIR / "report.md", 'w', encoding='utf-8') as f:
+        f.write(report)
+
+    print("   ✓ Relatório salvo: report.md")
+    print("\n" + "=" * 70)
+    print("✅ MATRIZES DE DISTÂNCIA COMPLETAS")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
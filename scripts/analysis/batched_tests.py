@@ -0,0 +1,144 @@
+"""
+Testes de diferença entre grupos para todas as métricas de uma vez.
+
+Para uma tabela textos × métricas e um rótulo de grupo (ex.: autor), calcula
+em operações de array sobre todas as colunas:
+- ANOVA de um fator (F, p) e eta² = SS_entre / SS_total
+- Kruskal–Wallis (H com correção de empates, p) e epsilon² = H / (N − 1)
+- Correção de Benjamini–Hochberg (FDR) dos dois p-valores
+
+Os postos de todas as colunas saem de um único argsort (postos médios nos
+empates). NaN são ignorados coluna a coluna, como em `dropna()` por métrica;
+os resultados coincidem com `scipy.stats.f_oneway` e `scipy.stats.kruskal`
+aplicados métrica a métrica.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def rank_columns(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Postos médios por coluna (1..n_válidos), ignorando NaN.
+
+    Parameters
+    ----------
+    X : np.ndarray (n × m)
+
+    Returns
+    -------
+    (ranks, tie_sum)
+        ranks: (n × m), NaN onde X é NaN; tie_sum: (m,) Σ (t³ − t) sobre os
+        grupos de empate de cada coluna
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n, m = X.shape
+    order = np.argsort(X, axis=0, kind='stable')  # NaN vão para o fim
+    S = np.take_along_axis(X, order, axis=0)
+    valid = ~np.isnan(S)
+
+    # Limites dos grupos de empate: primeira e última posição de cada valor
+    pos = np.broadcast_to(np.arange(n)[:, None], (n, m))
+    new = np.ones((n, m), dtype=bool)
+    new[1:] = S[1:] != S[:-1]
+    end = np.ones((n, m), dtype=bool)
+    end[:-1] = new[1:]
+    first = np.maximum.accumulate(np.where(new, pos, 0), axis=0)
+    last = np.minimum.accumulate(np.where(end, pos, n)[::-1], axis=0)[::-1]
+
+    sorted_ranks = np.where(valid, (first + last) / 2 + 1, np.nan)
+    ranks = np.empty_like(sorted_ranks)
+    np.put_along_axis(ranks, order, sorted_ranks, axis=0)
+
+    t = (last - first + 1).astype(np.float64)
+    tie_sum = np.where(valid, t ** 2 - 1, 0.0).sum(axis=0)  # Σ_grupos t(t² − 1)
+    return ranks, tie_sum
+
+
+def fdr_bh(p_values: np.ndarray) -> np.ndarray:
+    """P-valores ajustados por Benjamini–Hochberg (NaN preservados e fora da contagem)."""
+    p = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full_like(p, np.nan)
+    ok = ~np.isnan(p)
+    n = ok.sum()
+    if n == 0:
+        return adjusted
+    order = np.argsort(p[ok])
+    scaled = p[ok][order] * n / np.arange(1, n + 1)
+    scaled = np.minimum.accumulate(scaled[::-1])[::-1]
+    values = np.empty(n)
+    values[order] = np.minimum(scaled, 1.0)
+    adjusted[ok] = values
+    return adjusted
+
+
+def group_tests(
+    df: pd.DataFrame,
+    value_cols: List[str],
+    group_col: str
+) -> pd.DataFrame:
+    """
+    ANOVA, Kruskal–Wallis, tamanhos de efeito e FDR para todas as colunas.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Uma linha por observação
+    value_cols : list of str
+        Colunas testadas
+    group_col : str
+        Coluna com o rótulo do grupo
+
+    Returns
+    -------
+    DataFrame metric, n, n_groups, f_statistic, p_value, p_value_fdr,
+    eta_squared, kruskal_h, kruskal_p, kruskal_p_fdr, epsilon_squared
+    (na ordem de `value_cols`)
+    """
+    X = df[value_cols].to_numpy(dtype=np.float64)
+    codes, _ = pd.factorize(df[group_col])
+    G = (codes[:, None] == np.arange(codes.max() + 1)[None, :]).astype(np.float64)  # n × k
+    valid = ~np.isnan(X)
+    W = valid.astype(np.float64)
+    filled = np.where(valid, X, 0.0)
+
+    n_j = G.T @ W                                  # k × m
+    N = n_j.sum(axis=0)
+    k = (n_j > 0).sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # ANOVA
+        means_j = (G.T @ filled) / n_j
+        grand = filled.sum(axis=0) / N
+        ss_between = np.nansum(n_j * (means_j - grand) ** 2, axis=0)
+        residual = np.where(valid, X - G @ np.nan_to_num(means_j), 0.0)
+        ss_within = (residual ** 2).sum(axis=0)
+        df_between, df_within = k - 1, N - k
+        f_stat = (ss_between / df_between) / (ss_within / df_within)
+        f_p = stats.f.sf(f_stat, df_between, df_within)
+        eta_squared = ss_between / (ss_between + ss_within)
+
+        # Kruskal–Wallis
+        ranks, tie_sum = rank_columns(X)
+        rank_sums = G.T @ np.where(valid, ranks, 0.0)
+        h = 12.0 / (N * (N + 1)) * np.nansum(rank_sums ** 2 / n_j, axis=0) - 3 * (N + 1)
+        h = h / (1 - tie_sum / (N ** 3 - N))
+        h_p = stats.chi2.sf(h, df_between)
+        epsilon_squared = h / (N - 1)
+
+    return pd.DataFrame({
+        'metric': value_cols,
+        'n': N.astype(int),
+        'n_groups': k,
+        'f_statistic': f_stat,
+        'p_value': f_p,
+        'p_value_fdr': fdr_bh(f_p),
+        'eta_squared': eta_squared,
+        'kruskal_h': h,
+        'kruskal_p': h_p,
+        'kruskal_p_fdr': fdr_bh(h_p),
+        'epsilon_squared': epsilon_squared
+    })
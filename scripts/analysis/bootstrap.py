@@ -0,0 +1,159 @@
+"""
+Bootstrap por sample (cluster bootstrap) vetorizado.
+
+A unidade reamostrada é o sample (author, title, sample_idx): as 3
+repetições de cada método e todos os métodos do mesmo sample entram ou saem
+juntos. Cada réplica é um vetor de pesos multinomiais sobre os samples
+(quantas vezes cada um foi sorteado), então as médias de todas as réplicas
+saem de um produto de matrizes:
+
+    médias[b] = (pesos[b] @ somas_por_sample) / (pesos[b] @ contagens_por_sample)
+
+Como os métodos compartilham os pesos, as réplicas são pareadas entre
+métodos. NaN são ignorados nas médias.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def cluster_weights(n_clusters: int, n_resamples: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Pesos de reamostragem com reposição.
+
+    Returns
+    -------
+    np.ndarray (n_resamples × n_clusters)
+        Número de vezes que cada cluster foi sorteado (soma = n_clusters)
+    """
+    probs = np.full(n_clusters, 1.0 / n_clusters)
+    return rng.multinomial(n_clusters, probs, size=n_resamples).astype(np.float64)
+
+
+def bootstrap_group_means(
+    values: np.ndarray,
+    groups: np.ndarray,
+    clusters: np.ndarray,
+    n_groups: int,
+    n_resamples: int = 10000,
+    seed: int = 42,
+    chunk_size: int = 2000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Médias por grupo e suas réplicas bootstrap, reamostrando clusters.
+
+    Parameters
+    ----------
+    values : np.ndarray (n,) ou (n × m)
+        Valores por linha (NaN = ausente)
+    groups : np.ndarray (n,)
+        Código do grupo (0..n_groups-1), ex.: método
+    clusters : np.ndarray (n,)
+        Identificador do cluster reamostrado, ex.: sample
+    n_groups : int
+        Número de grupos
+    n_resamples : int
+        Número de réplicas
+    seed : int
+        Semente
+    chunk_size : int
+        Réplicas por produto de matrizes (limita memória)
+
+    Returns
+    -------
+    (point, replicates)
+        point: (n_groups × m) médias observadas;
+        replicates: (n_resamples × n_groups × m)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n, m = values.shape
+    valid = ~np.isnan(values)
+    clusters = pd.factorize(np.asarray(clusters))[0]
+    n_clusters = clusters.max() + 1
+
+    # Somas e contagens por (cluster, grupo), achatadas em colunas grupo × métrica
+    cell = clusters * n_groups + np.asarray(groups)
+    sums = np.zeros((n_clusters * n_groups, m))
+    counts = np.zeros((n_clusters * n_groups, m))
+    np.add.at(sums, cell, np.where(valid, values, 0.0))
+    np.add.at(counts, cell, valid)
+    sums = sums.reshape(n_clusters, n_groups * m)
+    counts = counts.reshape(n_clusters, n_groups * m)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        point = (sums.sum(axis=0) / counts.sum(axis=0)).reshape(n_groups, m)
+
+        rng = np.random.default_rng(seed)
+        replicates = np.empty((n_resamples, n_groups * m))
+        for start in range(0, n_resamples, chunk_size):
+            weights = cluster_weights(n_clusters, min(chunk_size, n_resamples - start), rng)
+            replicates[start:start + len(weights)] = (weights @ sums) / (weights @ counts)
+
+    return point, replicates.reshape(n_resamples, n_groups, m)
+
+
+def percentile_ci(replicates: np.ndarray, level: float = 0.95) -> Tuple[np.ndarray, np.ndarray]:
+    """Intervalo percentil (limite inferior, superior) ao longo do eixo das réplicas."""
+    alpha = (1 - level) / 2
+    with np.errstate(invalid='ignore'):
+        low, high = np.nanpercentile(replicates, [100 * alpha, 100 * (1 - alpha)], axis=0)
+    return low, high
+
+
+def bootstrap_ci_table(
+    df: pd.DataFrame,
+    value_cols: list,
+    group_col: str,
+    groups: list,
+    cluster_cols: Tuple[str, ...] = ('author', 'title', 'sample_idx'),
+    level: float = 0.95,
+    **kwargs
+) -> pd.DataFrame:
+    """
+    IC bootstrap da média de cada coluna, por grupo.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Uma linha por texto (ou por sample)
+    value_cols : list of str
+        Colunas cujas médias recebem IC
+    group_col : str
+        Coluna do grupo (ex.: 'method')
+    groups : list of str
+        Grupos, na ordem da tabela de saída
+    cluster_cols : tuple of str
+        Colunas que identificam o cluster reamostrado
+    level : float
+        Nível de confiança
+    **kwargs
+        Repassados a `bootstrap_group_means`
+
+    Returns
+    -------
+    DataFrame group_col, statistic, mean, ci_low, ci_high, n_clusters
+    """
+    df = df[df[group_col].isin(groups)]
+    codes = pd.Categorical(df[group_col], categories=list(groups)).codes
+    clusters = df.groupby(list(cluster_cols), sort=False).ngroup().to_numpy()
+    point, replicates = bootstrap_group_means(df[value_cols].to_numpy(dtype=np.float64), codes, clusters,
+                                              len(groups), **kwargs)
+    low, high = percentile_ci(replicates, level)
+    n_clusters = pd.Series(clusters).groupby(codes).nunique()
+
+    rows = []
+    for g, group in enumerate(groups):
+        for j, col in enumerate(value_cols):
+            rows.append({
+                group_col: group,
+                'statistic': col,
+                'mean': point[g, j],
+                'ci_low': low[g, j],
+                'ci_high': high[g, j],
+                'n_clusters': n_clusters.get(g, 0)
+            })
+    return pd.DataFrame(rows)
@@ -0,0 +1,188 @@
+"""
+Detecção escalável de pares de métricas altamente correlacionadas.
+
+Correlação de Pearson com observações completas par a par (cada par usa
+todas as linhas em que ambas as métricas são válidas, como `DataFrame.corr()`),
+calculada em blocos de colunas: apenas blocos do triângulo superior são
+computados e cada bloco vira uma matriz pequena (block_size × block_size),
+de modo que milhares de métricas candidatas podem ser triadas sem montar a
+matriz de correlação completa.
+
+Uso:
+    python correlation_engine.py metrics/full_text/individual/all_texts.csv [--threshold 0.95]
+"""
+
+import argparse
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+METADATA_COLS = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
+
+
+def _prepare(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Separa máscara de validade e valores centrados/escalados por coluna.
+
+    Centrar e escalar não altera r (invariância afim) e evita perda de
+    precisão nas somas de produtos quando as métricas têm escalas distintas.
+    """
+    mask = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        center = np.nanmean(values, axis=0)
+        scale = np.nanstd(values, axis=0)
+    center = np.where(np.isfinite(center), center, 0.0)
+    scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+    x = np.where(mask, (values - center) / scale, 0.0)
+    return x, mask.astype(np.float64), x * x
+
+
+def _corr_block(
+    xa: np.ndarray, ma: np.ndarray, sqa: np.ndarray,
+    xb: np.ndarray, mb: np.ndarray, sqb: np.ndarray,
+    min_periods: int
+) -> np.ndarray:
+    """
+    Correlação par a par entre as colunas de dois blocos.
+
+    Para cada par (a, b), as somas são restritas às linhas válidas em ambos:
+    n = Ma'Mb, Σa = Xa'Mb, Σb = Ma'Xb, Σa² = Xa²'Mb, Σb² = Ma'Xb², Σab = Xa'Xb
+    (valores ausentes já zerados em X).
+    """
+    n = ma.T @ mb
+    sum_a = xa.T @ mb
+    sum_b = ma.T @ xb
+    sum_aa = sqa.T @ mb
+    sum_bb = ma.T @ sqb
+    sum_ab = xa.T @ xb
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sum_ab - sum_a * sum_b / n
+        var_a = sum_aa - sum_a * sum_a / n
+        var_b = sum_bb - sum_b * sum_b / n
+        r = cov / np.sqrt(var_a * var_b)
+
+    r[(n < min_periods) | (var_a <= 0) | (var_b <= 0)] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def iter_correlation_blocks(
+    values: np.ndarray,
+    block_size: int = 512,
+    min_periods: int = 3
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Percorre os blocos do triângulo superior da matriz de correlação.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Matriz textos × métricas (NaN = ausente)
+    block_size : int
+        Número de colunas por bloco
+    min_periods : int
+        Mínimo de observações pareadas para calcular r (senão NaN)
+
+    Yields
+    ------
+    (start_i, start_j, block)
+        `block[a, b]` é r entre as colunas start_i + a e start_j + b
+        (start_j ≥ start_i; no bloco diagonal só vale a parte acima da diagonal)
+    """
+    x, m, sq = _prepare(np.asarray(values, dtype=np.float64))
+    n_cols = x.shape[1]
+    for i in range(0, n_cols, block_size):
+        si = slice(i, min(i + block_size, n_cols))
+        for j in range(i, n_cols, block_size):
+            sj = slice(j, min(j + block_size, n_cols))
+            yield i, j, _corr_block(x[:, si], m[:, si], sq[:, si],
+                                    x[:, sj], m[:, sj], sq[:, sj], min_periods)
+
+
+def high_correlation_pairs(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    threshold: float = 0.95,
+    block_size: int = 512,
+    min_periods: int = 3
+) -> pd.DataFrame:
+    """
+    Encontra pares de métricas com |r| ≥ threshold.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tabela de métricas (uma linha por texto)
+    columns : list of str, optional
+        Métricas a comparar (padrão: todas exceto metadados)
+    threshold : float
+        Limiar de |r|
+    block_size : int
+        Número de colunas por bloco
+    min_periods : int
+        Mínimo de observações pareadas
+
+    Returns
+    -------
+    DataFrame com colunas metric_1, metric_2, correlation
+    (metric_1 antes de metric_2 na ordem de `columns`)
+    """
+    if columns is None:
+        columns = [c for c in df.columns if c not in METADATA_COLS]
+    columns = list(columns)
+
+    idx_1, idx_2, found = [], [], []
+    for i, j, block in iter_correlation_blocks(df[columns].to_numpy(dtype=np.float64),
+                                               block_size, min_periods):
+        hits = np.abs(block) >= threshold
+        if i == j:
+            hits = np.triu(hits, k=1)
+        a, b = np.nonzero(hits)
+        idx_1.append(a + i)
+        idx_2.append(b + j)
+        found.append(block[a, b])
+
+    if not found:
+        return pd.DataFrame(columns=['metric_1', 'metric_2', 'correlation'])
+
+    idx_1 = np.concatenate(idx_1)
+    idx_2 = np.concatenate(idx_2)
+    found = np.concatenate(found)
+    order = np.lexsort((idx_2, idx_1))
+    names = np.asarray(columns, dtype=object)
+
+    return pd.DataFrame({
+        'metric_1': names[idx_1[order]],
+        'metric_2': names[idx_2[order]],
+        'correlation': found[order]
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Screen metric tables for highly correlated pairs')
+    parser.add_argument('metrics_file', type=str, help='CSV with one row per text')
+    parser.add_argument('--threshold', type=float, default=0.95, help='Minimum |r| (default: 0.95)')
+    parser.add_argument('--block-size', type=int, default=512, help='Columns per block (default: 512)')
+    parser.add_argument('--min-periods', type=int, default=3,
+                        help='Minimum pairwise-complete observations (default: 3)')
+    parser.add_argument('--output', type=str, default=None, help='Output CSV (default: print summary)')
+
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.metrics_file)
+    pairs = high_correlation_pairs(df, threshold=args.threshold,
+                                   block_size=args.block_size, min_periods=args.min_periods)
+    pairs = pairs.sort_values('correlation', ascending=False, key=abs)
+
+    print(f"⚠ Pares com |r| ≥ {args.threshold}: {len(pairs)}")
+    if args.output:
+        pairs.to_csv(args.output, index=False)
+        print(f"✓ Salvo em: {args.output}")
+    else:
+        print(pairs.head(20).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Matrizes de distância texto × texto em blocos, gravadas em memmap float32.
+
+Métricas (todas com máscara par a par: cada par de textos usa apenas as
+métricas válidas em ambos, como `correlation_engine` faz para colunas):
+- euclidean: sqrt(m / n_comum · Σ (x_i − x_j)²), a convenção de
+  `sklearn.metrics.pairwise.nan_euclidean_distances` (sem NaN = euclidiana)
+- cosine: 1 − Σ x_i x_j / sqrt(Σ x_i² · Σ x_j²)
+- delta: Delta de Burrows, média de |z_i − z_j| sobre as métricas comuns
+
+Com `standardize=True` (padrão), as colunas são convertidas em z-score antes
+(média/desvio ignorando NaN); é o que define o Delta de Burrows.
+
+Apenas blocos do triângulo superior (linhas i ≤ j) são calculados; cada
+bloco é gravado nas duas metades de um .npy aberto com `open_memmap`, então a
+matriz completa nunca precisa caber na memória e pode ser lida depois com
+`np.load(caminho, mmap_mode='r')`.
+
+Uso:
+    python distance_engine.py metrics_filtered/all_texts_filtered.csv distancias.npy [--metric delta]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+METADATA_COLS = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
+METRICS = ('euclidean', 'cosine', 'delta')
+
+
+def _prepare(values: np.ndarray, standardize: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Valores (NaN zerados, z-score opcional), máscara de validade e quadrados."""
+    values = np.asarray(values, dtype=np.float64)
+    mask = ~np.isnan(values)
+    if standardize:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            center = np.nanmean(values, axis=0)
+            scale = np.nanstd(values, axis=0)
+        center = np.where(np.isfinite(center), center, 0.0)
+        scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        values = (values - center) / scale
+    x = np.where(mask, values, 0.0)
+    return x, mask.astype(np.float64), x * x
+
+
+def _distance_block(
+    xa: np.ndarray, ma: np.ndarray, sqa: np.ndarray,
+    xb: np.ndarray, mb: np.ndarray, sqb: np.ndarray,
+    metric: str,
+    min_common: int
+) -> np.ndarray:
+    """
+    Distâncias entre as linhas de dois blocos, restritas às métricas comuns.
+
+    Com X zerado fora da máscara: n = Ma Mb', Σx_i² = Sqa Mb', Σx_j² = Ma Sqb',
+    Σx_i x_j = Xa Xb'. O Delta (L1) não tem forma de produto de matrizes e é
+    acumulado em fatias de linhas.
+    """
+    n = ma @ mb.T
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if metric == 'delta':
+            total = np.empty(n.shape)
+            step = max(1, 2 ** 22 // max(1, len(xb) * xa.shape[1]))
+            for s in range(0, len(xa), step):
+                both = ma[s:s + step, None, :] * mb[None, :, :]
+                total[s:s + step] = (np.abs(xa[s:s + step, None, :] - xb[None, :, :]) * both).sum(axis=2)
+            out = total / n
+        else:
+            sum_aa = sqa @ mb.T
+            sum_bb = ma @ sqb.T
+            sum_ab = xa @ xb.T
+            if metric == 'euclidean':
+                sq = np.maximum(sum_aa + sum_bb - 2 * sum_ab, 0.0)
+                out = np.sqrt(sq * (xa.shape[1] / n))
+            else:
+                out = 1.0 - sum_ab / np.sqrt(sum_aa * sum_bb)
+                out = np.clip(out, 0.0, 2.0)
+
+    out[n < min_common] = np.nan
+    return out
+
+
+def iter_distance_blocks(
+    values: np.ndarray,
+    metric: str = 'euclidean',
+    block_size: int = 1024,
+    standardize: bool = True,
+    min_common: int = 1
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Percorre os blocos do triângulo superior da matriz de distâncias.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Matriz textos × métricas (NaN = ausente)
+    metric : str
+        'euclidean', 'cosine' ou 'delta'
+    block_size : int
+        Número de textos por bloco
+    standardize : bool
+        Converter colunas em z-score antes
+    min_common : int
+        Mínimo de métricas válidas em ambos os textos (senão NaN)
+
+    Yields
+    ------
+    (start_i, start_j, block)
+        `block[a, b]` é a distância entre os textos start_i + a e start_j + b
+        (start_j ≥ start_i)
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Métrica desconhecida: {metric} (use {', '.join(METRICS)})")
+    x, m, sq = _prepare(values, standardize)
+    n_rows = len(x)
+    for i in range(0, n_rows, block_size):
+        si = slice(i, min(i + block_size, n_rows))
+        for j in range(i, n_rows, block_size):
+            sj = slice(j, min(j + block_size, n_rows))
+            yield i, j, _distance_block(x[si], m[si], sq[si], x[sj], m[sj], sq[sj], metric, min_common)
+
+
+def print_progress(done: int, total: int, elapsed: float) -> None:
+    """Progresso padrão: blocos concluídos, percentual e tempo decorrido."""
+    end = '\n' if done == total else '\r'
+    print(f"   ▸ blocos {done}/{total} ({100 * done / total:.0f}%) em {elapsed:.1f}s", end=end, flush=True)
+
+
+def distance_matrix(
+    values: np.ndarray,
+    output: Path,
+    metric: str = 'euclidean',
+    block_size: int = 1024,
+    standardize: bool = True,
+    min_common: int = 1,
+    progress: Optional[Callable[[int, int, float], None]] = print_progress
+) -> np.memmap:
+    """
+    Calcula a matriz completa e grava em `output` (.npy float32 via memmap).
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Matriz textos × métricas (NaN = ausente)
+    output : Path
+        Arquivo .npy de saída
+    metric, block_size, standardize, min_common
+        Ver `iter_distance_blocks`
+    progress : callable, optional
+        Chamado como progress(blocos_feitos, total_blocos, segundos) após
+        cada bloco (None = silencioso)
+
+    Returns
+    -------
+    np.memmap (n × n) float32, simétrica, aberta em modo leitura
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    n_rows = len(values)
+    n_blocks = -(-n_rows // block_size)
+    total = n_blocks * (n_blocks + 1) // 2
+
+    matrix = np.lib.format.open_memmap(output, mode='w+', dtype=np.float32, shape=(n_rows, n_rows))
+    start = time.perf_counter()
+    for done, (i, j, block) in enumerate(iter_distance_blocks(values, metric, block_size,
+                                                              standardize, min_common), 1):
+        rows, cols = block.shape
+        matrix[i:i + rows, j:j + cols] = block
+        if i != j:
+            matrix[j:j + cols, i:i + rows] = block.T
+        if progress is not None:
+            progress(done, total, time.perf_counter() - start)
+
+    diagonal = np.diagonal(matrix).copy()
+    np.fill_diagonal(matrix, np.where(np.isnan(diagonal), np.nan, 0.0))
+    matrix.flush()
+    del matrix
+    return np.load(output, mmap_mode='r')
+
+
+def group_block_means(
+    matrix: np.ndarray,
+    codes: np.ndarray,
+    n_groups: int,
+    exclude_diagonal: bool = True,
+    chunk_size: int = 4096
+) -> np.ndarray:
+    """
+    Distância média entre cada par de grupos de textos (n_groups × n_groups).
+
+    Lê a matriz (ex.: memmap) em fatias de linhas; NaN e, por padrão, a
+    diagonal (texto com ele mesmo) ficam fora das médias.
+    """
+    codes = np.asarray(codes)
+    G = (codes[:, None] == np.arange(n_groups)[None, :]).astype(np.float64)
+    sums = np.zeros((n_groups, n_groups))
+    counts = np.zeros((n_groups, n_groups))
+    for start in range(0, len(codes), chunk_size):
+        block = np.asarray(matrix[start:start + chunk_size], dtype=np.float64)
+        valid = ~np.isnan(block)
+        if exclude_diagonal:
+            rows = np.arange(len(block))
+            valid[rows, start + rows] = False
+        sums += G[start:start + chunk_size].T @ np.where(valid, block, 0.0) @ G
+        counts += G[start:start + chunk_size].T @ valid.astype(np.float64) @ G
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compute an all-pairs text distance matrix into a float32 .npy memmap')
+    parser.add_argument('metrics_file', type=str, help='CSV with one row per text')
+    parser.add_argument('output', type=str, help='Output .npy file')
+    parser.add_argument('--metric', choices=METRICS, default='euclidean', help='Distance (default: euclidean)')
+    parser.add_argument('--block-size', type=int, default=1024, help='Texts per block (default: 1024)')
+    parser.add_argument('--raw', action='store_true', help='Do not z-score columns first')
+    parser.add_argument('--min-common', type=int, default=1,
+                        help='Minimum metrics valid in both texts (default: 1)')
+
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.metrics_file)
+    columns: List[str] = [c for c in df.columns if c not in METADATA_COLS]
+    print(f"✓ {len(df)} textos × {len(columns)} métricas → {args.metric}")
+    matrix = distance_matrix(df[columns].to_numpy(dtype=np.float64), Path(args.output), args.metric,
+                             args.block_size, not args.raw, args.min_common)
+    print(f"✓ Salvo em: {args.output} ({matrix.shape[0]}×{matrix.shape[1]} float32)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Feature store em memória para os scripts de análise (scripts/analysis e analysis2).
+
+Carrega a tabela de métricas filtrada uma única vez por processo (via
+`filter_spec.load_filtered_metrics`) e guarda as métricas como matriz numpy
+(float32 por padrão; float64 para números reportados). Visões derivadas são
+calculadas sob demanda e mantidas em cache:
+
+- `frame(condition, author)`: DataFrame metadados + métricas (cópia)
+- `filled(condition, author)`: NaN preenchidos com a média do próprio subconjunto
+- `standardized(condition)`: z-score (StandardScaler) ajustado no subconjunto
+- `project(condition, author, fit='original')`: z-score com o scaler de outro subconjunto
+- `author_means(condition)`: média por autor
+- `pairs()`: junção gerado → original (author, title, sample_idx)
+
+Uma sessão inteira pode compartilhar o mesmo carregamento executando os
+scripts no mesmo processo:
+
+    python feature_store.py run ../../analysis2/01_estilo_autoral/scripts/02_key_metrics_original.py ...
+"""
+
+import argparse
+import os
+import runpy
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(str(Path(__file__).parent))
+from filter_spec import METADATA_COLS, load_filtered_metrics
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+MATCH_KEYS = ['author', 'title', 'sample_idx']
+
+# Uma condição ('original') ou várias (['original', 'baseline'])
+Condition = Union[str, Sequence[str]]
+
+
+def _as_key(condition: Optional[Condition]):
+    """Normaliza listas de condições para tupla (chave de cache)."""
+    if condition is None or isinstance(condition, str):
+        return condition
+    return tuple(condition)
+
+
+class FeatureStore:
+    """
+    Métricas de todos os textos em uma matriz única, com visões em cache.
+
+    Parameters
+    ----------
+    table : pd.DataFrame
+        Tabela filtrada (metadados + métricas), uma linha por texto
+    dtype : str or np.dtype
+        Tipo da matriz de métricas ('float32' ou 'float64')
+    source : str
+        Arquivo de origem (para relatórios)
+
+    Notes
+    -----
+    Arrays devolvidos são somente leitura e DataFrames são cópias, de modo
+    que scripts executados na mesma sessão não alteram o cache uns dos outros.
+    """
+
+    def __init__(self, table: pd.DataFrame, dtype='float32', source: str = ''):
+        self.dtype = np.dtype(dtype)
+        self.source = source
+        self.metadata_cols = [c for c in METADATA_COLS if c in table.columns]
+        self.metric_cols = [c for c in table.columns if c not in METADATA_COLS]
+        self.meta = table[self.metadata_cols].copy()
+        self.values = self._readonly(table[self.metric_cols].to_numpy(dtype=self.dtype))
+        self._cache: Dict[Tuple, object] = {}
+
+    def __repr__(self) -> str:
+        return (f"FeatureStore({len(self.meta)} textos × {len(self.metric_cols)} métricas, "
+                f"{self.dtype}, {self.source})")
+
+    @staticmethod
+    def _readonly(array: np.ndarray) -> np.ndarray:
+        array.setflags(write=False)
+        return array
+
+    def _cached(self, key: Tuple, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def rows(self, condition: Optional[Condition] = None, author: Optional[str] = None) -> np.ndarray:
+        """
+        Posições (na tabela completa) dos textos da condição/autor.
+
+        `condition` pode ser uma condição ou uma lista de condições (ordem
+        original das linhas é mantida).
+        """
+        condition = _as_key(condition)
+
+        def build():
+            mask = np.ones(len(self.meta), dtype=bool)
+            if isinstance(condition, tuple):
+                mask &= self.meta['condition'].isin(condition).to_numpy()
+            elif condition is not None:
+                mask &= (self.meta['condition'] == condition).to_numpy()
+            if author is not None:
+                mask &= (self.meta['author'] == author).to_numpy()
+            return self._readonly(np.flatnonzero(mask))
+        return self._cached(('rows', condition, author), build)
+
+    def matrix(self, condition: Optional[Condition] = None, author: Optional[str] = None) -> np.ndarray:
+        """
+        Métricas brutas (com NaN) do subconjunto.
+
+        Mantém a ordem por colunas do DataFrame de origem: as reduções por
+        métrica (médias, desvios) somam na mesma ordem que no pandas.
+        """
+        condition = _as_key(condition)
+        return self._cached(('matrix', condition, author),
+                            lambda: self._readonly(np.asfortranarray(self.values[self.rows(condition, author)])))
+
+    def frame(self, condition: Optional[Condition] = None, author: Optional[str] = None) -> pd.DataFrame:
+        """
+        DataFrame metadados + métricas do subconjunto (cópia; índice = linha
+        na tabela completa, como em `df[df['condition'] == ...]`).
+        """
+        rows = self.rows(condition, author)
+        meta = self.meta.iloc[rows]
+        metrics = pd.DataFrame(self.matrix(condition, author), index=meta.index,
+                               columns=self.metric_cols).copy()
+        return pd.concat([meta.copy(), metrics], axis=1)
+
+    def filled(self, condition: Optional[Condition] = None, author: Optional[str] = None) -> np.ndarray:
+        """Métricas com NaN preenchidos pela média da coluna no próprio subconjunto."""
+        condition = _as_key(condition)
+
+        def build():
+            df = pd.DataFrame(self.matrix(condition, author), columns=self.metric_cols)
+            return self._readonly(df.fillna(df.mean()).to_numpy())
+        return self._cached(('filled', condition, author), build)
+
+    def scaler(self, condition: Optional[str] = 'original', fill: bool = True) -> StandardScaler:
+        """StandardScaler ajustado no subconjunto (preenchido ou com NaN)."""
+        def build():
+            data = self.filled(condition) if fill else self.matrix(condition)
+            return StandardScaler().fit(data)
+        return self._cached(('scaler', condition, fill), build)
+
+    def standardized(self, condition: Optional[str] = None, fill: bool = True) -> np.ndarray:
+        """
+        Z-score do subconjunto ajustado nele mesmo.
+
+        Com `fill=False`, NaN são mantidos (e ignorados no ajuste).
+        """
+        def build():
+            data = self.filled(condition) if fill else self.matrix(condition)
+            return self._readonly(self.scaler(condition, fill).transform(data))
+        return self._cached(('standardized', condition, fill), build)
+
+    def project(
+        self,
+        condition: Optional[str] = None,
+        author: Optional[str] = None,
+        fit: Optional[str] = 'original'
+    ) -> np.ndarray:
+        """
+        Z-score de um subconjunto com o scaler ajustado em `fit`.
+
+        Cada subconjunto preenche seus NaN com a própria média antes da
+        transformação (como nas análises de movimento no PCA).
+        """
+        return self._cached(('project', condition, author, fit),
+                            lambda: self._readonly(self.scaler(fit).transform(self.filled(condition, author))))
+
+    def author_means(self, condition: Optional[str] = 'original') -> pd.DataFrame:
+        """Média de cada métrica por autor (linhas em ordem alfabética de autor)."""
+        def build():
+            return self.frame(condition).groupby('author')[self.metric_cols].mean()
+        return self._cached(('author_means', condition), build).copy()
+
+    def pairs(self) -> pd.DataFrame:
+        """
+        Junção de cada texto gerado com seu original (author, title, sample_idx).
+
+        Returns
+        -------
+        DataFrame com `gen_row`, `orig_row` (posições na tabela completa),
+        `text_id_gen`, `text_id_orig` e os metadados do texto gerado; em caso de
+        originais repetidos, vale o primeiro.
+        """
+        def build():
+            meta = self.meta.reset_index(drop=True)
+            orig_keys = (
+                meta.loc[meta['condition'] == 'original', MATCH_KEYS]
+                .dropna()
+                .reset_index()
+                .rename(columns={'index': 'orig_row'})
+                .drop_duplicates(subset=MATCH_KEYS, keep='first')
+            )
+            joined = (
+                meta.loc[meta['condition'] != 'original', MATCH_KEYS]
+                .reset_index()
+                .rename(columns={'index': 'gen_row'})
+                .merge(orig_keys, on=MATCH_KEYS, how='inner')
+            )
+            gen = meta.iloc[joined['gen_row']].reset_index(drop=True)
+            return pd.DataFrame({
+                'gen_row': joined['gen_row'].to_numpy(),
+                'orig_row': joined['orig_row'].to_numpy(),
+                'text_id_gen': gen['text_id'].to_numpy(),
+                'text_id_orig': meta['text_id'].to_numpy()[joined['orig_row'].to_numpy()],
+                **{c: gen[c].to_numpy() for c in self.metadata_cols if c != 'text_id'}
+            })
+        return self._cached(('pairs',), build).copy()
+
+
+@lru_cache(maxsize=None)
+def _load_table(base_dir: str) -> Tuple[pd.DataFrame, str]:
+    # Leitura única do disco por processo
+    return load_filtered_metrics(Path(base_dir))
+
+
+@lru_cache(maxsize=None)
+def _get_store(base_dir: str, dtype: str) -> FeatureStore:
+    table, source = _load_table(base_dir)
+    return FeatureStore(table, dtype=dtype, source=source)
+
+
+def get_store(base_dir: Optional[Path] = None, dtype: str = 'float32') -> FeatureStore:
+    """
+    Feature store compartilhado do processo.
+
+    Parameters
+    ----------
+    base_dir : Path, optional
+        Raiz do projeto (padrão: detectada a partir deste arquivo)
+    dtype : str
+        'float32' (padrão) ou 'float64' para números reportados em tabelas
+
+    Notes
+    -----
+    O CSV é lido uma vez por processo; stores de dtypes diferentes
+    compartilham a mesma leitura.
+    """
+    base_dir = Path(base_dir).resolve() if base_dir is not None else BASE_DIR
+    return _get_store(str(base_dir), str(np.dtype(dtype)))
+
+
+def run_session(scripts: List[str]) -> None:
+    """
+    Executa scripts de análise em sequência no mesmo processo, compartilhando
+    o feature store (cada script roda no próprio diretório, como se chamado
+    diretamente).
+    """
+    cwd = os.getcwd()
+    argv = sys.argv
+    for script in scripts:
+        path = Path(script).resolve()
+        print(f"\n▶️  {path.relative_to(BASE_DIR) if path.is_relative_to(BASE_DIR) else path}")
+        os.chdir(path.parent)
+        sys.argv = [str(path)]
+        try:
+            runpy.run_path(str(path), run_name='__main__')
+        finally:
+            os.chdir(cwd)
+            sys.argv = argv
+            import matplotlib.pyplot as plt
+            plt.close('all')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared feature store for the analysis scripts')
+    subparsers = parser.add_subparsers(dest='command')
+    sub = subparsers.add_parser('run', help='Run analysis scripts in one process sharing the loaded data')
+    sub.add_argument('scripts', nargs='+', help='Script paths')
+
+    args = parser.parse_args()
+
+    # Usar o módulo importável (não __main__) para que os scripts vejam o mesmo cache
+    import feature_store
+
+    if args.command == 'run':
+        feature_store.run_session(args.scripts)
+        print(f"\n✓ {len(args.scripts)} scripts; leituras do disco: {feature_store._load_table.cache_info().misses}")
+    else:
+        store = feature_store.get_store()
+        print(store)
+        for condition, rows in store.meta.groupby('condition', sort=False).groups.items():
+            print(f"  ├─ {condition}: {len(rows)} textos")
+
+
+if __name__ == "__main__":
+    main()
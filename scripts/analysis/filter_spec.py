@@ -0,0 +1,238 @@
+"""
+Especificação de filtragem de métricas (metrics_filtered/filter_spec.json).
+
+`02_filter_metrics.py` decide quais métricas ficam e grava a decisão em JSON;
+as etapas seguintes aplicam a spec como projeção de colunas sobre a tabela
+completa (`metrics/full_text/individual/all_texts.csv`) em vez de ler cópias
+filtradas por condição.
+
+Redundância: o grafo de pares com |r| ≥ limiar é agrupado em componentes
+conexas (union-find) e cada componente mantém um único representante,
+escolhido por uma lista de prioridade (padrões regex, do mais preferido ao
+menos preferido). A escolha não depende da ordem das linhas do CSV de
+correlações.
+"""
+
+import hashlib
+import json
+import re
+import warnings
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+METADATA_COLS = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
+
+SPEC_FILE = Path("metrics_filtered/filter_spec.json")
+SOURCE_FILE = Path("metrics/full_text/individual/all_texts.csv")
+# Cópia materializada (legado / consumidores fora de scripts/analysis)
+MATERIALIZED_FILE = Path("metrics_filtered/all_texts_filtered.csv")
+
+# Prioridade para o representante de cada grupo redundante:
+# proporções > métricas léxicas/globais > distâncias médias > total_words;
+# entre proporções UPOS e DEPREL equivalentes, DEPREL (mais específico).
+# Distâncias médias e total_words reproduzem o conjunto publicado em
+# metrics_filtered/ (o filtro original descartava a primeira métrica de cada
+# par do CSV de correlações): UPOS_PUNCT_md e UPOS_total_words ficam,
+# nos demais pares _md fica o DEPREL.
+DEFAULT_PRIORITY = [
+    r'^synt_DEPREL_.*_prop$',
+    r'^synt_UPOS_.*_prop$',
+    r'^basic_',
+    r'^synt_mean_dependency_distance$',
+    r'^synt_UPOS_PUNCT_md$',
+    r'^synt_DEPREL_.*_md$',
+    r'^synt_UPOS_.*_md$',
+    r'^synt_UPOS_total_words$',
+    r'_total_words$',
+]
+
+
+class UnionFind:
+    """Conjuntos disjuntos com compressão de caminho e união por tamanho."""
+
+    def __init__(self, items: Iterable[str]):
+        self.parent = {item: item for item in items}
+        self.size = {item: 1 for item in self.parent}
+
+    def find(self, item: str) -> str:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: str, b: str) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+
+
+def priority_rank(metric: str, priority: Sequence[str]) -> int:
+    """Índice do primeiro padrão que casa com a métrica (len(priority) se nenhum)."""
+    for rank, pattern in enumerate(priority):
+        if re.search(pattern, metric):
+            return rank
+    return len(priority)
+
+
+def redundancy_clusters(
+    pairs: pd.DataFrame,
+    metrics: Sequence[str],
+    threshold: float = 0.95,
+    priority: Sequence[str] = DEFAULT_PRIORITY
+) -> List[Dict]:
+    """
+    Agrupa métricas redundantes e escolhe um representante por grupo.
+
+    Parameters
+    ----------
+    pairs : pd.DataFrame
+        Pares com colunas metric_1, metric_2, correlation
+    metrics : sequence of str
+        Métricas candidatas (pares com métricas fora da lista são ignorados)
+    threshold : float
+        Limiar de |r| para ligar duas métricas
+    priority : sequence of str
+        Padrões regex, do mais preferido ao menos preferido; empates são
+        resolvidos pela ordem em `metrics`
+
+    Returns
+    -------
+    list of dict
+        Um item por grupo com ≥ 2 métricas: {'kept': str, 'removed': [...]}
+        (membros na ordem de `metrics`; grupos ordenados pelo representante)
+    """
+    order = {m: i for i, m in enumerate(metrics)}
+    uf = UnionFind(metrics)
+
+    linked = pairs[pairs['correlation'].abs() >= threshold]
+    for m1, m2 in zip(linked['metric_1'], linked['metric_2']):
+        if m1 in order and m2 in order:
+            uf.union(m1, m2)
+
+    groups: Dict[str, List[str]] = {}
+    for m in metrics:
+        groups.setdefault(uf.find(m), []).append(m)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        kept = min(members, key=lambda m: (priority_rank(m, priority), order[m]))
+        clusters.append({'kept': kept, 'removed': [m for m in members if m != kept]})
+
+    return sorted(clusters, key=lambda c: order[c['kept']])
+
+
+def file_sha1(path: Path) -> str:
+    """Hash SHA-1 do conteúdo de um arquivo."""
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def save_filter_spec(spec: Dict, path: Path) -> None:
+    """Grava a spec em JSON (UTF-8, indentado)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(spec, indent=2, ensure_ascii=False) + "\n", encoding='utf-8')
+
+
+def load_filter_spec(path: Path) -> Dict:
+    """Lê a spec gravada por `save_filter_spec`."""
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def apply_filter_spec(
+    df: pd.DataFrame,
+    spec: Dict,
+    conditions: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Projeta um DataFrame de métricas nas colunas da spec.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Tabela com metadados + métricas
+    spec : dict
+        Spec carregada por `load_filter_spec`
+    conditions : list of str, optional
+        Mantém apenas essas condições (índice é reiniciado)
+    """
+    df = df[spec['metadata_columns'] + spec['metrics']]
+    if conditions is not None:
+        df = df[df['condition'].isin(conditions)].reset_index(drop=True)
+    return df
+
+
+def load_filtered_metrics(
+    base_dir: Path,
+    conditions: Optional[List[str]] = None
+) -> Tuple[pd.DataFrame, str]:
+    """
+    Carrega a tabela de métricas filtrada.
+
+    Com spec e tabela completa disponíveis, lê apenas as colunas da spec
+    (projeção via `usecols`). Caso contrário, usa a cópia materializada
+    `metrics_filtered/all_texts_filtered.csv`; se houver spec, as colunas
+    da cópia precisam coincidir com as dela.
+
+    Parameters
+    ----------
+    base_dir : Path
+        Raiz do projeto
+    conditions : list of str, optional
+        Restringe às condições indicadas
+
+    Returns
+    -------
+    (df, origem)
+        DataFrame filtrado e caminho relativo do arquivo lido
+
+    Raises
+    ------
+    ValueError
+        Cópia materializada desatualizada em relação à spec
+    """
+    base_dir = Path(base_dir)
+    spec_path = base_dir / SPEC_FILE
+    spec = None
+
+    if spec_path.exists():
+        spec = load_filter_spec(spec_path)
+        source = base_dir / spec.get('source', str(SOURCE_FILE))
+        if source.exists():
+            if spec.get('source_sha1') and file_sha1(source) != spec['source_sha1']:
+                warnings.warn(
+                    f"{source} mudou desde a geração de {SPEC_FILE}; "
+                    "reexecute 02_filter_metrics.py"
+                )
+            columns = spec['metadata_columns'] + spec['metrics']
+            df = pd.read_csv(source, usecols=columns)
+            return apply_filter_spec(df, spec, conditions), str(source.relative_to(base_dir))
+
+    df = pd.read_csv(base_dir / MATERIALIZED_FILE)
+    if spec is not None:
+        expected = spec['metadata_columns'] + spec['metrics']
+        if list(df.columns) != expected:
+            missing = [c for c in expected if c not in df.columns]
+            extra = [c for c in df.columns if c not in expected]
+            raise ValueError(
+                f"{MATERIALIZED_FILE} não corresponde a {SPEC_FILE} "
+                f"(faltam {len(missing)} colunas, sobram {len(extra)}); "
+                "reexecute 02_filter_metrics.py com a tabela completa"
+            )
+    if conditions is not None:
+        df = df[df['condition'].isin(conditions)].reset_index(drop=True)
+    return df, str(MATERIALIZED_FILE)
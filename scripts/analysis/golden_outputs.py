@@ -0,0 +1,371 @@
+"""
+Saídas de referência ("golden") para validar motores otimizados.
+
+`freeze` congela as saídas atuais:
+- extração: métricas full text e windowed de um recorte fixo do corpus (os
+  primeiros `--per-group` textos de cada condição × autor, opcionalmente só
+  de `--conditions`/`--authors`), recalculadas com o código atual
+- análises: cópia de cada `analysis/*/data/*.csv` e `analysis2/*/dados/*.csv`
+
+`check` recalcula a extração do mesmo recorte com o código atual, lê as
+análises como estão no disco (rode o pipeline antes) e compara tudo com as
+referências, coluna a coluna. Colunas numéricas passam se
+|atual − ref| ≤ atol + rtol·|ref| (NaN só casa com NaN); as demais precisam
+ser idênticas. As tolerâncias padrão (rtol 1e-9, atol 1e-12) só absorvem
+ruído de ponto flutuante; regras por arquivo/coluna (glob) ficam em
+`{golden}/tolerances.json`, a última regra que casa vence:
+
+    {"default": {"rtol": 1e-9, "atol": 1e-12},
+     "rules": [{"file": "extraction/*", "column": "synt_*", "atol": 1e-6}]}
+
+Um motor novo (tokenizador, parser, métricas em lote) só vira padrão depois
+de passar no `check` contra referências congeladas com o motor anterior.
+A parte sintática depende do parser: congele e verifique com o mesmo
+(`--parser-url`, ex.: `udpipe_server.py` com cache de replay).
+
+O recorte é escolhido e lido pelo índice do corpus (`metrics/corpus_index.csv`,
+atualizado incrementalmente antes de cada uso).
+
+Uso:
+    python golden_outputs.py freeze [--per-group 2] [--conditions ...] [--authors ...]
+        [--parser-url URL] [--force]
+    python golden_outputs.py check [--parser-url URL] [--report check.json]
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import hashlib
+import io
+import json
+import shutil
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent / 'metrics_extraction'))
+
+BASE_DIR = Path(__file__).parent.parent.parent
+GOLDEN_DIR = BASE_DIR / "golden"
+INDEX_FILE = Path("metrics/corpus_index.csv")
+ANALYSIS_GLOBS = ['analysis/*/data/*.csv', 'analysis2/*/dados/*.csv']
+
+DEFAULT_TOLERANCES = {'default': {'rtol': 1e-9, 'atol': 1e-12}, 'rules': []}
+
+
+def _sha1(path: Path) -> str:
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
+
+
+def load_index(data_dir: Path) -> pd.DataFrame:
+    """Índice do corpus, atualizado incrementalmente em `{data_dir}/metrics/corpus_index.csv`."""
+    from corpus_index import build_corpus_index
+
+    return build_corpus_index(data_dir, Path(data_dir) / INDEX_FILE)
+
+
+def select_slice(data_dir: Path, per_group: int, conditions: Optional[List[str]] = None,
+                 authors: Optional[List[str]] = None) -> List[str]:
+    """
+    Os primeiros `per_group` textos (ordem de text_id) de cada condição × autor.
+
+    `conditions`/`authors` restringem o recorte (padrão: todos). A seleção
+    vem do índice do corpus; nenhum texto é lido.
+    """
+    from corpus_index import iter_index_records
+
+    groups = defaultdict(list)
+    for record in iter_index_records(load_index(data_dir), data_dir, conditions, authors):
+        groups[(record.condition, record.author)].append(f"{record.text_id}_{record.condition}")
+    return sorted(key for keys in groups.values() for key in sorted(keys)[:per_group])
+
+
+def run_extraction(data_dir: Path, keys: List[str], output_dir: Path, parser_url: Optional[str] = None,
+                   windowed: bool = True) -> Tuple[Dict[str, Path], List[Dict]]:
+    """
+    Extrai as métricas do recorte com o código atual.
+
+    Returns
+    -------
+    tuple
+        ({arquivo de referência: CSV gerado}, falhas registradas no ledger)
+    """
+    from corpus_index import iter_index_records
+    from corpus_reader import close_sources
+    from extract_all_metrics import MetricsExtractor
+
+    wanted = set(keys)
+    df_index = load_index(data_dir)
+    records = list(iter_index_records(df_index[df_index['text_id'].isin(wanted)], data_dir))
+    missing = len(wanted) - len(records)
+    if missing:
+        print(f"   ⚠️  {missing} textos do recorte não estão mais no corpus")
+
+    output_dir = Path(output_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = MetricsExtractor(data_dir, output_dir, use_index=False, parser_url=parser_url)
+        frames = {'extraction/all_texts.csv': extractor.extract_full_text_metrics(records)}
+        if windowed:
+            frames['extraction/lexical_windowed.csv'] = extractor.extract_windowed_lexical_metrics(records)
+    close_sources(records)
+
+    paths = {}
+    for name, df in frames.items():
+        path = output_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(path, index=False)
+        paths[name] = path
+    return paths, extractor.ledger.to_frame().to_dict('records')
+
+
+def read_table(path: Path) -> pd.DataFrame:
+    """Lê uma tabela congelada; um CSV sem colunas (recorte vazio) vira DataFrame vazio."""
+    try:
+        return pd.read_csv(path)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+def analysis_outputs(base_dir: Path = BASE_DIR) -> Dict[str, Path]:
+    """{caminho relativo: arquivo} das tabelas de análise atuais."""
+    files = {}
+    for pattern in ANALYSIS_GLOBS:
+        for path in sorted(base_dir.glob(pattern)):
+            files[path.relative_to(base_dir).as_posix()] = path
+    return files
+
+
+def tolerance_for(tolerances: Dict, file: str, column: str) -> Dict[str, float]:
+    """rtol/atol da coluna: padrão + regras que casam (a última vence)."""
+    tol = dict(tolerances.get('default', DEFAULT_TOLERANCES['default']))
+    for rule in tolerances.get('rules', []):
+        if fnmatch.fnmatch(file, rule.get('file', '*')) and fnmatch.fnmatch(column, rule.get('column', '*')):
+            tol.update({k: rule[k] for k in ('rtol', 'atol') if k in rule})
+    return tol
+
+
+def compare_tables(golden: pd.DataFrame, current: pd.DataFrame, file: str, tolerances: Dict) -> Dict:
+    """
+    Compara duas tabelas linha a linha (mesma ordem), coluna a coluna.
+
+    Returns
+    -------
+    dict
+        status ('ok', 'differs' ou 'shape'), colunas faltando/extras e, por
+        coluna divergente, n de linhas fora da tolerância, maior diferença
+        absoluta/relativa e a primeira linha divergente
+    """
+    result = {'file': file, 'rows': len(current), 'golden_rows': len(golden),
+              'missing_columns': [c for c in golden.columns if c not in current.columns],
+              'extra_columns': [c for c in current.columns if c not in golden.columns],
+              'columns': []}
+    if len(golden) != len(current):
+        result['status'] = 'shape'
+        return result
+
+    for column in golden.columns:
+        if column not in current.columns:
+            continue
+        ref, new = golden[column], current[column]
+        if pd.api.types.is_numeric_dtype(ref) and pd.api.types.is_numeric_dtype(new):
+            tol = tolerance_for(tolerances, file, column)
+            a, b = ref.to_numpy(dtype=float), new.to_numpy(dtype=float)
+            bad = ~np.isclose(b, a, rtol=tol['rtol'], atol=tol['atol'], equal_nan=True)
+            if not bad.any():
+                continue
+            with np.errstate(invalid='ignore', divide='ignore'):
+                diff = np.abs(b - a)
+                rel = diff / np.abs(a)
+            result['columns'].append({
+                'column': column,
+                'n_rows': int(bad.sum()),
+                'max_abs_diff': float(np.nanmax(diff[bad])) if np.isfinite(diff[bad]).any() else None,
+                'max_rel_diff': float(np.nanmax(rel[bad])) if np.isfinite(rel[bad]).any() else None,
+                'first_row': int(np.flatnonzero(bad)[0]),
+                **tol
+            })
+        else:
+            bad = (ref.fillna('').astype(str) != new.fillna('').astype(str)).to_numpy()
+            if bad.any():
+                result['columns'].append({'column': column, 'n_rows': int(bad.sum()),
+                                          'first_row': int(np.flatnonzero(bad)[0])})
+
+    result['status'] = 'differs' if result['columns'] or result['missing_columns'] else 'ok'
+    return result
+
+
+def freeze(golden_dir: Path, data_dir: Path, per_group: int, parser_url: Optional[str],
+           extraction: bool = True, windowed: bool = True, analysis: bool = True,
+           conditions: Optional[List[str]] = None, authors: Optional[List[str]] = None) -> Dict:
+    """Congela as saídas atuais em `golden_dir` e grava `manifest.json`."""
+    golden_dir = Path(golden_dir)
+    manifest = {'created': datetime.now().isoformat(timespec='seconds'), 'python': sys.version.split()[0],
+                'per_group': per_group, 'conditions': conditions, 'authors': authors,
+                'parser_url': parser_url, 'slice': [], 'files': {}}
+
+    sources: Dict[str, Path] = {}
+    with tempfile.TemporaryDirectory(prefix='golden_') as tmp:
+        if extraction:
+            manifest['slice'] = select_slice(data_dir, per_group, conditions, authors)
+            print(f"\n[1/2] Extraindo recorte fixo ({len(manifest['slice'])} textos)...")
+            paths, failures = run_extraction(data_dir, manifest['slice'], Path(tmp), parser_url, windowed)
+            if failures:
+                print(f"   ⚠️  {len(failures)} etapas falharam no recorte (NaN congelado): "
+                      + ", ".join(sorted({f['stage'] for f in failures})))
+            sources.update(paths)
+        if analysis:
+            print("\n[2/2] Copiando tabelas das análises...")
+            sources.update(analysis_outputs())
+
+        for name, source in sources.items():
+            target = golden_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, target)
+            df = read_table(target)
+            manifest['files'][name] = {'rows': len(df), 'columns': len(df.columns), 'sha1': _sha1(target),
+                                       'empty': df.empty}
+            print(f"   ✓ {name}: " + ("vazia" if df.empty else f"{len(df)} × {len(df.columns)}"))
+
+    tolerances_path = golden_dir / 'tolerances.json'
+    if not tolerances_path.exists():
+        tolerances_path.write_text(json.dumps(DEFAULT_TOLERANCES, indent=2) + '\n', encoding='utf-8')
+    with open(golden_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return manifest
+
+
+def check(golden_dir: Path, data_dir: Path, parser_url: Optional[str], tolerances: Dict,
+          extraction: bool = True, analysis: bool = True) -> List[Dict]:
+    """Compara as saídas atuais com as congeladas (um resultado por arquivo)."""
+    golden_dir = Path(golden_dir)
+    with open(golden_dir / 'manifest.json', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='golden_') as tmp:
+        current: Dict[str, Path] = {}
+        frozen = manifest['files']
+        if extraction and manifest['slice']:
+            windowed = 'extraction/lexical_windowed.csv' in frozen
+            print(f"\n[1/2] Reextraindo recorte fixo ({len(manifest['slice'])} textos)...")
+            paths, _ = run_extraction(data_dir, manifest['slice'], Path(tmp), parser_url, windowed)
+            current.update(paths)
+        if analysis:
+            print("\n[2/2] Lendo tabelas das análises...")
+            current.update(analysis_outputs())
+
+        for name in sorted(frozen):
+            is_extraction = name.startswith('extraction/')
+            if (is_extraction and not extraction) or (not is_extraction and not analysis):
+                continue
+            if name not in current:
+                results.append({'file': name, 'status': 'missing'})
+                continue
+            if _sha1(current[name]) == _sha1(golden_dir / name):
+                results.append({'file': name, 'status': 'ok', 'identical': True})
+                continue
+            golden, table = read_table(golden_dir / name), read_table(current[name])
+            if golden.empty and table.empty:
+                results.append({'file': name, 'status': 'ok', 'empty': True})
+                continue
+            results.append(compare_tables(golden, table, name, tolerances))
+    return results
+
+
+def print_check(results: List[Dict], max_columns: int = 5) -> int:
+    """Imprime o resultado por arquivo e devolve o número de arquivos que falharam."""
+    n_failed = 0
+    for r in results:
+        if r['status'] == 'ok':
+            note = "vazia (como a referência)" if r.get('empty') else "idêntico" if r.get('identical') else "dentro da tolerância"
+            extra = f"; colunas novas: {', '.join(r['extra_columns'])}" if r.get('extra_columns') else ""
+            print(f"   ✓ {r['file']}: {note}{extra}")
+            continue
+        n_failed += 1
+        if r['status'] == 'missing':
+            print(f"   ⚠️  {r['file']}: não gerado")
+        elif r['status'] == 'shape':
+            print(f"   ⚠️  {r['file']}: {r['rows']} linhas (referência: {r['golden_rows']})")
+        else:
+            print(f"   ⚠️  {r['file']}: {len(r['columns'])} colunas divergentes"
+                  + (f", faltando: {', '.join(r['missing_columns'])}" if r['missing_columns'] else ""))
+            for c in sorted(r['columns'], key=lambda c: c['n_rows'], reverse=True)[:max_columns]:
+                diff = (f" (máx |Δ| {c['max_abs_diff']:.3g}, rel {c['max_rel_diff']:.3g})"
+                        if c.get('max_abs_diff') is not None and c.get('max_rel_diff') is not None else "")
+                print(f"      • {c['column']}: {c['n_rows']} linhas, 1ª na linha {c['first_row']}{diff}")
+    return n_failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Freeze and check golden outputs of extraction and analyses')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('freeze', 'Freeze current outputs as the reference'),
+                            ('check', 'Compare current outputs with the frozen reference')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--golden-dir', type=str, default=str(GOLDEN_DIR),
+                         help='Reference directory (default: golden/)')
+        sub.add_argument('--data-dir', type=str, default=str(BASE_DIR), help='Directory containing data/ folder')
+        sub.add_argument('--parser-url', type=str, default=None,
+                         help='UDPipe /process endpoint for the syntactic metrics (default: $UDPIPE_URL or LINDAT)')
+        sub.add_argument('--skip-extraction', action='store_true', help='Leave out the extraction slice')
+        sub.add_argument('--skip-analysis', action='store_true', help='Leave out the analysis tables')
+    freeze_parser = subparsers.choices['freeze']
+    freeze_parser.add_argument('--per-group', type=int, default=2,
+                               help='Texts per condition × author in the extraction slice (default: 2)')
+    freeze_parser.add_argument('--conditions', nargs='+', default=None,
+                               help='Only these conditions in the extraction slice (default: all)')
+    freeze_parser.add_argument('--authors', nargs='+', default=None,
+                               help='Only these authors in the extraction slice (default: all)')
+    freeze_parser.add_argument('--skip-windowed', action='store_true', help='Leave out windowed metrics')
+    freeze_parser.add_argument('--force', action='store_true', help='Overwrite an existing reference')
+    check_parser = subparsers.choices['check']
+    check_parser.add_argument('--tolerances', type=str, default=None,
+                              help='Tolerance rules JSON (default: {golden-dir}/tolerances.json)')
+    check_parser.add_argument('--report', type=str, default=None, help='Write the per-file results as JSON')
+
+    args = parser.parse_args()
+    golden_dir = Path(args.golden_dir)
+
+    print("=" * 70)
+    print(f"SAÍDAS DE REFERÊNCIA: {args.command.upper()}")
+    print("=" * 70)
+
+    if args.command == 'freeze':
+        if (golden_dir / 'manifest.json').exists() and not args.force:
+            print(f"⚠️  {golden_dir} já tem referências; use --force para substituir")
+            sys.exit(1)
+        manifest = freeze(golden_dir, Path(args.data_dir), args.per_group, args.parser_url,
+                          extraction=not args.skip_extraction, windowed=not args.skip_windowed,
+                          analysis=not args.skip_analysis, conditions=args.conditions, authors=args.authors)
+        print(f"\n✅ {len(manifest['files'])} tabelas congeladas em {golden_dir}")
+        return
+
+    tolerances_path = Path(args.tolerances) if args.tolerances else golden_dir / 'tolerances.json'
+    tolerances = DEFAULT_TOLERANCES
+    if tolerances_path.exists():
+        with open(tolerances_path, encoding='utf-8') as f:
+            tolerances = json.load(f)
+    results = check(golden_dir, Path(args.data_dir), args.parser_url, tolerances,
+                    extraction=not args.skip_extraction, analysis=not args.skip_analysis)
+
+    print("\n" + "=" * 70)
+    n_failed = print_check(results)
+    if args.report:
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if n_failed:
+        print(f"\n⚠️  {n_failed}/{len(results)} tabelas divergem das referências")
+        sys.exit(1)
+    print(f"\n✅ {len(results)} tabelas equivalentes às referências")
+
+
+if __name__ == "__main__":
+    main()
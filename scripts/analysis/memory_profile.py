@@ -0,0 +1,107 @@
+"""
+Contabilidade de memória de um script de análise, etapa por etapa.
+
+Executa o script no próprio processo (runpy, no diretório do script, como se
+chamado diretamente) com `MemoryTracker` (tracemalloc + pico de RSS, ver
+`scripts/metrics_extraction/memory_tracker.py`). As etapas são os marcadores
+"[N/M] ..." que os scripts já imprimem: cada marcador fecha a etapa anterior
+e abre a seguinte; o que vem antes do primeiro é a etapa "imports".
+
+O resumo é impresso ao final (vai para o log quando chamado pelo
+`run_pipeline.py --memory`) e o relatório completo vai para JSON.
+
+Uso:
+    python memory_profile.py 04_compare_methods.py [--output analysis/.pipeline/memory/04_compare_methods.json]
+"""
+
+import argparse
+import os
+import re
+import runpy
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+sys.path.append(str(Path(__file__).parent.parent / 'metrics_extraction'))
+from memory_tracker import MemoryTracker, print_memory_summary
+
+BASE_DIR = Path(__file__).parent.parent.parent
+MEMORY_DIR = BASE_DIR / "analysis/.pipeline/memory"
+
+STEP_MARKER = re.compile(r"^\s*(\[\d+/\d+\].*?)\s*$", re.MULTILINE)
+
+
+class _StepWatcher:
+    """Repassa a saída do script e abre uma etapa a cada marcador [N/M]."""
+
+    def __init__(self, stream, tracker: MemoryTracker):
+        self._stream = stream
+        self._tracker = tracker
+
+    def write(self, data: str) -> int:
+        for match in STEP_MARKER.finditer(data):
+            self._tracker.start(match.group(1))
+        return self._stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def profile_script(script: Path, output: Path, top_n: int = 10) -> dict:
+    """
+    Executa `script` com contabilidade de memória por etapa e grava o relatório.
+
+    Returns
+    -------
+    dict
+        Relatório de `MemoryTracker` (+ script e código de saída)
+    """
+    script = Path(script).resolve()
+    tracker = MemoryTracker(top_n=top_n)
+    tracker.start('imports')
+
+    cwd, argv, stdout = os.getcwd(), sys.argv, sys.stdout
+    exit_code = 0
+    os.chdir(script.parent)
+    sys.path.insert(0, str(script.parent))
+    sys.argv = [str(script)]
+    sys.stdout = _StepWatcher(stdout, tracker)
+    try:
+        runpy.run_path(str(script), run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception:
+        # Relatório parcial (até a etapa que falhou) antes de propagar o erro
+        sys.stdout = stdout
+        tracker.save(output, script=script.name, exit_code=1)
+        raise
+    finally:
+        sys.stdout = stdout
+        sys.argv = argv
+        os.chdir(cwd)
+
+    return tracker.save(output, script=script.name, exit_code=exit_code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run an analysis script with per-step memory accounting')
+    parser.add_argument('script', help='Analysis script to run')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Report JSON (default: analysis/.pipeline/memory/{script}.json)')
+    parser.add_argument('--top', type=int, default=10, help='Allocation sites per step (default: 10)')
+
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else MEMORY_DIR / f"{Path(args.script).stem}.json"
+    report = profile_script(Path(args.script), output, args.top)
+
+    print("\n" + "=" * 70)
+    print(f"MEMÓRIA POR ETAPA: {report['script']}")
+    print("=" * 70)
+    print_memory_summary(report)
+    print(f"\n✓ Relatório de memória: {output}")
+    sys.exit(report['exit_code'])
+
+
+if __name__ == "__main__":
+    main()
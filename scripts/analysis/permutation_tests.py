@@ -0,0 +1,239 @@
+"""
+Testes de permutação vetorizados para comparar métodos de geração.
+
+Pergunta por métrica: "o método X preservou a métrica M melhor que Y?".
+Estatística: diferença entre as médias de |gerado − original| dos dois
+métodos (negativa = X mais próximo do original). Hipótese nula, por par:
+X e Y são permutáveis dentro de cada estrato (author, title, sample_idx).
+Cada par é testado só com os textos de X e Y, e cada permutação troca
+apenas rótulos X/Y de textos gerados a partir do mesmo prefixo original;
+os demais métodos não entram na distribuição nula do par.
+
+Vetorização:
+- Todas as permutações de um lote formam uma única matriz de índices
+  (n_perm × n_textos), obtida com um argsort de chaves
+  `estrato + U(0, 1)`; não há laço por permutação.
+- Para cada permutação, somas e contagens por método de todas as métricas
+  saem de um produto de matrizes (indicadores de método × divergências),
+  ignorando NaN.
+- Lotes independentes (sementes derivadas de uma SeedSequence) podem rodar
+  em um pool de processos; o resultado não depende do número de processos.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def permutation_matrix(
+    strata: np.ndarray,
+    n_permutations: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Índices de permutações aleatórias restritas aos estratos.
+
+    Parameters
+    ----------
+    strata : np.ndarray
+        Código inteiro do estrato de cada texto
+    n_permutations : int
+        Número de permutações (linhas)
+    rng : np.random.Generator
+        Gerador de números aleatórios
+
+    Returns
+    -------
+    np.ndarray (n_permutations × n)
+        `perm[k, i]` é o texto cujo rótulo vai para a posição i na permutação k
+        (sempre do mesmo estrato que i)
+    """
+    strata = np.asarray(strata)
+    base = np.argsort(strata, kind='stable')
+    # Ordenar estrato + ruído em [0, 1) embaralha dentro de cada estrato
+    keys = strata[base][None, :] + rng.random((n_permutations, len(strata)))
+    shuffled = base[np.argsort(keys, axis=1)]
+    perm = np.empty_like(shuffled)
+    perm[:, base] = shuffled
+    return perm
+
+
+def group_means(labels: np.ndarray, values: np.ndarray, valid: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Médias por grupo de todas as colunas, para várias rotulagens de uma vez.
+
+    Parameters
+    ----------
+    labels : np.ndarray (n_perm × n)
+        Código do grupo de cada texto em cada rotulagem
+    values : np.ndarray (n × m)
+        Valores com NaN zerados
+    valid : np.ndarray (n × m)
+        1.0 onde o valor é válido
+    n_groups : int
+        Número de grupos
+
+    Returns
+    -------
+    np.ndarray (n_perm × n_groups × m)
+    """
+    indicator = (labels[:, None, :] == np.arange(n_groups)[None, :, None]).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (indicator @ values) / (indicator @ valid)
+
+
+def _pair_statistics(means: np.ndarray, pairs: Sequence[Tuple[int, int]]) -> np.ndarray:
+    """Diferenças de médias (X − Y) por par de grupos: (n_perm × n_pares × m)."""
+    return np.stack([means[:, a] - means[:, b] for a, b in pairs], axis=1)
+
+
+def _count_extreme(args) -> np.ndarray:
+    """Lote de permutações: contagem de |T_perm| ≥ |T_obs| (executável em outro processo)."""
+    seed, n_permutations, strata, labels, values, valid, n_groups, pairs, observed, chunk_size = args
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(observed.shape, dtype=np.int64)
+    # Tolerância relativa para empates numéricos (ex.: permutação identidade)
+    tolerance = np.abs(observed) * (1 - 1e-12)
+    for start in range(0, n_permutations, chunk_size):
+        size = min(chunk_size, n_permutations - start)
+        perm = permutation_matrix(strata, size, rng)
+        stats = _pair_statistics(group_means(labels[perm], values, valid, n_groups), pairs)
+        counts += (np.abs(stats) >= tolerance[None]).sum(axis=0)
+    return counts
+
+
+def stratified_permutation_test(
+    values: np.ndarray,
+    labels: np.ndarray,
+    strata: np.ndarray,
+    n_groups: int,
+    n_permutations: int = 10000,
+    seed: int = 42,
+    n_jobs: int = 1,
+    batch_size: int = 2500,
+    chunk_size: int = 250
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Teste de permutação bilateral para todas as métricas e pares de grupos.
+
+    Cada par (X, Y) tem a própria nula "X = Y": só as linhas de X e Y entram
+    e os rótulos são permutados entre elas, dentro dos estratos.
+
+    Parameters
+    ----------
+    values : np.ndarray (n × m)
+        Estatística por texto e métrica (NaN = ausente, ignorado nas médias)
+    labels : np.ndarray (n,)
+        Código do grupo (0..n_groups-1) de cada texto
+    strata : np.ndarray (n,)
+        Código do estrato; rótulos só são trocados dentro do mesmo estrato
+    n_groups : int
+        Número de grupos
+    n_permutations : int
+        Total de permutações
+    seed : int
+        Semente (reprodutível para qualquer n_jobs; um fluxo por par)
+    n_jobs : int
+        Processos (1 = no processo atual)
+    batch_size : int
+        Permutações por lote (unidade de paralelismo e de semente)
+    chunk_size : int
+        Permutações avaliadas por produto de matrizes (limita memória)
+
+    Returns
+    -------
+    (pairs, means, observed, p_values)
+        pairs: (n_pares × 2) códigos (X, Y); means: (n_groups × m) médias
+        observadas; observed e p_values: (n_pares × m), com
+        p = (1 + #{|T_perm| ≥ |T_obs|}) / (1 + n_permutations)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = (~np.isnan(values)).astype(np.float64)
+    filled = np.where(valid > 0, values, 0.0)
+    labels = np.asarray(labels)
+    strata = pd.factorize(np.asarray(strata))[0]
+    pairs = list(combinations(range(n_groups), 2))
+
+    means = group_means(labels[None, :], filled, valid, n_groups)
+    observed = _pair_statistics(means, pairs)[0]
+
+    sizes = [min(batch_size, n_permutations - start) for start in range(0, n_permutations, batch_size)]
+    tasks, owners = [], []
+    for k, (pair_seed, (a, b)) in enumerate(zip(np.random.SeedSequence(seed).spawn(len(pairs)), pairs)):
+        # Só os textos do par, com rótulos 0 (X) / 1 (Y)
+        rows = np.flatnonzero((labels == a) | (labels == b))
+        pair_labels = (labels[rows] == b).astype(labels.dtype)
+        for s, size in zip(pair_seed.spawn(len(sizes)), sizes):
+            tasks.append((s, size, strata[rows], pair_labels, filled[rows], valid[rows], 2, [(0, 1)],
+                          observed[k:k + 1], chunk_size))
+            owners.append(k)
+
+    if n_jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            batch_counts = list(pool.map(_count_extreme, tasks))
+    else:
+        batch_counts = [_count_extreme(task) for task in tasks]
+    counts = np.zeros(observed.shape, dtype=np.int64)
+    for k, batch in zip(owners, batch_counts):
+        counts[k] += batch[0]
+
+    p_values = (1 + counts) / (1 + n_permutations)
+    p_values = np.where(np.isnan(observed), np.nan, p_values)
+    return np.asarray(pairs), means[0], observed, p_values
+
+
+def method_divergence_tests(
+    divergence: pd.DataFrame,
+    metric_cols: List[str],
+    methods: Sequence[str],
+    strata_cols: Sequence[str] = ('author', 'title', 'sample_idx'),
+    method_col: str = 'method',
+    **kwargs
+) -> pd.DataFrame:
+    """
+    Compara métodos, par a par, na divergência ao original de cada métrica.
+
+    Parameters
+    ----------
+    divergence : pd.DataFrame
+        Uma linha por texto gerado: colunas de estrato, `method_col` e
+        |gerado − original| por métrica
+    metric_cols : list of str
+        Métricas a testar
+    methods : sequence of str
+        Métodos comparados (pares na ordem desta lista)
+    **kwargs
+        Repassados a `stratified_permutation_test`
+
+    Returns
+    -------
+    DataFrame metric, method_x, method_y, mean_abs_diff_x, mean_abs_diff_y,
+    diff (x − y), better (método com menor divergência), p_value
+    """
+    df = divergence[divergence[method_col].isin(methods)]
+    labels = pd.Categorical(df[method_col], categories=list(methods)).codes
+    strata = df.groupby(list(strata_cols), sort=False).ngroup().to_numpy()
+    values = df[metric_cols].to_numpy(dtype=np.float64)
+
+    pairs, means, observed, p_values = stratified_permutation_test(
+        values, labels, strata, len(methods), **kwargs
+    )
+
+    rows = []
+    for k, (a, b) in enumerate(pairs):
+        for j, metric in enumerate(metric_cols):
+            diff = observed[k, j]
+            rows.append({
+                'metric': metric,
+                'method_x': methods[a],
+                'method_y': methods[b],
+                'mean_abs_diff_x': means[a, j],
+                'mean_abs_diff_y': means[b, j],
+                'diff': diff,
+                'better': np.nan if np.isnan(diff) or diff == 0 else (methods[a] if diff < 0 else methods[b]),
+                'p_value': p_values[k, j]
+            })
+    return pd.DataFrame(rows)
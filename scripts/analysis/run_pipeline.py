@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Executor do pipeline de análise (01–07) com cache por hash de entradas.
+
+Cada etapa declara suas entradas (dados, o próprio script e os módulos
+auxiliares que importa) e saídas. Uma etapa é pulada quando os hashes das
+entradas coincidem com os da última execução bem-sucedida e todas as saídas
+existem com o conteúdo registrado. Se uma etapa é reexecutada, todas as que
+dependem dela (consomem alguma de suas saídas) também são.
+
+Etapas independentes rodam em paralelo (cada uma em seu próprio processo
+Python); a saída de cada script vai para `analysis/.pipeline/logs/`. O pico
+de RSS de cada processo é reportado no resumo; com `--memory`, cada script
+roda sob `memory_profile.py` (tracemalloc por etapa [N/M], relatórios em
+`analysis/.pipeline/memory/`).
+
+Etapas cujas entradas obrigatórias não existem (ex.: `metrics/` ausente neste
+repositório) são marcadas como bloqueadas; as seguintes usam as saídas já
+existentes.
+
+Uso:
+    python run_pipeline.py                  # executa o que estiver desatualizado
+    python run_pipeline.py --dry-run        # mostra o plano sem executar
+    python run_pipeline.py --force 04       # força 04 (e dependentes)
+    python run_pipeline.py --only 06 07     # restringe a essas etapas
+    python run_pipeline.py --force --memory # memória por etapa de cada script
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent.parent
+SCRIPTS_DIR = Path("scripts/analysis")
+CACHE_DIR = BASE_DIR / "analysis/.pipeline"
+CACHE_FILE = CACHE_DIR / "cache.json"
+LOGS_DIR = CACHE_DIR / "logs"
+MEMORY_DIR = CACHE_DIR / "memory"
+
+ALL_TEXTS = "metrics/full_text/individual/all_texts.csv"
+WINDOWED = "metrics/windowed/lexical_windowed.csv"
+FAILURES = "metrics/failures.csv"
+FILTER_SPEC = "metrics_filtered/filter_spec.json"
+FILTERED = "metrics_filtered/all_texts_filtered.csv"
+QUALITY = "analysis/01_metrics_quality"
+PROFILES = "analysis/02_author_profiles"
+COMPARISON = "analysis/03_method_comparison"
+DECAY = "analysis/04_temporal_decay"
+CONSISTENCY = "analysis/05_consistency"
+SYNTHESIS = "analysis/06_synthesis"
+PERMUTATION = "analysis/07_permutation_tests"
+ATTRIBUTION = "analysis/08_author_attribution"
+DISTANCES = "analysis/09_distance_matrices"
+
+# Etapas do pipeline.
+#   inputs   : arquivos obrigatórios (etapa bloqueada se faltarem)
+#   optional : arquivos lidos se existirem (ex.: spec vs cópia materializada)
+#   helpers  : módulos de scripts/analysis importados pelo script
+#   outputs  : arquivos produzidos (gráficos não são rastreados)
+STAGES: List[Dict] = [
+    {
+        'name': '01',
+        'script': '01_analyze_metrics_quality.py',
+        'inputs': [ALL_TEXTS],
+        'optional': [FAILURES],
+        'helpers': ['correlation_engine.py'],
+        'outputs': [f"{QUALITY}/data/nan_percentage.csv", f"{QUALITY}/data/variance_stats.csv",
+                    f"{QUALITY}/data/correlations_high.csv", f"{QUALITY}/report.md"]
+    },
+    {
+        'name': '02',
+        'script': '02_filter_metrics.py',
+        'inputs': [ALL_TEXTS, f"{QUALITY}/data/nan_percentage.csv", f"{QUALITY}/data/variance_stats.csv"],
+        'optional': [],
+        'helpers': ['correlation_engine.py', 'filter_spec.py'],
+        'outputs': [FILTER_SPEC, FILTERED, "metrics_filtered/filtering_report.md"]
+    },
+    {
+        'name': '03',
+        'script': '03_create_author_profiles.py',
+        'inputs': [],
+        'optional': [FILTER_SPEC, ALL_TEXTS, FILTERED],
+        'helpers': ['feature_store.py', 'filter_spec.py', 'streaming_profiles.py'],
+        'outputs': [f"{PROFILES}/data/profiles_by_author.csv", f"{PROFILES}/report.md"]
+    },
+    {
+        'name': '04',
+        'script': '04_compare_methods.py',
+        'inputs': [],
+        'optional': [FILTER_SPEC, ALL_TEXTS, FILTERED],
+        'helpers': ['feature_store.py', 'filter_spec.py', 'bootstrap.py'],
+        'outputs': [f"{COMPARISON}/data/distances_to_original.csv", f"{COMPARISON}/data/preservation_scores.csv",
+                    f"{COMPARISON}/data/preservation_ci.csv", f"{COMPARISON}/data/metrics_divergence.csv",
+                    f"{COMPARISON}/report.md"]
+    },
+    {
+        'name': '05',
+        'script': '05_analyze_temporal_decay.py',
+        'inputs': [WINDOWED],
+        'optional': [],
+        'helpers': [],
+        'outputs': [f"{DECAY}/data/temporal_slopes.csv", f"{DECAY}/data/ttr_decay_stats.csv",
+                    f"{DECAY}/report.md"]
+    },
+    {
+        'name': '06',
+        'script': '06_analyze_consistency.py',
+        'inputs': [],
+        'optional': [FILTER_SPEC, ALL_TEXTS, FILTERED],
+        'helpers': ['feature_store.py', 'filter_spec.py', 'bootstrap.py'],
+        'outputs': [f"{CONSISTENCY}/data/cv_by_sample.csv", f"{CONSISTENCY}/data/consistency_by_method.csv",
+                    f"{CONSISTENCY}/report.md"]
+    },
+    {
+        'name': '07',
+        'script': '07_generate_final_synthesis.py',
+        'inputs': [f"{COMPARISON}/data/preservation_scores.csv", f"{DECAY}/data/temporal_slopes.csv",
+                   f"{CONSISTENCY}/data/consistency_by_method.csv"],
+        'optional': [],
+        'helpers': [],
+        'outputs': [f"{SYNTHESIS}/SINTESE_FINAL.md"]
+    },
+    {
+        'name': '08',
+        'script': '08_permutation_tests.py',
+        'inputs': [],
+        'optional': [FILTER_SPEC, ALL_TEXTS, FILTERED],
+        'helpers': ['feature_store.py', 'filter_spec.py', 'permutation_tests.py'],
+        'outputs': [f"{PERMUTATION}/data/permutation_pvalues.csv", f"{PERMUTATION}/data/permutation_summary.csv",
+                    f"{PERMUTATION}/report.md"]
+    },
+    {
+        'name': '09',
+        'script': '09_author_attribution.py',
+        'inputs': [],
+        'optional': [FILTER_SPEC, ALL_TEXTS, FILTERED],
+        'helpers': ['feature_store.py', 'filter_spec.py', 'style_knn.py'],
+        'outputs': [f"{ATTRIBUTION}/data/attribution_by_text.csv", f"{ATTRIBUTION}/data/attribution_accuracy.csv",
+                    f"{ATTRIBUTION}/data/attribution_accuracy_by_author.csv",
+                    f"{ATTRIBUTION}/data/attribution_confusion.csv", f"{ATTRIBUTION}/report.md"]
+    },
+    {
+        'name': '10',
+        'script': '10_distance_matrices.py',
+        'inputs': [],
+        'optional': [FILTER_SPEC, ALL_TEXTS, FILTERED],
+        'helpers': ['feature_store.py', 'filter_spec.py', 'distance_engine.py'],
+        'outputs': [f"{DISTANCES}/data/group_distances.csv", f"{DISTANCES}/data/repetition_distances.csv",
+                    f"{DISTANCES}/data/original_clustering.csv", f"{DISTANCES}/report.md"]
+    },
+]
+
+
+def file_hash(path: Path) -> Optional[str]:
+    """SHA-1 do conteúdo (None se o arquivo não existir)."""
+    if not path.exists():
+        return None
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def stage_input_files(stage: Dict) -> List[str]:
+    """Todas as entradas rastreadas de uma etapa (dados + código)."""
+    code = [str(SCRIPTS_DIR / stage['script'])] + [str(SCRIPTS_DIR / h) for h in stage['helpers']]
+    return code + stage['inputs'] + stage['optional']
+
+
+def stage_dependencies(stages: List[Dict]) -> Dict[str, Set[str]]:
+    """Etapa → etapas que produzem alguma de suas entradas."""
+    producers = {out: s['name'] for s in stages for out in s['outputs']}
+    deps = {}
+    for s in stages:
+        deps[s['name']] = {
+            producers[f] for f in s['inputs'] + s['optional']
+            if f in producers and producers[f] != s['name']
+        }
+    return deps
+
+
+def load_cache() -> Dict:
+    if CACHE_FILE.exists():
+        return json.loads(CACHE_FILE.read_text(encoding='utf-8'))
+    return {}
+
+
+def save_cache(cache: Dict) -> None:
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    CACHE_FILE.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding='utf-8')
+
+
+def is_up_to_date(stage: Dict, cache: Dict) -> bool:
+    """Entradas e saídas idênticas às registradas na última execução."""
+    entry = cache.get(stage['name'])
+    if entry is None:
+        return False
+    for f in stage_input_files(stage):
+        if entry['inputs'].get(f) != file_hash(BASE_DIR / f):
+            return False
+    for f in stage['outputs']:
+        h = file_hash(BASE_DIR / f)
+        if h is None or entry['outputs'].get(f) != h:
+            return False
+    return True
+
+
+def run_stage(stage: Dict, memory: bool = False) -> Dict:
+    """
+    Executa o script da etapa em um processo separado.
+
+    O processo é aguardado com `os.wait4`, que devolve o uso de recursos do
+    próprio filho (pico de RSS por etapa, mesmo com etapas em paralelo).
+    Com `memory`, o script roda sob `memory_profile.py`.
+    """
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    stem = Path(stage['script']).stem
+    log_file = LOGS_DIR / f"{stem}.log"
+    env = dict(os.environ)
+    env.setdefault('MPLBACKEND', 'Agg')
+
+    command = [sys.executable, str(BASE_DIR / SCRIPTS_DIR / stage['script'])]
+    memory_report = None
+    if memory:
+        memory_report = MEMORY_DIR / f"{stem}.json"
+        command = [sys.executable, str(BASE_DIR / SCRIPTS_DIR / 'memory_profile.py'),
+                   '--output', str(memory_report), command[1]]
+
+    start = time.perf_counter()
+    with open(log_file, 'w', encoding='utf-8') as log:
+        proc = subprocess.Popen(command, cwd=BASE_DIR / SCRIPTS_DIR, stdout=log,
+                                stderr=subprocess.STDOUT, env=env)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss: KB no Linux, bytes no macOS
+    peak_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    result = {
+        'status': 'ok' if proc.returncode == 0 else 'failed',
+        'returncode': proc.returncode,
+        'seconds': elapsed,
+        'peak_rss_mb': peak_rss / 2 ** 20,
+        'log': str(log_file.relative_to(BASE_DIR))
+    }
+    if memory_report is not None:
+        result['memory_report'] = str(memory_report.relative_to(BASE_DIR))
+    return result
+
+
+def plan_pipeline(
+    stages: List[Dict],
+    cache: Dict,
+    force: Set[str],
+    only: Optional[Set[str]] = None
+) -> Dict[str, str]:
+    """
+    Decide o destino de cada etapa: 'run', 'skip', 'blocked' ou 'excluded'.
+
+    Etapas forçadas ou desatualizadas rodam; dependentes de etapas que rodam
+    também rodam (mesmo que suas entradas ainda não tenham mudado).
+    """
+    deps = stage_dependencies(stages)
+    producers = {out: s['name'] for s in stages for out in s['outputs']}
+    plan = {}
+    for s in stages:
+        name = s['name']
+        # Entradas ausentes só bloqueiam se nenhuma etapa desta execução as produzir
+        missing = [f for f in s['inputs']
+                   if not (BASE_DIR / f).exists() and plan.get(producers.get(f)) != 'run']
+        if only is not None and name not in only:
+            plan[name] = 'excluded'
+        elif missing:
+            plan[name] = 'blocked'
+        elif name in force or any(plan.get(d) == 'run' for d in deps[name]) or not is_up_to_date(s, cache):
+            plan[name] = 'run'
+        else:
+            plan[name] = 'skip'
+    return plan
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the analysis pipeline, skipping up-to-date stages')
+    parser.add_argument('--force', type=str, nargs='*', default=None,
+                        help='Force these stages (no value: all) and their dependents')
+    parser.add_argument('--only', type=str, nargs='+', default=None,
+                        help='Restrict to these stages (dependents outside the list are not run)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Maximum parallel stages (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='Show the plan without running')
+    parser.add_argument('--memory', action='store_true',
+                        help='Run each script under memory_profile.py (tracemalloc per [N/M] step)')
+
+    args = parser.parse_args()
+
+    names = [s['name'] for s in STAGES]
+    force = set(names) if args.force == [] else set(args.force or [])
+    only = set(args.only) if args.only else None
+    for name in force | (only or set()):
+        if name not in names:
+            parser.error(f"etapa desconhecida: {name} (disponíveis: {', '.join(names)})")
+
+    cache = load_cache()
+    plan = plan_pipeline(STAGES, cache, force, only)
+    deps = stage_dependencies(STAGES)
+    by_name = {s['name']: s for s in STAGES}
+
+    print("=" * 70)
+    print("PIPELINE DE ANÁLISE")
+    print("=" * 70)
+    labels = {'run': '▶️  executar', 'skip': '✓  atualizada', 'blocked': '⛔ bloqueada', 'excluded': '·  fora da seleção'}
+    for s in STAGES:
+        extra = ''
+        if plan[s['name']] == 'blocked':
+            missing = [f for f in s['inputs'] if not (BASE_DIR / f).exists()]
+            extra = f" (ausente: {', '.join(missing)})"
+        print(f"  {s['name']} {s['script']:32} {labels[plan[s['name']]]}{extra}")
+
+    if args.dry_run:
+        return
+
+    to_run = [n for n in names if plan[n] == 'run']
+    results: Dict[str, Dict] = {}
+    pipeline_start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.jobs or os.cpu_count()) as pool:
+        running = {}
+        pending = list(to_run)
+        while pending or running:
+            # Submeter etapas cujas dependências já terminaram
+            for name in list(pending):
+                upstream = [d for d in deps[name] if plan[d] == 'run']
+                if any(d in pending or d in running.values() for d in upstream):
+                    continue
+                pending.remove(name)
+                failed = [d for d in upstream if results[d]['status'] != 'ok']
+                if failed:
+                    results[name] = {'status': 'skipped', 'seconds': 0.0,
+                                     'log': f"dependência falhou: {', '.join(failed)}"}
+                    print(f"  ✗ {name} não executada (dependência falhou: {', '.join(failed)})")
+                    continue
+                print(f"  ▶️  {name} iniciada")
+                running[pool.submit(run_stage, by_name[name], args.memory)] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                results[name] = future.result()
+                stage = by_name[name]
+                if results[name]['status'] == 'ok':
+                    cache[name] = {
+                        'inputs': {f: file_hash(BASE_DIR / f) for f in stage_input_files(stage)},
+                        'outputs': {f: file_hash(BASE_DIR / f) for f in stage['outputs']},
+                        'seconds': results[name]['seconds'],
+                        'peak_rss_mb': results[name]['peak_rss_mb'],
+                        'finished': datetime.now().isoformat(timespec='seconds')
+                    }
+                    save_cache(cache)
+                    print(f"  ✓ {name} concluída em {results[name]['seconds']:.1f}s "
+                          f"(pico RSS {results[name]['peak_rss_mb']:.0f} MB)")
+                else:
+                    cache.pop(name, None)
+                    save_cache(cache)
+                    print(f"  ✗ {name} falhou (código {results[name]['returncode']}), ver {results[name]['log']}")
+
+    total = time.perf_counter() - pipeline_start
+
+    print("\n" + "=" * 70)
+    print("RESUMO")
+    print("=" * 70)
+    print(f"  {'Etapa':6} {'Status':12} {'Tempo (s)':>10} {'Pico RSS (MB)':>14}")
+    for name in names:
+        if name in results:
+            r = results[name]
+            rss = f"{r['peak_rss_mb']:14.0f}" if 'peak_rss_mb' in r else f"{'-':>14}"
+            print(f"  {name:6} {r['status']:12} {r['seconds']:10.1f} {rss}")
+        else:
+            print(f"  {name:6} {plan[name]:12} {'-':>10} {'-':>14}")
+    print(f"\n  Tempo total (parede): {total:.1f}s")
+    print(f"  Logs: {LOGS_DIR.relative_to(BASE_DIR)}/")
+    if args.memory:
+        print(f"  Memória por etapa: {MEMORY_DIR.relative_to(BASE_DIR)}/ (resumo no fim de cada log)")
+
+    if any(r['status'] != 'ok' for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
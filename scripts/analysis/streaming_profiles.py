@@ -0,0 +1,250 @@
+"""
+Perfis autorais com estatísticas incrementais e combináveis.
+
+Cada perfil guarda, por métrica, contagem de valores válidos, média e M2
+(soma dos quadrados dos desvios). Isso basta para:
+- adicionar um texto em O(métricas) (Welford), sem reler os demais;
+- combinar perfis calculados em partes diferentes do corpus (Chan et al.):
+    n = n_a + n_b;  δ = média_b − média_a
+    média = média_a + δ · n_b / n;  M2 = M2_a + M2_b + δ² · n_a · n_b / n
+NaN não entram nas contagens (cada métrica tem o próprio n). Desvio padrão
+amostral (ddof=1) e CV = desvio / média, como no pandas.
+
+`profiles_by_author.csv` (etapa 03) é a serialização de `AuthorProfiles`:
+author, n_texts e, por métrica, `_mean`, `_std`, `_cv` e `_n` (contagem de
+valores válidos, necessária para combinar perfis lidos do disco).
+
+Uso:
+    python streaming_profiles.py merge parte1.csv parte2.csv -o perfis.csv
+    python streaming_profiles.py update perfis.csv novos_textos.csv -o perfis.csv
+"""
+
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+STATS = ('mean', 'std', 'cv', 'n')
+
+
+class AuthorProfile:
+    """
+    Acumuladores de um autor (vetores alinhados com `metric_cols`).
+
+    Attributes
+    ----------
+    n_texts : int
+        Textos adicionados
+    count : np.ndarray
+        Valores válidos por métrica
+    mean, m2 : np.ndarray
+        Média e soma dos quadrados dos desvios por métrica
+    """
+
+    def __init__(self, n_metrics: int):
+        self.n_texts = 0
+        self.count = np.zeros(n_metrics, dtype=np.int64)
+        self.mean = np.zeros(n_metrics)
+        self.m2 = np.zeros(n_metrics)
+
+    def add(self, values: np.ndarray) -> 'AuthorProfile':
+        """Adiciona um texto (Welford; NaN ignorados)."""
+        x = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(x)
+        self.n_texts += 1
+        self.count[valid] += 1
+        delta = x[valid] - self.mean[valid]
+        self.mean[valid] += delta / self.count[valid]
+        self.m2[valid] += delta * (x[valid] - self.mean[valid])
+        return self
+
+    def add_batch(self, X: np.ndarray) -> 'AuthorProfile':
+        """Adiciona vários textos de uma vez (estatísticas do lote + combinação)."""
+        X = np.asarray(X, dtype=np.float64)
+        batch = AuthorProfile(X.shape[1])
+        batch.n_texts = len(X)
+        valid = ~np.isnan(X)
+        batch.count = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(valid, X, 0.0).sum(axis=0) / batch.count
+        batch.mean = np.where(batch.count > 0, mean, 0.0)
+        batch.m2 = np.where(valid, (X - batch.mean) ** 2, 0.0).sum(axis=0)
+        return self.merge(batch)
+
+    def merge(self, other: 'AuthorProfile') -> 'AuthorProfile':
+        """Incorpora outro perfil do mesmo autor (Chan et al.)."""
+        n = self.count + other.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            mean = self.mean + delta * other.count / n
+            m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / n
+        self.mean = np.where(n > 0, mean, 0.0)
+        self.m2 = np.where(n > 0, m2, 0.0)
+        self.count = n
+        self.n_texts += other.n_texts
+        return self
+
+    def copy(self) -> 'AuthorProfile':
+        clone = AuthorProfile(len(self.count))
+        clone.n_texts = self.n_texts
+        clone.count, clone.mean, clone.m2 = self.count.copy(), self.mean.copy(), self.m2.copy()
+        return clone
+
+    def statistics(self) -> Dict[str, np.ndarray]:
+        """Média, desvio (ddof=1), CV e contagem por métrica (NaN onde indefinidos)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(self.count > 0, self.mean, np.nan)
+            std = np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+            cv = np.where(mean != 0, std / mean, np.nan)
+        return {'mean': mean, 'std': std, 'cv': cv, 'n': self.count}
+
+
+class AuthorProfiles:
+    """
+    Perfis de vários autores sobre as mesmas métricas.
+
+    Parameters
+    ----------
+    metric_cols : list of str
+        Métricas acompanhadas (ordem das colunas na serialização)
+    """
+
+    def __init__(self, metric_cols: Iterable[str]):
+        self.metric_cols = list(metric_cols)
+        self.profiles: Dict[str, AuthorProfile] = {}
+
+    def __repr__(self) -> str:
+        return f"AuthorProfiles({len(self.profiles)} autores, {len(self.metric_cols)} métricas)"
+
+    def __getitem__(self, author: str) -> AuthorProfile:
+        return self.profiles[author]
+
+    @property
+    def authors(self) -> List[str]:
+        return list(self.profiles)
+
+    def _profile(self, author: str) -> AuthorProfile:
+        if author not in self.profiles:
+            self.profiles[author] = AuthorProfile(len(self.metric_cols))
+        return self.profiles[author]
+
+    def add_text(self, author: str, values) -> 'AuthorProfiles':
+        """
+        Adiciona um texto em O(métricas).
+
+        `values` pode ser um vetor na ordem de `metric_cols` ou um mapeamento
+        (dict/Series) métrica → valor; métricas ausentes contam como NaN.
+        """
+        if isinstance(values, (dict, pd.Series)):
+            values = pd.Series(values).reindex(self.metric_cols).to_numpy(dtype=np.float64)
+        self._profile(author).add(values)
+        return self
+
+    def add_frame(self, df: pd.DataFrame, author_col: str = 'author') -> 'AuthorProfiles':
+        """Adiciona todos os textos de uma tabela (um lote por autor)."""
+        values = df.reindex(columns=self.metric_cols).to_numpy(dtype=np.float64)
+        codes, authors = pd.factorize(df[author_col])
+        for code, author in enumerate(authors):
+            self._profile(author).add_batch(values[codes == code])
+        return self
+
+    def merge(self, other: 'AuthorProfiles') -> 'AuthorProfiles':
+        """Incorpora perfis calculados em outra parte do corpus (mesmas métricas)."""
+        if other.metric_cols != self.metric_cols:
+            raise ValueError("Perfis com métricas diferentes não podem ser combinados")
+        for author, profile in other.profiles.items():
+            self._profile(author).merge(profile)
+        return self
+
+    def total(self) -> AuthorProfile:
+        """Perfil agregado de todos os autores."""
+        total = AuthorProfile(len(self.metric_cols))
+        for profile in self.profiles.values():
+            total.merge(profile)
+        return total
+
+    def statistic(self, name: str) -> pd.DataFrame:
+        """Tabela autores × métricas de uma estatística ('mean', 'std', 'cv' ou 'n')."""
+        return pd.DataFrame([p.statistics()[name] for p in self.profiles.values()],
+                            index=pd.Index(self.authors, name='author'), columns=self.metric_cols)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Serialização: author, n_texts e {métrica}_{mean,std,cv,n}."""
+        rows = []
+        for author, profile in self.profiles.items():
+            stats = profile.statistics()
+            row = {'author': author, 'n_texts': profile.n_texts}
+            for j, col in enumerate(self.metric_cols):
+                for name in STATS:
+                    row[f'{col}_{name}'] = stats[name][j]
+            rows.append(row)
+        return pd.DataFrame(rows, columns=['author', 'n_texts'] +
+                            [f'{col}_{name}' for col in self.metric_cols for name in STATS])
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'AuthorProfiles':
+        """Reconstrói os acumuladores a partir de `to_frame()` (M2 = desvio² · (n − 1))."""
+        metric_cols = [col[:-len('_mean')] for col in df.columns
+                       if col.endswith('_mean') and f"{col[:-len('_mean')]}_n" in df.columns]
+        profiles = cls(metric_cols)
+        for _, row in df.iterrows():
+            profile = profiles._profile(row['author'])
+            profile.n_texts = int(row['n_texts'])
+            count = row[[f'{c}_n' for c in metric_cols]].to_numpy(dtype=np.float64)
+            mean = row[[f'{c}_mean' for c in metric_cols]].to_numpy(dtype=np.float64)
+            std = row[[f'{c}_std' for c in metric_cols]].to_numpy(dtype=np.float64)
+            profile.count = np.nan_to_num(count).astype(np.int64)
+            profile.mean = np.where(profile.count > 0, mean, 0.0)
+            profile.m2 = np.where(profile.count > 1, std ** 2 * (profile.count - 1), 0.0)
+        return profiles
+
+    def save(self, path: Path) -> None:
+        self.to_frame().to_csv(path, index=False)
+
+    @classmethod
+    def load(cls, path: Path) -> 'AuthorProfiles':
+        return cls.from_frame(pd.read_csv(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge or update serialized author profiles')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    merge_parser = subparsers.add_parser('merge', help='Merge profiles computed on different shards')
+    merge_parser.add_argument('profiles', nargs='+', help='Profile CSVs (profiles_by_author.csv format)')
+    merge_parser.add_argument('-o', '--output', required=True, help='Output profile CSV')
+
+    update_parser = subparsers.add_parser('update', help='Add new texts to an existing profile')
+    update_parser.add_argument('profiles', help='Profile CSV to update')
+    update_parser.add_argument('texts', help='CSV with one row per new text (author + metric columns)')
+    update_parser.add_argument('-o', '--output', default=None, help='Output CSV (default: overwrite input)')
+    update_parser.add_argument('--condition', default='original',
+                               help="Keep only rows with this condition, if the column exists (default: original)")
+
+    args = parser.parse_args()
+
+    if args.command == 'merge':
+        profiles: Optional[AuthorProfiles] = None
+        for path in args.profiles:
+            part = AuthorProfiles.load(path)
+            profiles = part if profiles is None else profiles.merge(part)
+        output = args.output
+    else:
+        profiles = AuthorProfiles.load(args.profiles)
+        texts = pd.read_csv(args.texts)
+        if 'condition' in texts.columns:
+            texts = texts[texts['condition'] == args.condition]
+        profiles.add_frame(texts)
+        output = args.output or args.profiles
+        print(f"✓ {len(texts)} textos adicionados")
+
+    profiles.save(output)
+    print(f"✓ {profiles} salvos em: {output}")
+    for author in profiles.authors:
+        print(f"  • {author}: {profiles[author].n_texts} textos")
+
+
+if __name__ == "__main__":
+    main()
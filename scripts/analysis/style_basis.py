@@ -0,0 +1,205 @@
+"""
+Base estilística compartilhada: StandardScaler + PCA de posto completo
+ajustados nos textos originais.
+
+Os scripts de movimento (analysis2/02–05) e os perfis autorais
+(analysis2/01) usam o mesmo espaço: z-score com média/desvio dos originais
+e PCA ajustado nos originais, truncado em 2, 3 ou 5 componentes. A base é
+ajustada uma vez com todos os componentes e gravada em
+`analysis/.pipeline/style_basis/` (npz), identificada pelo hash da tabela de
+métricas; truncar em k componentes equivale a ajustar PCA(n_components=k).
+
+Projetar qualquer conjunto de textos é uma multiplicação de matrizes:
+    PCs = ((X - média) / desvio - média_pca) @ componentes[:k].T
+
+Uso:
+    python style_basis.py           # mostra a base (ajusta se necessário)
+    python style_basis.py --refit   # reajusta e regrava
+"""
+
+import argparse
+import hashlib
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+
+sys.path.append(str(Path(__file__).parent))
+from feature_store import BASE_DIR, FeatureStore, get_store
+
+BASIS_DIR = Path("analysis/.pipeline/style_basis")
+
+
+class StyleBasis:
+    """
+    Scaler + PCA dos originais, com os atributos no formato do scikit-learn.
+
+    Attributes
+    ----------
+    key : str
+        Hash da tabela de métricas usada no ajuste
+    metric_cols : list of str
+        Ordem das colunas esperada em `project`
+    scaler_mean_, scaler_scale_ : np.ndarray
+        Média e desvio por métrica (StandardScaler)
+    mean_, components_ : np.ndarray
+        Média no espaço padronizado e componentes (linhas) do PCA
+    explained_variance_, explained_variance_ratio_, singular_values_ : np.ndarray
+        Variância por componente (todos os componentes)
+    """
+
+    FIELDS = ['scaler_mean_', 'scaler_scale_', 'mean_', 'components_',
+              'explained_variance_', 'explained_variance_ratio_', 'singular_values_']
+
+    def __init__(self, key: str, metric_cols: Sequence[str], **arrays: np.ndarray):
+        self.key = key
+        self.metric_cols = list(metric_cols)
+        for field in self.FIELDS:
+            setattr(self, field, np.asarray(arrays[field], dtype=np.float64))
+
+    def __repr__(self) -> str:
+        return (f"StyleBasis({len(self.metric_cols)} métricas, "
+                f"{len(self.components_)} componentes, {self.key[:12]})")
+
+    @property
+    def n_components(self) -> int:
+        return len(self.components_)
+
+    @classmethod
+    def fit(cls, store: FeatureStore, key: str) -> 'StyleBasis':
+        """Ajusta na condição original (NaN → média da coluna), todos os componentes."""
+        scaler = store.scaler('original')
+        pca = PCA(n_components=None, svd_solver='full').fit(store.standardized('original'))
+        return cls(
+            key, store.metric_cols,
+            scaler_mean_=scaler.mean_,
+            scaler_scale_=scaler.scale_,
+            mean_=pca.mean_,
+            components_=pca.components_,
+            explained_variance_=pca.explained_variance_,
+            explained_variance_ratio_=pca.explained_variance_ratio_,
+            singular_values_=pca.singular_values_
+        )
+
+    def save(self, path: Path) -> None:
+        """Grava em npz (arrays + chave + nomes das métricas)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, key=self.key, metric_cols=np.asarray(self.metric_cols),
+                 **{field: getattr(self, field) for field in self.FIELDS})
+
+    @classmethod
+    def load(cls, path: Path) -> 'StyleBasis':
+        """Lê uma base gravada por `save`."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(str(data['key']), data['metric_cols'].tolist(),
+                       **{field: data[field] for field in cls.FIELDS})
+
+    def project(self, X: np.ndarray, n_components: int = 2) -> np.ndarray:
+        """
+        Coordenadas nos k primeiros componentes.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            Textos × métricas (na ordem de `metric_cols`, sem NaN)
+        n_components : int
+            Número de componentes
+        """
+        X = np.asarray(X, dtype=np.float64)
+        return ((X - self.scaler_mean_) / self.scaler_scale_ - self.mean_) @ self.components_[:n_components].T
+
+    def loadings(self, n_components: int = 2) -> pd.DataFrame:
+        """Cargas (métricas × PC1..PCk), como `pca.components_.T`."""
+        return pd.DataFrame(self.components_[:n_components].T, index=self.metric_cols,
+                            columns=[f'PC{i + 1}' for i in range(n_components)])
+
+
+def table_key(store: FeatureStore) -> str:
+    """Hash SHA-1 da tabela de métricas (nomes, condições e valores)."""
+    h = hashlib.sha1()
+    h.update('\n'.join(store.metric_cols).encode('utf-8'))
+    h.update('\n'.join(store.meta['condition'].astype(str)).encode('utf-8'))
+    h.update(np.ascontiguousarray(store.values, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _get_style_basis(base_dir: str, refit: bool) -> StyleBasis:
+    store = get_store(base_dir, dtype='float64')
+    key = table_key(store)
+    path = Path(base_dir) / BASIS_DIR / f"style_basis_{key[:12]}.npz"
+
+    if path.exists() and not refit:
+        basis = StyleBasis.load(path)
+        if basis.key == key and basis.metric_cols == store.metric_cols:
+            return basis
+
+    basis = StyleBasis.fit(store, key)
+    basis.save(path)
+    return basis
+
+
+def get_style_basis(base_dir: Optional[Path] = None, refit: bool = False) -> StyleBasis:
+    """
+    Base estilística da tabela atual (carrega do cache ou ajusta e grava).
+
+    Parameters
+    ----------
+    base_dir : Path, optional
+        Raiz do projeto (padrão: detectada a partir deste arquivo)
+    refit : bool
+        Ignora a base gravada e reajusta
+    """
+    base_dir = Path(base_dir).resolve() if base_dir is not None else BASE_DIR
+    return _get_style_basis(str(base_dir), refit)
+
+
+def style_coordinates(
+    store: FeatureStore,
+    basis: StyleBasis,
+    n_components: int = 2,
+    by: Sequence[str] = ('condition',)
+) -> pd.DataFrame:
+    """
+    Coordenadas de todos os textos em uma única projeção.
+
+    Os NaN de cada grupo (por condição, ou por condição e autor) são
+    preenchidos com a média do próprio grupo, como nas análises de movimento.
+
+    Returns
+    -------
+    DataFrame PC1..PCk com o mesmo índice de `store.frame()`
+    """
+    filled = np.empty((len(store.meta), len(store.metric_cols)))
+    for keys in store.meta.groupby(list(by), sort=False).groups:
+        keys = dict(zip(by, keys if isinstance(keys, tuple) else (keys,)))
+        filled[store.rows(keys['condition'], keys.get('author'))] = \
+            store.filled(keys['condition'], keys.get('author'))
+
+    coords = basis.project(filled, n_components)
+    return pd.DataFrame(coords, index=store.meta.index,
+                        columns=[f'PC{i + 1}' for i in range(n_components)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fit or show the shared scaler + PCA basis of the originals')
+    parser.add_argument('--refit', action='store_true', help='Ignore the cached basis and refit')
+    parser.add_argument('--components', type=int, default=5, help='Components to summarize (default: 5)')
+
+    args = parser.parse_args()
+
+    basis = get_style_basis(refit=args.refit)
+    print(basis)
+    cumulative = np.cumsum(basis.explained_variance_ratio_)
+    for i in range(min(args.components, basis.n_components)):
+        print(f"  ├─ PC{i + 1}: {basis.explained_variance_ratio_[i] * 100:5.1f}% "
+              f"(acumulado {cumulative[i] * 100:5.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Índice de vizinhos no espaço estilístico para atribuição de autoria.
+
+Os textos originais, padronizados com o z-score dos próprios originais
+(métricas filtradas), formam a referência: uma BallTree para os k vizinhos
+mais próximos e os centróides de cada autor. Consultas (ex.: todos os textos
+gerados) são padronizadas com o mesmo scaler e respondidas em lotes de
+`chunk_size` linhas, então a memória não cresce com o número de consultas.
+
+Atribuição de cada consulta:
+- Centróide: autores ordenados pela distância ao centróide; margem =
+  distância ao autor incorreto mais próximo − distância ao autor verdadeiro
+  (positiva = atribuída corretamente)
+- kNN: voto dos k originais mais próximos (empates decididos pela soma das
+  distâncias)
+
+NaN das consultas viram 0 no espaço padronizado (média dos originais): não
+usam informação do grupo do texto, que entregaria o autor verdadeiro.
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+
+sys.path.append(str(Path(__file__).parent))
+from feature_store import FeatureStore
+
+
+class StyleIndex:
+    """
+    Referência de originais no espaço padronizado.
+
+    Attributes
+    ----------
+    mean_, scale_ : np.ndarray
+        Média e desvio dos originais por métrica (z-score das consultas)
+    reference : np.ndarray
+        Originais padronizados (n_ref × m)
+    ref_authors : np.ndarray
+        Código do autor de cada original
+    ref_ids : np.ndarray
+        text_id de cada original
+    authors : list of str
+        Autores, na ordem dos códigos
+    centroids : np.ndarray
+        Centróide de cada autor (n_autores × m)
+    """
+
+    def __init__(
+        self,
+        reference: np.ndarray,
+        ref_authors: Sequence[str],
+        ref_ids: Sequence[str],
+        mean: np.ndarray,
+        scale: np.ndarray,
+        leaf_size: int = 40
+    ):
+        self.reference = np.asarray(reference, dtype=np.float64)
+        codes, authors = pd.factorize(np.asarray(ref_authors))
+        self.ref_authors = codes
+        self.authors = list(authors)
+        self.ref_ids = np.asarray(ref_ids)
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+        self.centroids = np.stack([self.reference[codes == a].mean(axis=0) for a in range(len(self.authors))])
+        self.tree = BallTree(self.reference, leaf_size=leaf_size)
+
+    def __repr__(self) -> str:
+        return (f"StyleIndex({len(self.reference)} originais, {len(self.authors)} autores, "
+                f"{self.reference.shape[1]} métricas)")
+
+    @classmethod
+    def from_store(cls, store: FeatureStore, **kwargs) -> 'StyleIndex':
+        """Referência = originais do store (NaN → média da coluna, z-score dos originais)."""
+        scaler = store.scaler('original')
+        meta = store.meta.iloc[store.rows('original')]
+        return cls(store.standardized('original'), meta['author'], meta['text_id'],
+                   scaler.mean_, scaler.scale_, **kwargs)
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Padroniza consultas com o scaler dos originais (NaN → 0)."""
+        Z = (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+        return np.where(np.isnan(Z), 0.0, Z)
+
+    def neighbours(self, Z: np.ndarray, k: int = 5, chunk_size: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        k originais mais próximos de cada consulta (já padronizada).
+
+        Returns
+        -------
+        (distances, indices) : (n × k), ordenados por distância
+        """
+        k = min(k, len(self.reference))
+        distances = np.empty((len(Z), k))
+        indices = np.empty((len(Z), k), dtype=np.int64)
+        for start in range(0, len(Z), chunk_size):
+            stop = start + chunk_size
+            distances[start:stop], indices[start:stop] = self.tree.query(Z[start:stop], k=k)
+        return distances, indices
+
+    def centroid_distances(self, Z: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        """Distância euclidiana de cada consulta a cada centróide (n × n_autores)."""
+        out = np.empty((len(Z), len(self.authors)))
+        for start in range(0, len(Z), chunk_size):
+            diff = Z[start:start + chunk_size, None, :] - self.centroids[None, :, :]
+            out[start:start + chunk_size] = np.sqrt((diff ** 2).sum(axis=2))
+        return out
+
+    def attribute(
+        self,
+        X: np.ndarray,
+        true_authors: Optional[Sequence[str]] = None,
+        k: int = 5,
+        top: int = 3,
+        chunk_size: int = 4096
+    ) -> pd.DataFrame:
+        """
+        Atribuição de autoria de um lote de textos.
+
+        Parameters
+        ----------
+        X : np.ndarray (n × m)
+            Métricas brutas, na ordem das colunas da referência (NaN permitidos)
+        true_authors : sequence of str, optional
+            Autor verdadeiro de cada texto (habilita distância/margem/acertos)
+        k : int
+            Vizinhos no voto kNN
+        top : int
+            Autores mais próximos (por centróide) reportados
+        chunk_size : int
+            Consultas por lote
+
+        Returns
+        -------
+        DataFrame com author_top1..author_top{top}, distance_top1,
+        knn_author, knn_votes, nearest_original, nearest_distance e, com
+        `true_authors`: distance_true, margin, rank_true, correct_centroid,
+        correct_topk, correct_knn
+        """
+        Z = self.transform(X)
+        n_authors = len(self.authors)
+        top = min(top, n_authors)
+        authors = np.asarray(self.authors, dtype=object)
+
+        # Centróides
+        dist_c = self.centroid_distances(Z, chunk_size)
+        order = np.argsort(dist_c, axis=1, kind='stable')
+        result = {f'author_top{i + 1}': authors[order[:, i]] for i in range(top)}
+        result['distance_top1'] = dist_c[np.arange(len(Z)), order[:, 0]]
+
+        # kNN: votos por autor; empate → menor soma de distâncias
+        dist_k, idx_k = self.neighbours(Z, k, chunk_size)
+        neighbour_authors = self.ref_authors[idx_k]
+        rows = np.repeat(np.arange(len(Z)), idx_k.shape[1])
+        votes = np.zeros((len(Z), n_authors))
+        dist_sum = np.zeros((len(Z), n_authors))
+        np.add.at(votes, (rows, neighbour_authors.ravel()), 1)
+        np.add.at(dist_sum, (rows, neighbour_authors.ravel()), dist_k.ravel())
+        key = -votes + dist_sum / (dist_sum.max() + 1)
+        knn_code = np.argmin(key, axis=1)
+        result['knn_author'] = authors[knn_code]
+        result['knn_votes'] = votes[np.arange(len(Z)), knn_code].astype(int)
+        result['nearest_original'] = self.ref_ids[idx_k[:, 0]]
+        result['nearest_distance'] = dist_k[:, 0]
+
+        if true_authors is not None:
+            true_code = pd.Index(self.authors).get_indexer(np.asarray(true_authors))
+            known = true_code >= 0
+            safe = np.where(known, true_code, 0)
+            d_true = dist_c[np.arange(len(Z)), safe]
+            others = dist_c.copy()
+            others[np.arange(len(Z)), safe] = np.inf
+            rank = (order == safe[:, None]).argmax(axis=1) + 1
+            result['distance_true'] = np.where(known, d_true, np.nan)
+            result['margin'] = np.where(known, others.min(axis=1) - d_true, np.nan)
+            result['rank_true'] = np.where(known, rank, 0)
+            result['correct_centroid'] = known & (order[:, 0] == true_code)
+            result['correct_topk'] = known & (rank <= top)
+            result['correct_knn'] = known & (knn_code == true_code)
+
+        return pd.DataFrame(result)
+
+
+def attribution_accuracy(
+    attribution: pd.DataFrame,
+    by: List[str],
+    top: int = 3
+) -> pd.DataFrame:
+    """Acurácia (centróide, top-k, kNN) e margem média por grupo."""
+    return attribution.groupby(by, sort=False).agg(
+        n_texts=('margin', 'size'),
+        accuracy_centroid=('correct_centroid', 'mean'),
+        **{f'accuracy_top{top}': ('correct_topk', 'mean')},
+        accuracy_knn=('correct_knn', 'mean'),
+        mean_margin=('margin', 'mean'),
+        median_margin=('margin', 'median'),
+        mean_rank_true=('rank_true', 'mean')
+    ).reset_index()
@@ -5,11 +5,12 @@ Módulos para extração de métricas léxicas e sintáticas.
 """
 
 from .basic_metrics import BasicMetrics
-from .syntactic_metrics import SyntacticMetrics
+from .syntactic_metrics import ParseError, SyntacticMetrics
 from .windowed_analysis import WindowedAnalysis, validate_text_for_windowed_analysis
 
 __all__ = [
     'BasicMetrics',
+    'ParseError',
     'SyntacticMetrics',
     'WindowedAnalysis',
     'validate_text_for_windowed_analysis'
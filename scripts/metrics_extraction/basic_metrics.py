@@ -1,54 +1,154 @@
 """
 Módulo para cálculo de métricas léxicas básicas.
 Adaptado do código original com melhorias de robustez e documentação.
+
+Recursos NLTK (Punkt, WordNet, OMW, RSLP) são resolvidos sob demanda, uma vez
+por processo, no primeiro uso: importar o módulo não toca disco nem rede.
+`HAS_PUNKT`, `HAS_WORDNET`, `HAS_OMW` e `HAS_RSLP` continuam disponíveis como
+atributos do módulo (resolvidos ao serem lidos).
+
+Modo offline (`NLTK_OFFLINE`):
+- não definido: recurso ausente → tenta `nltk.download` uma vez; se falhar,
+  o processo (e os filhos criados depois) passa a operar offline
+- `1`: nunca baixa; recurso ausente usa o fallback (split / texto sem
+  lematização)
+- `strict`: nunca baixa; recurso ausente levanta LookupError no primeiro uso
+
+Os tokenizadores vêm de `tokenizer_registry` (um Punkt por idioma por
+processo), que aplica o mesmo fallback às janelas e à validação windowed. `warm_up()` resolve os recursos e carrega Punkt/WordNet/RSLP de uma
+vez, para uso no início da extração ou como `initializer` de pools de processos.
 """
 
 from __future__ import division
+import functools
+import os
+import sys
+from pathlib import Path
+
 import numpy as np
 import nltk
 from nltk.util import ngrams
 from nltk.stem import WordNetLemmatizer, RSLPStemmer
 from nltk.data import find
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(str(Path(__file__).parent))
+
+from instrumentation import span
+from tokenizer_registry import get_tokenizers, load_tokenizers, offline_mode
 
 
 # ======================================================
 # Helpers para garantir recursos NLTK sem quebrar
 # ======================================================
 
+# Recurso → candidatos (caminho no nltk_data, pacote para download)
+NLTK_RESOURCES = {
+    'punkt': (("tokenizers/punkt", "punkt"), ("tokenizers/punkt_tab", "punkt_tab")),
+    'wordnet': (("corpora/wordnet", "wordnet"),),
+    'omw': (("corpora/omw-1.4", "omw-1.4"),),
+    'rslp': (("stemmers/rslp", "rslp"),)
+}
+_RESOURCE_FLAGS = {'HAS_PUNKT': 'punkt', 'HAS_WORDNET': 'wordnet', 'HAS_OMW': 'omw', 'HAS_RSLP': 'rslp'}
+_AVAILABLE: Dict[str, bool] = {}
+
+
 def _ensure_nltk_resource(path: str, download_name: Optional[str] = None) -> bool:
     """
-    Tenta localizar um recurso NLTK. Se não achar e download_name for dado,
-    tenta fazer nltk.download(download_name). Se nada der certo, devolve False.
+    Tenta localizar um recurso NLTK. Se não achar e download_name for dado
+    (e o modo offline não estiver ligado), tenta fazer
+    nltk.download(download_name). Se nada der certo, devolve False.
     """
     try:
         find(path)
         return True
     except LookupError:
-        if download_name is None:
+        if download_name is None or offline_mode():
             return False
         try:
-            nltk.download(download_name, quiet=True)
-            find(path)
-            return True
+            if nltk.download(download_name, quiet=True):
+                find(path)
+                return True
         except Exception:
-            return False
+            pass
+        # Sem rede: não tentar de novo neste processo nem nos filhos
+        os.environ['NLTK_OFFLINE'] = '1'
+        return False
+
+
+def has_resource(name: str) -> bool:
+    """
+    Disponibilidade de um recurso de `NLTK_RESOURCES`, resolvida no primeiro
+    uso e guardada para o resto do processo.
+
+    Raises
+    ------
+    LookupError
+        Recurso ausente com `NLTK_OFFLINE=strict`
+    """
+    if name not in _AVAILABLE:
+        candidates = NLTK_RESOURCES[name]
+        # Procurar todos os candidatos localmente antes de qualquer download
+        available = any(_ensure_nltk_resource(path) for path, _ in candidates)
+        if not available and offline_mode() == 'strict':
+            packages = ', '.join(package for _, package in candidates)
+            raise LookupError(f"Recurso NLTK '{name}' ausente (NLTK_OFFLINE=strict); instale com nltk.download: {packages}")
+        if not available:
+            available = any(_ensure_nltk_resource(path, package) for path, package in candidates)
+        _AVAILABLE[name] = available
+    return _AVAILABLE[name]
+
+
+def __getattr__(name: str):
+    # HAS_PUNKT, HAS_WORDNET, ... resolvidos só quando lidos
+    if name in _RESOURCE_FLAGS:
+        return has_resource(_RESOURCE_FLAGS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.lru_cache(maxsize=None)
+def _rslp_stemmer() -> RSLPStemmer:
+    """RSLPStemmer lê as regras do disco ao ser criado: uma instância por processo."""
+    return RSLPStemmer()
+
 
+@functools.lru_cache(maxsize=None)
+def _wordnet_lemmatizer() -> WordNetLemmatizer:
+    return WordNetLemmatizer()
 
-# Verificar recursos disponíveis
-HAS_PUNKT = _ensure_nltk_resource("tokenizers/punkt", "punkt") or _ensure_nltk_resource("tokenizers/punkt_tab", "punkt_tab")
-HAS_WORDNET = _ensure_nltk_resource("corpora/wordnet", "wordnet")
-HAS_OMW = _ensure_nltk_resource("corpora/omw-1.4", "omw-1.4")
-HAS_RSLP = _ensure_nltk_resource("stemmers/rslp", "rslp")
+
+def warm_up(langs: Iterable[str] = ('pt', 'eng'), lemmatizers: bool = True) -> Dict[str, bool]:
+    """
+    Resolve os recursos NLTK e carrega os modelos uma vez no processo.
+
+    Carrega Punkt para cada idioma e, com `lemmatizers`, RSLP (pt) e WordNet
+    (eng). Sem argumentos obrigatórios, serve de `initializer` para pools
+    (ex.: `ProcessPoolExecutor(initializer=warm_up)`).
+
+    Returns
+    -------
+    dict
+        Disponibilidade de cada recurso ({'punkt': True, ...})
+    """
+    langs = list(langs)
+    if has_resource('punkt'):
+        load_tokenizers(langs)
+    if lemmatizers:
+        if 'pt' in langs and has_resource('rslp'):
+            _rslp_stemmer().stem('aquecimento')
+        if 'eng' in langs and has_resource('wordnet'):
+            _wordnet_lemmatizer().lemmatize('warming')
+    return {name: has_resource(name) for name in NLTK_RESOURCES}
 
 
 def _sent_tokenize_safe(text: str, language: str) -> List[str]:
     """
-    Usa nltk.sent_tokenize se possível; senão, faz um fallback grosseiro.
+    Usa o Punkt do registro (= nltk.sent_tokenize) se possível; senão, faz um
+    fallback grosseiro.
     """
-    if HAS_PUNKT:
+    if has_resource('punkt'):
         try:
-            return nltk.sent_tokenize(text, language=language)
+            return get_tokenizers(language).sent_tokenize(text)
         except (LookupError, ValueError):
             pass
     # fallback: tudo em uma sentença só
@@ -57,11 +157,12 @@ def _sent_tokenize_safe(text: str, language: str) -> List[str]:
 
 def _word_tokenize_safe(sent: str, language: str) -> List[str]:
     """
-    Usa nltk.word_tokenize se possível; senão, split por espaço.
+    Usa o tokenizador do registro (= nltk.word_tokenize) se possível; senão,
+    split por espaço.
     """
-    if HAS_PUNKT:
+    if has_resource('punkt'):
         try:
-            return nltk.word_tokenize(sent, language=language)
+            return get_tokenizers(language).word_tokenize(sent)
         except (LookupError, ValueError):
             pass
     return sent.split()
@@ -110,15 +211,18 @@ class BasicMetrics:
             Dicionário com todas as métricas calculadas
         """
         # Métricas pré-lematização
-        self.metrics_pre_lemmatization()
+        with span('pre_lemmatization'):
+            self.metrics_pre_lemmatization()
 
         # Aplicar redução radical (lemmatization/stemming)
-        lemma_text = self.radical_reduction(self.text, self.lang)
+        with span('rslp' if self.lang == 'pt' else 'wordnet'):
+            lemma_text = self.radical_reduction(self.text, self.lang)
         
         # Calcular n-gramas no texto normalizado
-        self.generate_unigrams(lemma_text)
-        self.generate_bigrams(lemma_text)
-        self.generate_trigrams(lemma_text)
+        with span('ngrams'):
+            self.generate_unigrams(lemma_text)
+            self.generate_bigrams(lemma_text)
+            self.generate_trigrams(lemma_text)
 
         return self.results
 
@@ -170,15 +274,17 @@ class BasicMetrics:
         """
         language = "portuguese" if self.lang == "pt" else "english"
 
-        sentences = _sent_tokenize_safe(self.text, language=language)
+        with span('punkt'):
+            sentences = _sent_tokenize_safe(self.text, language=language)
         tokens_per_sentence = []
         all_tokens = []
         chars_per_token = []
 
-        for sent in sentences:
-            tokens = _word_tokenize_safe(sent, language=language)
-            tokens_per_sentence.append(len(tokens))
-            all_tokens.extend(tokens)
+        with span('words'):
+            for sent in sentences:
+                tokens = _word_tokenize_safe(sent, language=language)
+                tokens_per_sentence.append(len(tokens))
+                all_tokens.extend(tokens)
 
         chars_per_token = [len(t) for t in all_tokens if t.isalpha()]
 
@@ -215,10 +321,10 @@ class BasicMetrics:
         """
         if lang == "pt":
             language = "portuguese"
-            if not HAS_RSLP:
+            if not has_resource('rslp'):
                 return text
 
-            stemmer = RSLPStemmer()
+            stemmer = _rslp_stemmer()
             sentences = _sent_tokenize_safe(text, language=language)
             proc_sents = []
             for sent in sentences:
@@ -228,10 +334,10 @@ class BasicMetrics:
             return ' '.join(proc_sents)
         else:
             language = "english"
-            if not HAS_WORDNET:
+            if not has_resource('wordnet'):
                 return text
 
-            lemmatizer = WordNetLemmatizer()
+            lemmatizer = _wordnet_lemmatizer()
             sentences = _sent_tokenize_safe(text, language=language)
             proc_sents = []
             for sent in sentences:
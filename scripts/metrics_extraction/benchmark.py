@@ -0,0 +1,363 @@
+"""
+Benchmark dos módulos de extração em corpora sintéticos de várias escalas.
+
+Cada caso (etapa × idioma × escala) roda em um processo próprio, para que o
+pico de memória (RSS) medido seja só dele. Etapas:
+
+- basic: `BasicMetrics(texto).run()`
+- syntactic: `SyntacticMetrics` com o parser local de `synthetic_corpus`
+  (grava/relê CoNLL-U e calcula as métricas; sem rede)
+- windowed: `WindowedAnalysis(texto, n_windows=5).create_windows()`
+- extractor: `MetricsExtractor` completo (full text + windowed léxicas) sobre
+  o corpus gravado em disco, com o mesmo parser local
+
+Com `--parser-url` (ou `--serve-parser`, que sobe `udpipe_server.py` em uma
+thread), syntactic e extractor usam o `SyntacticMetrics` real via HTTP, com a
+latência configurada no servidor.
+
+Para cada caso: tempo total, tokens/s, textos/s, latência por texto
+(p50/p90/p99/máx, em ms) e pico de RSS. Geração do corpus e um texto de
+aquecimento ficam fora da medição. Resultados em JSON; `compare` aponta
+regressões em relação a um baseline salvo (código de saída 1 se houver).
+
+Uso:
+    python benchmark.py run [--scales 1k 10k 100k] [--stages basic syntactic] [-o benchmarks/results.json]
+    python benchmark.py run --stages syntactic --serve-parser --parser-latency-ms 20
+    python benchmark.py compare benchmarks/baseline.json benchmarks/results.json [--tolerance 0.10]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import resource
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from synthetic_corpus import SyntheticCorpus, format_scale, parse_scale, write_corpus
+
+
+STAGES = ('basic', 'syntactic', 'windowed', 'extractor')
+DEFAULT_SCALES = ['1k', '10k', '100k']
+PERCENTILES = (50, 90, 99)
+
+
+def _rss_bytes(value: int) -> int:
+    """ru_maxrss vem em KB no Linux e em bytes no macOS."""
+    return value if sys.platform == 'darwin' else value * 1024
+
+
+def _timed(items: Iterable, latencies: List[float]) -> Iterator:
+    """Repassa os itens anotando o tempo gasto pelo consumidor em cada um."""
+    for item in items:
+        start = time.perf_counter()
+        yield item
+        latencies.append(time.perf_counter() - start)
+
+
+def _run_stage(stage: str, lang: str, corpus: SyntheticCorpus, n_tokens: int,
+               text_tokens: int, workdir: Path, parser_url: Optional[str] = None) -> List[float]:
+    """
+    Executa uma etapa sobre o corpus e devolve a latência de cada texto (s).
+
+    Com `parser_url`, a etapa sintática usa o `SyntacticMetrics` real contra
+    esse endpoint em vez do parser local.
+    """
+    from basic_metrics import BasicMetrics
+    from synthetic_corpus import LocalSyntacticMetrics
+    from syntactic_metrics import SyntacticMetrics
+    from windowed_analysis import WindowedAnalysis
+
+    latencies: List[float] = []
+    texts = corpus.texts(n_tokens, text_tokens)
+
+    if stage == 'basic':
+        for _, text in texts:
+            start = time.perf_counter()
+            BasicMetrics(text, lang=lang).run()
+            latencies.append(time.perf_counter() - start)
+    elif stage == 'syntactic':
+        conllu_path = workdir / 'udpipe_output'
+        for text_id, text in texts:
+            start = time.perf_counter()
+            if parser_url is None:
+                LocalSyntacticMetrics(text, lang=lang, text_id=text_id, conllu_path=str(conllu_path)).run()
+            else:
+                SyntacticMetrics(text, lang=lang, text_id=text_id, conllu_path=str(conllu_path),
+                                 parser_url=parser_url).run()
+            latencies.append(time.perf_counter() - start)
+    elif stage == 'windowed':
+        for _, text in texts:
+            start = time.perf_counter()
+            WindowedAnalysis(text, lang=lang, n_windows=5, respect_sentences=False).create_windows()
+            latencies.append(time.perf_counter() - start)
+    elif stage == 'extractor':
+        import extract_all_metrics
+        from corpus_reader import close_sources, iter_corpus
+
+        if parser_url is None:
+            extract_all_metrics.SyntacticMetrics = LocalSyntacticMetrics
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            extractor = extract_all_metrics.MetricsExtractor(workdir, workdir / 'metrics', use_index=False,
+                                                             parser_url=parser_url)
+            records = list(iter_corpus(workdir, conditions=['original']))
+            full, windowed = [], []
+            extractor.extract_full_text_metrics(_timed(records, full))
+            extractor.extract_windowed_lexical_metrics(_timed(records, windowed))
+            close_sources(records)
+        latencies = [a + b for a, b in zip(full, windowed)]
+    else:
+        raise ValueError(f"Etapa desconhecida: {stage} (use {', '.join(STAGES)})")
+    return latencies
+
+
+def run_case(case: Dict) -> Dict:
+    """
+    Mede um caso no processo atual (chamado no processo filho).
+
+    Parameters
+    ----------
+    case : dict
+        stage, lang, n_tokens, text_tokens, seed, warmup, parser_url
+
+    Returns
+    -------
+    dict
+        Caso + n_texts, seconds, tokens_per_second, texts_per_second,
+        latency_ms {p50, p90, p99, max, mean}, rss_start_mb, peak_rss_mb, status
+    """
+    stage, lang = case['stage'], case['lang']
+    corpus = SyntheticCorpus(lang, case['seed'])
+    rss_start = _rss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+    with tempfile.TemporaryDirectory(prefix='bench_') as tmp:
+        workdir = Path(tmp)
+        if case['warmup'] > 0:
+            _run_stage(stage if stage != 'extractor' else 'basic', lang,
+                       SyntheticCorpus(lang, case['seed'] + 1), case['warmup'], case['warmup'], workdir)
+        if stage == 'extractor':
+            write_corpus(workdir, case['n_tokens'], [lang], case['text_tokens'], case['seed'])
+
+        start = time.perf_counter()
+        latencies = _run_stage(stage, lang, corpus, case['n_tokens'], case['text_tokens'], workdir,
+                               case.get('parser_url'))
+        seconds = time.perf_counter() - start
+
+    peak = _rss_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    lat_ms = np.asarray(latencies) * 1000
+    return {
+        **case,
+        'n_texts': len(latencies),
+        'seconds': seconds,
+        'tokens_per_second': case['n_tokens'] / seconds if seconds > 0 else None,
+        'texts_per_second': len(latencies) / seconds if seconds > 0 else None,
+        'latency_ms': {
+            **{f'p{p}': float(np.percentile(lat_ms, p)) for p in PERCENTILES},
+            'max': float(lat_ms.max()),
+            'mean': float(lat_ms.mean())
+        } if len(lat_ms) else None,
+        'rss_start_mb': rss_start / 2 ** 20,
+        'peak_rss_mb': peak / 2 ** 20,
+        'status': 'ok'
+    }
+
+
+def _child(case: Dict, queue) -> None:
+    try:
+        queue.put(run_case(case))
+    except Exception as e:
+        queue.put({**case, 'status': 'error', 'error': f"{type(e).__name__}: {' '.join(str(e).split())[:200]}"})
+
+
+def run_isolated(case: Dict, timeout: Optional[float] = None) -> Dict:
+    """Executa `run_case` em um processo novo (spawn) e devolve o resultado."""
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_child, args=(case, queue))
+    process.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=1.0)
+        except queue_module.Empty:
+            if not process.is_alive():
+                result = {**case, 'status': 'error', 'error': f"processo encerrado (código {process.exitcode})"}
+            elif deadline is not None and time.monotonic() > deadline:
+                process.terminate()
+                result = {**case, 'status': 'timeout', 'error': f"sem resultado em {timeout}s"}
+    process.join()
+    return result
+
+
+def case_key(result: Dict) -> tuple:
+    return result['stage'], result['lang'], result['n_tokens']
+
+
+def compare_results(baseline: Dict, current: Dict, tolerance: float = 0.10,
+                    rss_tolerance: float = 0.20) -> List[Dict]:
+    """
+    Compara dois arquivos de resultados caso a caso.
+
+    Regressão: tokens/s abaixo de (1 − tolerance) × baseline, p90 acima de
+    (1 + tolerance) × baseline, pico de RSS acima de (1 + rss_tolerance) ×
+    baseline, ou caso que passou a falhar.
+
+    Returns
+    -------
+    list of dict
+        Um item por caso presente nos dois arquivos: stage, lang, scale,
+        razões (current / baseline) e `regressions` (lista de motivos)
+    """
+    base = {case_key(r): r for r in baseline['results']}
+    rows = []
+    for result in current['results']:
+        old = base.get(case_key(result))
+        if old is None:
+            continue
+        row = {'stage': result['stage'], 'lang': result['lang'],
+               'scale': format_scale(result['n_tokens']), 'regressions': []}
+        if result['status'] != 'ok':
+            if old['status'] == 'ok':
+                row['regressions'].append(f"status {result['status']}")
+            rows.append(row)
+            continue
+        if old['status'] != 'ok':
+            rows.append(row)
+            continue
+
+        row['throughput_ratio'] = result['tokens_per_second'] / old['tokens_per_second']
+        row['p90_ratio'] = (result['latency_ms']['p90'] / old['latency_ms']['p90']
+                            if old['latency_ms']['p90'] > 0 else None)
+        row['rss_ratio'] = result['peak_rss_mb'] / old['peak_rss_mb']
+        if row['throughput_ratio'] < 1 - tolerance:
+            row['regressions'].append(f"tokens/s {row['throughput_ratio']:.2f}x")
+        if row['p90_ratio'] is not None and row['p90_ratio'] > 1 + tolerance:
+            row['regressions'].append(f"p90 {row['p90_ratio']:.2f}x")
+        if row['rss_ratio'] > 1 + rss_tolerance:
+            row['regressions'].append(f"RSS {row['rss_ratio']:.2f}x")
+        rows.append(row)
+    return rows
+
+
+def _print_result(result: Dict) -> None:
+    label = f"{result['stage']:<10} {result['lang']:<4} {format_scale(result['n_tokens']):>5}"
+    if result['status'] != 'ok':
+        print(f"   ⚠️  {label}: {result['status']} ({result.get('error', '')})")
+        return
+    lat = result['latency_ms']
+    print(f"   ✓ {label}: {result['tokens_per_second']:>10,.0f} tok/s | "
+          f"p50 {lat['p50']:.1f} ms, p90 {lat['p90']:.1f} ms, p99 {lat['p99']:.1f} ms | "
+          f"RSS {result['peak_rss_mb']:.0f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the extraction modules on synthetic corpora')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmark and save results as JSON')
+    run_parser.add_argument('--scales', nargs='+', default=DEFAULT_SCALES,
+                            help='Corpus sizes in tokens, e.g. 1k 10k 1M 10M (default: 1k 10k 100k)')
+    run_parser.add_argument('--langs', nargs='+', choices=['pt', 'eng'], default=['pt', 'eng'],
+                            help='Languages (default: pt eng)')
+    run_parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES),
+                            help='Stages to run (default: all)')
+    run_parser.add_argument('--text-tokens', type=int, default=500, help='Tokens per text (default: 500)')
+    run_parser.add_argument('--seed', type=int, default=42, help='Corpus seed (default: 42)')
+    run_parser.add_argument('--warmup', type=int, default=200,
+                            help='Tokens processed before timing, to load models (default: 200)')
+    run_parser.add_argument('--timeout', type=float, default=None, help='Seconds per case (default: none)')
+    run_parser.add_argument('-o', '--output', type=str, default='benchmarks/results.json',
+                            help='Output JSON (default: benchmarks/results.json)')
+    run_parser.add_argument('--parser-url', type=str, default=None,
+                            help='Run syntactic/extractor against this UDPipe /process endpoint')
+    run_parser.add_argument('--serve-parser', action='store_true',
+                            help='Start a local udpipe_server.py for the run and use it as --parser-url')
+    run_parser.add_argument('--parser-latency-ms', type=float, default=0.0,
+                            help='Per-request delay of the --serve-parser server (default: 0)')
+
+    compare_parser = subparsers.add_parser('compare', help='Flag regressions against a saved baseline')
+    compare_parser.add_argument('baseline', help='Baseline results JSON')
+    compare_parser.add_argument('current', help='Current results JSON')
+    compare_parser.add_argument('--tolerance', type=float, default=0.10,
+                                help='Allowed throughput/p90 slowdown fraction (default: 0.10)')
+    compare_parser.add_argument('--rss-tolerance', type=float, default=0.20,
+                                help='Allowed peak RSS growth fraction (default: 0.20)')
+
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+        rows = compare_results(baseline, current, args.tolerance, args.rss_tolerance)
+        n_regressions = 0
+        for row in rows:
+            label = f"{row['stage']:<10} {row['lang']:<4} {row['scale']:>5}"
+            ratios = ", ".join(f"{name} {row[key]:.2f}x" for name, key in
+                               (('tok/s', 'throughput_ratio'), ('p90', 'p90_ratio'), ('RSS', 'rss_ratio'))
+                               if row.get(key) is not None)
+            if row['regressions']:
+                n_regressions += 1
+                print(f"⚠️  {label}: REGRESSÃO ({'; '.join(row['regressions'])})")
+            else:
+                print(f"✓ {label}: {ratios or 'sem comparação'}")
+        print(f"\n{len(rows)} casos comparados, {n_regressions} com regressão")
+        sys.exit(1 if n_regressions else 0)
+
+    with contextlib.ExitStack() as stack:
+        parser_url = args.parser_url
+        if args.serve_parser:
+            from udpipe_server import serve_in_background
+            server = stack.enter_context(serve_in_background(latency_ms=args.parser_latency_ms))
+            parser_url = server.url
+
+        cases = [
+            {'stage': stage, 'lang': lang, 'n_tokens': parse_scale(scale),
+             'text_tokens': args.text_tokens, 'seed': args.seed, 'warmup': args.warmup,
+             'parser_url': parser_url}
+            for stage in args.stages for lang in args.langs for scale in args.scales
+        ]
+
+        print("=" * 60)
+        print("BENCHMARK DA EXTRAÇÃO (CORPUS SINTÉTICO)")
+        print("=" * 60)
+        print(f"⚙️  {len(cases)} casos: {', '.join(args.stages)} × {', '.join(args.langs)} × {', '.join(args.scales)}")
+        if parser_url is not None:
+            print(f"🌐 UDPipe: {parser_url}")
+
+        results = []
+        for case in cases:
+            result = run_isolated(case, args.timeout)
+            _print_result(result)
+            results.append(result)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Resultados salvos em: {output}")
+
+
+if __name__ == "__main__":
+    main()
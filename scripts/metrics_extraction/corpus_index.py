@@ -0,0 +1,302 @@
+"""
+Índice (manifesto) do corpus com fatos pré-computados por texto.
+
+Uma linha por texto: id, caminho, tamanho em bytes, hash do conteúdo,
+idioma, condição, autor, título, sample, rep, número de tokens e de sentenças
+e a tokenização que os contou (`tokenizer`: 'punkt', 'punkt_fast' ou 'split',
+ver `tokenizer_registry`).
+Extração, janelamento e análises consultam o índice em vez de redescobrir
+o corpus (varredura de diretórios + parsing de nomes + tokenização).
+
+O índice é construído em paralelo e atualizado incrementalmente: arquivos
+com mesmo tamanho e mtime reaproveitam a linha existente; arquivos cujo hash
+não mudou reaproveitam as contagens, desde que contadas com a mesma
+tokenização em uso (senão são recontadas). Condições empacotadas (`corpus_pack.py`)
+são indexadas pela tabela de offsets do pack (coluna `pack`).
+
+Uso:
+    python corpus_index.py [--data-dir .] [--output metrics/corpus_index.csv] [--workers 4]
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+
+from basic_metrics import has_resource, warm_up
+from corpus_pack import PackReader
+from corpus_reader import TextRecord, iter_corpus
+from tokenizer_registry import get_tokenizers
+
+
+INDEX_COLUMNS = [
+    'text_id', 'path', 'n_bytes', 'mtime_ns', 'sha1', 'lang', 'condition',
+    'author', 'title', 'sample_idx', 'rep', 'stem', 'pack', 'n_tokens', 'n_sentences', 'tokenizer'
+]
+
+METADATA_FIELDS = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
+
+
+def _count_text(text: str, lang: str) -> Dict:
+    """
+    Conta tokens e sentenças com os tokenizadores do registro, os mesmos da
+    validação e do janelamento windowed (word_tokenize sobre o texto inteiro).
+    """
+    tokenizers = get_tokenizers(lang)
+    return {
+        'n_tokens': len(tokenizers.word_tokenize(text)),
+        'n_sentences': len(tokenizers.sent_tokenize(text)),
+        'tokenizer': tokenizers.mode
+    }
+
+
+def _entry_from_bytes(raw: bytes, stat: os.stat_result, lang: str, known_sha1: Optional[str]) -> Dict:
+    """
+    Hash e contagens de um texto. Se `known_sha1` coincidir com o hash
+    atual, as contagens não são recalculadas (retorna apenas hash/tamanho).
+    """
+    entry = {
+        'n_bytes': len(raw),
+        'mtime_ns': stat.st_mtime_ns,
+        'sha1': hashlib.sha1(raw).hexdigest()
+    }
+    if entry['sha1'] != known_sha1:
+        entry.update(_count_text(raw.decode('utf-8'), lang))
+    return entry
+
+
+def _index_entry(path: str, lang: str, known_sha1: Optional[str] = None) -> Dict:
+    """
+    Calcula hash e contagens de um arquivo (executado nos workers).
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return _entry_from_bytes(raw, os.stat(path), lang, known_sha1)
+
+
+def _index_pack_entries(pack: str, items: List[Tuple[str, str, Optional[str]]]) -> List[Dict]:
+    """
+    Calcula hash e contagens de vários textos de um pack (executado nos workers).
+
+    O pack é aberto e o cabeçalho lido uma vez para todo o lote.
+
+    Parameters
+    ----------
+    pack : str
+        Arquivo .pack
+    items : list of tuple
+        (stem, lang, known_sha1) de cada texto
+    """
+    stat = os.stat(pack)
+    with PackReader(pack) as reader:
+        return [
+            _entry_from_bytes(bytes(reader.get_bytes(stem)), stat, lang, known_sha1)
+            for stem, lang, known_sha1 in items
+        ]
+
+
+def _chunks(items: List, n_chunks: int) -> List[List]:
+    """Divide `items` em até `n_chunks` lotes contíguos de tamanho parecido."""
+    size = -(-len(items) // max(1, n_chunks))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _tokenizer_mode(lang: str) -> str:
+    """Tokenização que os workers usariam agora para `lang` (ver `_count_text`)."""
+    has_resource('punkt')
+    return get_tokenizers(lang).mode
+
+
+def load_corpus_index(index_path: Path) -> pd.DataFrame:
+    """
+    Carrega o índice do corpus (DataFrame vazio se não existir).
+    """
+    index_path = Path(index_path)
+    if not index_path.exists():
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    df = pd.read_csv(index_path, dtype={'sha1': str, 'pack': str, 'tokenizer': str})
+    df['pack'] = df['pack'].fillna('')
+    # Índices anteriores à coluna: contagens de origem desconhecida (recontadas)
+    df['tokenizer'] = df['tokenizer'].fillna('') if 'tokenizer' in df else ''
+    df['rep'] = df['rep'].astype('Int64')
+    return df
+
+
+def build_corpus_index(
+    data_dir: Path,
+    index_path: Optional[Path] = None,
+    workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Constrói (ou atualiza) o índice do corpus.
+
+    Parameters
+    ----------
+    data_dir : Path
+        Diretório que contém a pasta `data/`
+    index_path : Path, optional
+        CSV do índice. Se existir, é usado como base para atualização
+        incremental; o resultado é salvo no mesmo caminho.
+    workers : int, optional
+        Número de processos (padrão: os.cpu_count())
+
+    Returns
+    -------
+    DataFrame com colunas INDEX_COLUMNS, na ordem do corpus
+    """
+    data_dir = Path(data_dir)
+    previous = load_corpus_index(index_path) if index_path is not None else pd.DataFrame(columns=INDEX_COLUMNS)
+    previous_by_path = {row['path']: row for row in previous.to_dict('records')}
+
+    rows = []
+    pending = []
+    # Textos empacotados pendentes, agrupados por pack: (pos, lang, old, known_sha1, stem)
+    pending_packs: Dict[str, List[Tuple]] = {}
+    for record in iter_corpus(data_dir):
+        rel_path = str(record.path.relative_to(data_dir))
+        pack = None if record.source is None else str(record.source.path)
+        row = {
+            'text_id': f"{record.text_id}_{record.condition}",
+            'path': rel_path,
+            'stem': record.text_id,
+            'pack': '' if pack is None else str(Path(pack).relative_to(data_dir)),
+            **{k: record.metadata[k] for k in METADATA_FIELDS if k != 'text_id'}
+        }
+        old = previous_by_path.get(rel_path)
+        # Contagens antigas só valem se feitas com a tokenização atual
+        same_counts = old is not None and old['tokenizer'] == _tokenizer_mode(record.lang)
+        known_sha1 = old['sha1'] if same_counts else None
+        if pack is not None:
+            pack_entry = record.source.entry(record.text_id)
+            size, sha1 = pack_entry['length'], pack_entry['sha1']
+            if same_counts and old['sha1'] == sha1:
+                # Texto idêntico dentro do pack: reaproveitar contagens
+                row.update({k: old[k] for k in ['n_tokens', 'n_sentences', 'tokenizer']})
+                row.update({'n_bytes': size, 'sha1': sha1, 'mtime_ns': os.stat(pack).st_mtime_ns})
+            else:
+                pending_packs.setdefault(pack, []).append((len(rows), record.lang, old, known_sha1, record.text_id))
+        else:
+            stat = record.path.stat()
+            if same_counts and old['n_bytes'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+                # Arquivo inalterado: reaproveitar linha inteira
+                row.update({k: old[k] for k in ['n_bytes', 'mtime_ns', 'sha1', 'n_tokens', 'n_sentences', 'tokenizer']})
+            else:
+                pending.append((len(rows), str(record.path), record.lang, old, known_sha1))
+        rows.append(row)
+
+    n_pending = len(pending) + sum(len(items) for items in pending_packs.values())
+    if n_pending:
+        print(f"🔎 Indexando {n_pending}/{len(rows)} textos novos ou modificados...")
+        # Resolver Punkt aqui (um eventual download é tentado uma vez) e
+        # carregar os modelos em cada worker antes do primeiro texto
+        has_resource('punkt')
+        n_workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers, initializer=warm_up, initargs=(('pt', 'eng'), False)) as pool:
+            jobs = [
+                ([(pos, old)], pool.submit(_index_entry, path, lang, known_sha1))
+                for pos, path, lang, old, known_sha1 in pending
+            ]
+            # Um lote por worker e por pack: cada lote abre o pack uma vez
+            for pack, items in pending_packs.items():
+                for chunk in _chunks(items, n_workers):
+                    args = [(stem, lang, known_sha1) for _, lang, _, known_sha1, stem in chunk]
+                    jobs.append(([(pos, old) for pos, _, old, _, _ in chunk],
+                                 pool.submit(_index_pack_entries, pack, args)))
+            for targets, future in jobs:
+                result = future.result()
+                entries = result if isinstance(result, list) else [result]
+                for (pos, old), entry in zip(targets, entries):
+                    if 'n_tokens' not in entry:
+                        # Conteúdo idêntico (apenas mtime mudou): manter contagens
+                        entry.update({k: old[k] for k in ['n_tokens', 'n_sentences', 'tokenizer']})
+                    rows[pos].update(entry)
+
+    df_index = pd.DataFrame(rows, columns=INDEX_COLUMNS)
+    df_index['rep'] = df_index['rep'].astype('Int64')
+
+    if index_path is not None:
+        index_path = Path(index_path)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        df_index.to_csv(index_path, index=False)
+
+    return df_index
+
+
+def iter_index_records(
+    df_index: pd.DataFrame,
+    data_dir: Path,
+    conditions: Optional[List[str]] = None,
+    authors: Optional[List[str]] = None
+) -> Iterator[TextRecord]:
+    """
+    Gera TextRecords a partir do índice, sem varrer diretórios.
+
+    `conditions` e `authors` restringem a seleção (padrão: todos).
+
+    Os packs abertos são fechados quando o gerador termina (registros
+    guardados em lista reabrem o pack sob demanda; ver
+    `corpus_reader.close_sources`).
+    """
+    data_dir = Path(data_dir)
+    if conditions is not None:
+        df_index = df_index[df_index['condition'].isin(conditions)]
+    if authors is not None:
+        df_index = df_index[df_index['author'].isin(authors)]
+    with ExitStack() as stack:
+        readers = {}
+        for row in df_index.to_dict('records'):
+            source = None
+            if isinstance(row['pack'], str) and row['pack']:
+                if row['pack'] not in readers:
+                    readers[row['pack']] = stack.enter_context(PackReader(data_dir / row['pack']))
+                source = readers[row['pack']]
+            metadata = {k: row[k] for k in METADATA_FIELDS if k != 'text_id'}
+            metadata['text_id'] = row['stem']
+            metadata['rep'] = None if pd.isna(row['rep']) else int(row['rep'])
+            metadata['sample_idx'] = int(row['sample_idx'])
+            metadata['n_tokens'] = int(row['n_tokens'])
+            metadata['n_sentences'] = int(row['n_sentences'])
+            yield TextRecord(data_dir / row['path'], metadata, source=source)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or update the corpus index')
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        default='.',
+        help='Directory containing data/ folder'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default='metrics/corpus_index.csv',
+        help='Index CSV path (updated incrementally if it exists)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: CPU count)'
+    )
+
+    args = parser.parse_args()
+
+    df_index = build_corpus_index(Path(args.data_dir), Path(args.output), workers=args.workers)
+
+    print(f"✅ Índice salvo: {args.output}")
+    print(f"   {len(df_index)} textos, {df_index['n_tokens'].sum()} tokens")
+    for condition, group in df_index.groupby('condition', sort=False):
+        print(f"  ├─ {condition}: {len(group)} textos, {group['n_tokens'].median():.0f} tokens (mediana)")
+
+
+if __name__ == "__main__":
+    main()
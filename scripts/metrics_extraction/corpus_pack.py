@@ -0,0 +1,252 @@
+"""
+Contêiner compactado para os textos de uma condição.
+
+Milhares de arquivos .txt de poucos KB tornam open/stat o gargalo da leitura.
+Um pack guarda todos os textos de uma condição (todos os autores) em um único
+arquivo, com uma tabela de offsets no cabeçalho:
+
+    MSPACK01 | tamanho do cabeçalho (uint64 LE) | cabeçalho JSON | conteúdo
+
+O leitor usa mmap: `get_bytes(text_id)` devolve uma fatia (memoryview) do
+arquivo mapeado, sem cópia; `get_text` decodifica apenas o texto pedido.
+
+Layout em disco (ao lado dos diretórios equivalentes):
+    data/original.pack
+    data/generated/00_BASELINE-raw_prompt.pack
+    ...
+
+Uso:
+    python corpus_pack.py pack --data-dir . [--condition baseline]
+    python corpus_pack.py unpack --data-dir . [--condition baseline]
+    python corpus_pack.py list data/original.pack
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+sys.path.append(str(Path(__file__).parent))
+
+
+MAGIC = b'MSPACK01'
+_HEADER_LEN = struct.Struct('<Q')
+
+
+def pack_path_for(condition_dir: Path) -> Path:
+    """Caminho do pack equivalente a um diretório de condição."""
+    condition_dir = Path(condition_dir)
+    return condition_dir.parent / f"{condition_dir.name}.pack"
+
+
+def condition_dirs(data_dir: Path) -> Dict[str, Path]:
+    """Mapeia condição -> diretório de textos (existente ou não)."""
+    from corpus_reader import GENERATED_CONDITIONS
+
+    data_root = Path(data_dir) / 'data'
+    dirs = {'original': data_root / 'original'}
+    for folder_name, condition_name in GENERATED_CONDITIONS:
+        dirs[condition_name] = data_root / 'generated' / folder_name
+    return dirs
+
+
+def write_pack(condition_dir: Path, output_path: Optional[Path] = None) -> Path:
+    """
+    Empacota `{condition_dir}/{author}/*.txt` em um único arquivo.
+
+    Parameters
+    ----------
+    condition_dir : Path
+        Diretório da condição (subpastas por autor)
+    output_path : Path, optional
+        Destino (padrão: `{condition_dir}.pack`)
+
+    Returns
+    -------
+    Path do pack escrito
+    """
+    condition_dir = Path(condition_dir)
+    output_path = Path(output_path) if output_path is not None else pack_path_for(condition_dir)
+
+    entries = []
+    chunks = []
+    offset = 0
+    seen = set()
+    for author_dir in sorted(condition_dir.iterdir()):
+        if not author_dir.is_dir():
+            continue
+        for txt_file in sorted(author_dir.glob('*.txt')):
+            text_id = txt_file.stem
+            if text_id in seen:
+                raise ValueError(f"text_id duplicado em {condition_dir}: {text_id}")
+            seen.add(text_id)
+            raw = txt_file.read_bytes()
+            entries.append({
+                'text_id': text_id,
+                'author': author_dir.name,
+                'filename': txt_file.name,
+                'offset': offset,
+                'length': len(raw),
+                'sha1': hashlib.sha1(raw).hexdigest()
+            })
+            chunks.append(raw)
+            offset += len(raw)
+
+    header = json.dumps({'version': 1, 'entries': entries}, ensure_ascii=False).encode('utf-8')
+
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for raw in chunks:
+            f.write(raw)
+    tmp_path.replace(output_path)
+    return output_path
+
+
+class PackReader:
+    """
+    Leitor de pack com acesso aleatório por `text_id` via mmap.
+
+    Parameters
+    ----------
+    path : Path
+        Arquivo .pack
+
+    Notes
+    -----
+    O objeto pode ser enviado a processos filhos (pickle): apenas o caminho
+    é serializado e o mmap é reaberto no destino. Depois de `close()`, o
+    próximo `get_bytes`/`get_text` reabre o arquivo.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._open()
+
+    def _open(self) -> None:
+        self._file = open(self.path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Arquivo não é um pack válido: {self.path}")
+        start = len(MAGIC)
+        (header_len,) = _HEADER_LEN.unpack_from(self._mmap, start)
+        start += _HEADER_LEN.size
+        header = json.loads(bytes(self._mmap[start:start + header_len]).decode('utf-8'))
+        self._data_start = start + header_len
+        self.entries: List[Dict] = header['entries']
+        self._by_id = {e['text_id']: e for e in self.entries}
+
+    def close(self) -> None:
+        """Libera o mmap e o arquivo (pode ser chamado mais de uma vez)."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._open()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, text_id: str) -> bool:
+        return text_id in self._by_id
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.entries)
+
+    def entry(self, text_id: str) -> Dict:
+        """Entrada da tabela de offsets (autor, offset, length, sha1)."""
+        return self._by_id[text_id]
+
+    def get_bytes(self, text_id: str) -> memoryview:
+        """Bytes UTF-8 do texto, como fatia do mmap (sem cópia)."""
+        e = self._by_id[text_id]
+        if self._mmap is None:
+            self._open()
+        start = self._data_start + e['offset']
+        return memoryview(self._mmap)[start:start + e['length']]
+
+    def get_text(self, text_id: str) -> str:
+        """Texto decodificado."""
+        return str(self.get_bytes(text_id), 'utf-8')
+
+
+def unpack(pack_file: Path, condition_dir: Optional[Path] = None) -> Path:
+    """
+    Recria `{condition_dir}/{author}/*.txt` a partir de um pack.
+    """
+    pack_file = Path(pack_file)
+    if condition_dir is None:
+        condition_dir = pack_file.parent / pack_file.stem
+    condition_dir = Path(condition_dir)
+    with PackReader(pack_file) as reader:
+        for e in reader:
+            out = condition_dir / e['author'] / e['filename']
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_bytes(reader.get_bytes(e['text_id']))
+    return condition_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pack/unpack corpus conditions into single files')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in [('pack', 'Pack condition directories'), ('unpack', 'Restore .txt files from packs')]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--data-dir', type=str, default='.', help='Directory containing data/ folder')
+        sub.add_argument('--condition', type=str, default=None,
+                         help='Only this condition (default: all)')
+
+    sub = subparsers.add_parser('list', help='List the entries of a pack')
+    sub.add_argument('pack_file', type=str)
+
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        with PackReader(args.pack_file) as reader:
+            for e in reader:
+                print(f"{e['author']:15} {e['text_id']:60} {e['length']:8d} bytes")
+            print(f"\n{len(reader)} textos")
+        return
+
+    for condition, cond_dir in condition_dirs(Path(args.data_dir)).items():
+        if args.condition is not None and condition != args.condition:
+            continue
+        if args.command == 'pack':
+            if not cond_dir.is_dir():
+                print(f"⏭️  {condition}: diretório ausente ({cond_dir})")
+                continue
+            out = write_pack(cond_dir)
+            with PackReader(out) as reader:
+                print(f"✓ {condition}: {len(reader)} textos → {out}")
+        else:
+            pack_file = pack_path_for(cond_dir)
+            if not pack_file.exists():
+                print(f"⏭️  {condition}: pack ausente ({pack_file})")
+                continue
+            out = unpack(pack_file, cond_dir)
+            print(f"✓ {condition}: textos restaurados em {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Módulo para leitura preguiçosa (streaming) do corpus.
+Percorre os diretórios de dados e produz registros leves, lendo o texto
+apenas quando solicitado.
+
+Cada condição pode estar em disco como diretório (`{autor}/*.txt`) ou como
+pack (`{condição}.pack`, ver `corpus_pack.py`); a leitura é transparente.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Condições geradas: (pasta em data/generated, nome da condição)
+GENERATED_CONDITIONS: List[Tuple[str, str]] = [
+    ('00_BASELINE-raw_prompt', 'baseline'),
+    ('01_PROMPT_STEERING-style-description', 'prompt_steering'),
+    ('02_ACTIVATION_STEERING-raw-prompt', 'activation_steering')
+]
+
+# Autores em português (demais são inglês)
+PT_AUTHORS = ['lispector', 'wikipedia_pt']
+
+
+def parse_text_path(filepath: Path, dataset_type: str) -> Dict:
+    """
+    Extrai metadados do caminho do arquivo.
+
+    Parameters
+    ----------
+    filepath : Path
+        Caminho do arquivo
+    dataset_type : str
+        Tipo: 'original', 'baseline', 'prompt_steering', 'activation_steering'
+
+    Returns
+    -------
+    dict
+        Metadados: text_id, author, title, sample_idx, rep, condition, lang
+    """
+    filepath = Path(filepath)
+    parts = filepath.stem.split('__')
+
+    if dataset_type == 'original':
+        # original: {title}__s{sample}.txt
+        title = parts[0]
+        sample_idx = int(parts[1].replace('s', ''))
+        rep = None
+    else:
+        # generated: {title}__s{sample}__r{rep}.txt
+        title = parts[0]
+        sample_idx = int(parts[1].replace('s', ''))
+        rep = int(parts[2].replace('r', ''))
+
+    author = filepath.parent.name
+    lang = 'pt' if author in PT_AUTHORS else 'eng'
+
+    return {
+        'text_id': filepath.stem,
+        'author': author,
+        'title': title,
+        'sample_idx': sample_idx,
+        'rep': rep,
+        'condition': dataset_type,
+        'lang': lang
+    }
+
+
+class TextRecord:
+    """
+    Registro leve de um texto do corpus.
+
+    Guarda apenas caminho e metadados; o conteúdo é lido do disco a cada
+    acesso a `text`, de modo que nenhum texto permanece em memória depois
+    de processado.
+
+    Parameters
+    ----------
+    path : Path
+        Caminho do arquivo .txt
+    metadata : dict
+        Metadados extraídos por `parse_text_path`
+    source : PackReader, optional
+        Pack de onde o texto é lido (nesse caso `path` é o caminho
+        equivalente no layout em diretórios e não precisa existir)
+    """
+
+    __slots__ = ('path', 'metadata', 'source')
+
+    def __init__(self, path: Path, metadata: Dict, source=None):
+        self.path = Path(path)
+        self.metadata = metadata
+        self.source = source
+
+    def __getattr__(self, name: str):
+        # Acesso direto aos metadados: record.author, record.lang, ...
+        if name in TextRecord.__slots__:
+            raise AttributeError(name)
+        try:
+            return self.metadata[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self) -> str:
+        return f"TextRecord({self.metadata['condition']}/{self.metadata['text_id']})"
+
+    @property
+    def text(self) -> str:
+        """Lê o conteúdo do arquivo ou do pack (sem cache)."""
+        if self.source is not None:
+            return self.source.get_text(self.metadata['text_id'])
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+
+def iter_condition_dir(condition_dir: Path, condition: str) -> Iterator[TextRecord]:
+    """
+    Percorre `{condition_dir}/{author}/*.txt` produzindo um TextRecord por arquivo.
+
+    Se o diretório não existir mas houver `{condition_dir}.pack`, os registros
+    são lidos do pack.
+    """
+    condition_dir = Path(condition_dir)
+    if not condition_dir.is_dir():
+        yield from iter_condition_pack(condition_dir, condition)
+        return
+    for author_dir in sorted(condition_dir.iterdir()):
+        if not author_dir.is_dir():
+            continue
+        for txt_file in sorted(author_dir.glob('*.txt')):
+            yield TextRecord(txt_file, parse_text_path(txt_file, condition))
+
+
+def iter_condition_pack(condition_dir: Path, condition: str) -> Iterator[TextRecord]:
+    """
+    Produz os TextRecords de `{condition_dir}.pack`, se existir.
+    """
+    from corpus_pack import PackReader, pack_path_for
+
+    pack_file = pack_path_for(condition_dir)
+    if not pack_file.exists():
+        return
+    with PackReader(pack_file) as reader:
+        for entry in reader:
+            path = Path(condition_dir) / entry['author'] / entry['filename']
+            yield TextRecord(path, parse_text_path(path, condition), source=reader)
+
+
+def close_sources(records: Iterable[TextRecord]) -> None:
+    """
+    Fecha os packs referenciados por registros já coletados.
+
+    Os geradores fecham seus packs ao terminar; registros guardados em lista
+    reabrem o pack no primeiro acesso a `text`. Quem materializa a lista
+    chama esta função depois de ler os textos.
+    """
+    for source in {id(r.source): r.source for r in records if r.source is not None}.values():
+        source.close()
+
+
+def iter_corpus(
+    data_dir: Path,
+    conditions: Optional[List[str]] = None
+) -> Iterator[TextRecord]:
+    """
+    Gera registros de todos os textos do dataset (originais + gerados).
+
+    Parameters
+    ----------
+    data_dir : Path
+        Diretório que contém a pasta `data/`
+    conditions : list of str, optional
+        Restringe às condições indicadas (padrão: todas)
+
+    Yields
+    ------
+    TextRecord
+        Um registro por texto, na ordem: original, baseline,
+        prompt_steering, activation_steering
+    """
+    data_root = Path(data_dir) / 'data'
+
+    if conditions is None or 'original' in conditions:
+        yield from iter_condition_dir(data_root / 'original', 'original')
+
+    for folder_name, condition_name in GENERATED_CONDITIONS:
+        if conditions is not None and condition_name not in conditions:
+            continue
+        yield from iter_condition_dir(data_root / 'generated' / folder_name, condition_name)
+
+
+def count_corpus(data_dir: Path, conditions: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Conta textos por condição sem ler conteúdo (apenas varredura de diretórios).
+    """
+    counts = {}
+    for record in iter_corpus(data_dir, conditions):
+        counts[record.condition] = counts.get(record.condition, 0) + 1
+    return counts
+
+
+if __name__ == "__main__":
+    # Teste simples: varre o corpus a partir da raiz do projeto
+    import sys
+
+    root = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent.parent.parent
+    for condition, n in count_corpus(root).items():
+        print(f"{condition:25}: {n} textos")
+
+    first = next(iter_corpus(root), None)
+    if first is not None:
+        print(f"\n{first!r} -> {len(first.text)} caracteres")
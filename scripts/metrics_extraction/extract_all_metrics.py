@@ -6,28 +6,64 @@ Executa:
 2. Métricas windowed léxicas (5 janelas) para textos >= 100 tokens
 3. Métricas windowed sintáticas (3 segmentos) para textos >= 100 tokens (opcional)
 
+Falhas de cada etapa (léxica, sintática, janelas) ficam em `metrics/failures.csv`
+(ver `failure_ledger.py`); `--retry-failed` reprocessa só esses textos.
+
 Uso:
-    python extract_all_metrics.py [--skip-windowed] [--skip-syntactic-windowed]
+    python extract_all_metrics.py [--skip-windowed] [--skip-syntactic-windowed] [--profile [--profiler cprofile]] [--memory]
+    python extract_all_metrics.py --retry-failed
+    python extract_all_metrics.py --parser-url http://127.0.0.1:8001/process   # udpipe_server.py
+    python extract_all_metrics.py --fast-tokenizer   # caminho rápido p/ texto pré-tokenizado
 """
 
 import argparse
+import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from tqdm import tqdm
 import sys
 import warnings
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
 
 # Adicionar path do módulo
 sys.path.append(str(Path(__file__).parent))
 
-from basic_metrics import BasicMetrics
+from basic_metrics import BasicMetrics, warm_up
+from corpus_index import build_corpus_index, iter_index_records
+from corpus_reader import TextRecord, close_sources, iter_corpus, parse_text_path
+from failure_ledger import FailureLedger, print_failure_summary
+from instrumentation import Instrumentation, activate, deactivate, print_summary, span, text as instrumented_text
+from memory_tracker import MemoryTracker, print_memory_summary
 from syntactic_metrics import SyntacticMetrics
+from tokenizer_registry import fast_path_enabled
 from windowed_analysis import WindowedAnalysis, validate_text_for_windowed_analysis
 
 warnings.filterwarnings('ignore')
 
 
+def _ledger_keys(df: pd.DataFrame, phase: str) -> pd.Series:
+    """Chave do ledger por linha (text_id com condição; no windowed o text_id não a inclui)."""
+    if phase == 'windowed':
+        return df['text_id'].astype(str) + '_' + df['condition'].astype(str)
+    return df['text_id'].astype(str)
+
+
+def _replace_rows(df_old: pd.DataFrame, df_new: pd.DataFrame, keys: Set[str], phase: str) -> pd.DataFrame:
+    """
+    Troca as linhas de `df_old` com chave em `keys` pelas de `df_new`,
+    mantendo-as na posição das linhas antigas.
+    """
+    old_keys = _ledger_keys(df_old, phase)
+    replaced = old_keys.isin(keys).to_numpy()
+    first_pos = {k: i for i, k in reversed(list(enumerate(old_keys)))}
+    kept = df_old[~replaced].assign(_order=np.flatnonzero(~replaced))
+    if len(df_new):
+        df_new = df_new.assign(_order=[first_pos.get(k, len(df_old)) for k in _ledger_keys(df_new, phase)])
+    merged = pd.concat([kept, df_new], ignore_index=True).sort_values('_order', kind='stable')
+    return merged.drop(columns='_order').reset_index(drop=True)
+
+
 class MetricsExtractor:
     """
     Orquestra extração de métricas para todos os textos.
@@ -39,13 +75,40 @@ class MetricsExtractor:
         output_dir: Path,
         min_tokens_windowed: int = 100,
         n_windows_lexical: int = 5,
-        n_segments_syntactic: int = 3
+        n_segments_syntactic: int = 3,
+        use_index: bool = True,
+        index_workers: Optional[int] = None,
+        profile: bool = False,
+        profiler: Optional[str] = None,
+        memory: bool = False,
+        parser_url: Optional[str] = None
     ):
         self.data_dir = Path(data_dir)
         self.output_dir = Path(output_dir)
         self.min_tokens_windowed = min_tokens_windowed
         self.n_windows_lexical = n_windows_lexical
         self.n_segments_syntactic = n_segments_syntactic
+        self.use_index = use_index
+        self.index_workers = index_workers
+        self.index_path = self.output_dir / 'corpus_index.csv'
+        self.parser_url = parser_url
+        self.profile_dir = self.output_dir / 'profile'
+        
+        # Falhas por (texto, fase, etapa), persistidas entre execuções
+        self.ledger = FailureLedger(self.output_dir / 'failures.csv')
+        
+        # Instrumentação (spans por sub-etapa; perfil por texto com `profiler`)
+        self.instrumentation = None
+        if profile or profiler is not None:
+            self.instrumentation = Instrumentation(profiler=profiler, profile_dir=self.profile_dir)
+            activate(self.instrumentation)
+        
+        # Memória por etapa (tracemalloc + pico de RSS), ver `memory_stage`
+        self.memory_tracker = MemoryTracker() if memory else None
+        
+        # Recursos NLTK resolvidos e modelos carregados antes do primeiro texto
+        # (com NLTK_OFFLINE=strict, um recurso ausente falha aqui)
+        self.nltk_resources = warm_up()
         
         # Criar diretórios de output
         (self.output_dir / 'full_text' / 'individual').mkdir(parents=True, exist_ok=True)
@@ -58,6 +121,19 @@ class MetricsExtractor:
         print(f"⚙️  Min tokens for windowed: {self.min_tokens_windowed}")
         print(f"⚙️  Windows (lexical): {self.n_windows_lexical}")
         print(f"⚙️  Segments (syntactic): {self.n_segments_syntactic}")
+        if self.use_index:
+            print(f"🗂️  Corpus index: {self.index_path}")
+        print(f"🧾 Failure ledger: {self.ledger.path} ({len(self.ledger)} pendentes)")
+        print("📚 NLTK: " + ", ".join(f"{name} {'✓' if ok else '✗ (fallback)'}"
+                                     for name, ok in self.nltk_resources.items()))
+        if fast_path_enabled():
+            print("✂️  Tokenização: caminho rápido para textos pré-tokenizados (TOKENIZER_FAST_PATH)")
+        if self.parser_url is not None:
+            print(f"🌐 UDPipe: {self.parser_url}")
+        if self.instrumentation is not None:
+            print(f"⏱️  Profiling: {self.profile_dir}" + (f" ({profiler} por texto)" if profiler else ""))
+        if self.memory_tracker is not None:
+            print(f"🧠 Memória por etapa: {self.profile_dir / 'memory_profile.json'}")
     
     def read_text_file(self, filepath: Path) -> str:
         """Lê arquivo de texto."""
@@ -68,236 +144,320 @@ class MetricsExtractor:
         """
         Extrai metadados do caminho do arquivo.
         
-        Parameters
-        ----------
-        filepath : Path
-            Caminho do arquivo
-        dataset_type : str
-            Tipo: 'original', 'baseline', 'prompt_steering', 'activation_steering'
+        Ver `corpus_reader.parse_text_path`.
+        """
+        return parse_text_path(filepath, dataset_type)
+    
+    def iter_texts(self) -> Iterator[TextRecord]:
+        """
+        Percorre o dataset sob demanda.
         
         Returns
         -------
-        dict
-            Metadados: author, title, sample_idx, rep, condition, etc.
+        Gerador de TextRecord (caminho + metadados; texto lido apenas
+        quando acessado)
         """
-        parts = filepath.stem.split('__')
-        
-        if dataset_type == 'original':
-            # original: {title}__s{sample}.txt
-            title = parts[0]
-            sample_idx = int(parts[1].replace('s', ''))
-            rep = None
-        else:
-            # generated: {title}__s{sample}__r{rep}.txt
-            title = parts[0]
-            sample_idx = int(parts[1].replace('s', ''))
-            rep = int(parts[2].replace('r', ''))
-        
-        author = filepath.parent.name
-        
-        # Mapear lang
-        if author in ['lispector', 'wikipedia_pt']:
-            lang = 'pt'
-        else:
-            lang = 'eng'
-        
-        return {
-            'text_id': filepath.stem,
-            'author': author,
-            'title': title,
-            'sample_idx': sample_idx,
-            'rep': rep,
-            'condition': dataset_type,
-            'lang': lang
-        }
+        return iter_corpus(self.data_dir)
     
-    def collect_all_texts(self) -> pd.DataFrame:
+    def collect_all_texts(self) -> List[TextRecord]:
         """
-        Coleta todos os textos do dataset.
+        Varre o dataset e reporta quantos textos há por condição.
+        
+        Apenas caminhos e metadados são mantidos em memória; o conteúdo
+        dos arquivos é lido sob demanda durante a extração.
         
         Returns
         -------
-        DataFrame com colunas: text_id, filepath, author, title, sample_idx, 
-                               rep, condition, lang, text
+        list of TextRecord
         """
-        records = []
+        df_index = None
+        if self.use_index:
+            print("\n🗂️  Atualizando índice do corpus...")
+            df_index = build_corpus_index(self.data_dir, self.index_path, workers=self.index_workers)
         
-        # Originais
-        print("\n📖 Coletando textos ORIGINAIS...")
-        original_dir = self.data_dir / 'data' / 'original'
-        for author_dir in original_dir.iterdir():
-            if not author_dir.is_dir():
-                continue
-            for txt_file in author_dir.glob('*.txt'):
-                metadata = self.extract_metadata_from_path(txt_file, 'original')
-                metadata['filepath'] = str(txt_file)
-                metadata['text'] = self.read_text_file(txt_file)
-                records.append(metadata)
-        print(f"  ✓ {len(records)} textos originais")
-        
-        # Gerados - 3 condições
-        conditions = [
-            ('00_BASELINE-raw_prompt', 'baseline'),
-            ('01_PROMPT_STEERING-style-description', 'prompt_steering'),
-            ('02_ACTIVATION_STEERING-raw-prompt', 'activation_steering')
-        ]
-        
-        for folder_name, condition_name in conditions:
-            print(f"\n📖 Coletando textos {condition_name.upper()}...")
-            gen_dir = self.data_dir / 'data' / 'generated' / folder_name
+        records = []
+        for condition in ['original', 'baseline', 'prompt_steering', 'activation_steering']:
+            print(f"\n📖 Coletando textos {condition.upper()}...")
             count_before = len(records)
-            
-            for author_dir in gen_dir.iterdir():
-                if not author_dir.is_dir():
-                    continue
-                for txt_file in author_dir.glob('*.txt'):
-                    metadata = self.extract_metadata_from_path(txt_file, condition_name)
-                    metadata['filepath'] = str(txt_file)
-                    metadata['text'] = self.read_text_file(txt_file)
-                    records.append(metadata)
-            
-            print(f"  ✓ {len(records) - count_before} textos {condition_name}")
+            if df_index is not None:
+                records.extend(iter_index_records(df_index, self.data_dir, conditions=[condition]))
+            else:
+                records.extend(iter_corpus(self.data_dir, conditions=[condition]))
+            print(f"  ✓ {len(records) - count_before} textos {condition}")
         
-        df = pd.DataFrame(records)
-        print(f"\n✅ Total coletado: {len(df)} textos")
-        return df
+        print(f"\n✅ Total coletado: {len(records)} textos")
+        return records
     
-    def extract_full_text_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+    def extract_full_text_metrics(self, records: Iterable[TextRecord]) -> pd.DataFrame:
         """
         Extrai métricas full text (léxicas + sintáticas) para todos os textos.
+        
+        Parameters
+        ----------
+        records : iterable of TextRecord
+            Lista ou gerador de registros (ver `collect_all_texts` / `iter_texts`).
+            Cada texto é lido do disco apenas durante seu processamento.
         """
         print("\n" + "="*60)
         print("EXTRAINDO MÉTRICAS FULL TEXT")
         print("="*60)
         
         results = []
+        total = len(records) if hasattr(records, '__len__') else None
         
-        for idx, row in tqdm(df.iterrows(), total=len(df), desc="Processing texts"):
-            text = row['text']
-            lang = row['lang']
-            condition = row['condition']
+        for item in tqdm(records, total=total, desc="Processing texts"):
             # Include condition in text_id to avoid overwriting CoNLL-U files
-            text_id = f"{row['text_id']}_{condition}"
-            
-            # Metadados
-            record = {
-                'text_id': text_id,
-                'author': row['author'],
-                'title': row['title'],
-                'sample_idx': row['sample_idx'],
-                'rep': row['rep'],
-                'condition': row['condition'],
-                'lang': lang
-            }
-            
-            # Métricas léxicas
-            try:
+            text_id = f"{item.text_id}_{item.condition}"
+            with instrumented_text(text_id, 'full_text', item.metadata.get('n_tokens')) as timing:
+                results.append(self._full_text_record(item, text_id, timing))
+        
+        with span('full_text/assemble'):
+            df_metrics = pd.DataFrame(results)
+        print(f"\n✅ Métricas full text extraídas: {len(df_metrics)} textos")
+        return df_metrics
+    
+    def _full_text_record(self, item: TextRecord, text_id: str, timing: dict) -> dict:
+        """Métricas léxicas + sintáticas de um texto (uma linha de all_texts.csv)."""
+        with span('read'):
+            text = item.text
+        if self.instrumentation is not None and timing['n_tokens'] is None:
+            timing['n_tokens'] = len(text.split())
+        lang = item.lang
+        condition = item.condition
+        
+        # Metadados
+        record = {
+            'text_id': text_id,
+            'author': item.author,
+            'title': item.title,
+            'sample_idx': item.sample_idx,
+            'rep': item.rep,
+            'condition': condition,
+            'lang': lang
+        }
+        
+        # Métricas léxicas
+        try:
+            with span('basic'):
                 basic = BasicMetrics(text, lang=lang)
                 basic_results = basic.run()
-                for k, v in basic_results.items():
-                    record[f'basic_{k}'] = v
-            except Exception as e:
-                print(f"\n⚠️  Erro ao calcular métricas básicas para {text_id}: {e}")
-                # Preencher com NaN
-                for k in ['ttr', 'tokens_per_sentence_mean', 'chars_per_token_mean',
-                         'n_unique_unigrams', 'n_unique_bigrams', 'n_repeated_bigrams',
-                         'n_unique_trigrams', 'n_repeated_trigrams']:
-                    record[f'basic_{k}'] = np.nan
-            
-            # Métricas sintáticas
-            try:
-                synt_lang = 'pt' if lang == 'pt' else 'eng'
-                conllu_path = str(self.output_dir / 'udpipe_output')
+            for k, v in basic_results.items():
+                record[f'basic_{k}'] = v
+            self.ledger.resolve(text_id, 'full_text', 'basic')
+        except Exception as e:
+            print(f"\n⚠️  Erro ao calcular métricas básicas para {text_id}: {e}")
+            self.ledger.record(text_id, 'full_text', 'basic', e)
+            # Preencher com NaN
+            for k in ['ttr', 'tokens_per_sentence_mean', 'chars_per_token_mean',
+                     'n_unique_unigrams', 'n_unique_bigrams', 'n_repeated_bigrams',
+                     'n_unique_trigrams', 'n_repeated_trigrams']:
+                record[f'basic_{k}'] = np.nan
+        
+        # Métricas sintáticas
+        try:
+            synt_lang = 'pt' if lang == 'pt' else 'eng'
+            conllu_path = str(self.output_dir / 'udpipe_output')
+            with span('syntactic'):
                 synt = SyntacticMetrics(
                     text=text,
                     lang=synt_lang,
                     text_id=text_id,
-                    conllu_path=conllu_path
+                    conllu_path=conllu_path,
+                    parser_url=self.parser_url
                 )
                 synt_results = synt.run()
-                for k, v in synt_results.items():
-                    record[f'synt_{k}'] = v
-            except Exception as e:
-                print(f"\n⚠️  Erro ao calcular métricas sintáticas para {text_id}: {e}")
-                # Preencher com NaN
-                record['synt_mean_dependency_distance'] = np.nan
-            
-            results.append(record)
+            for k, v in synt_results.items():
+                record[f'synt_{k}'] = v
+            self.ledger.resolve(text_id, 'full_text', 'syntactic')
+        except Exception as e:
+            print(f"\n⚠️  Erro ao calcular métricas sintáticas para {text_id}: {e}")
+            self.ledger.record(text_id, 'full_text', 'syntactic', e)
+            # Preencher com NaN
+            record['synt_mean_dependency_distance'] = np.nan
         
-        df_metrics = pd.DataFrame(results)
-        print(f"\n✅ Métricas full text extraídas: {len(df_metrics)} textos")
-        return df_metrics
+        return record
     
-    def extract_windowed_lexical_metrics(self, df: pd.DataFrame) -> pd.DataFrame:
+    def extract_windowed_lexical_metrics(self, records: Iterable[TextRecord]) -> pd.DataFrame:
         """
         Extrai métricas léxicas em janelas para textos >= min_tokens.
+        
+        Validação e janelamento são feitos em uma única passagem: cada texto
+        é lido uma vez, validado e, se válido, dividido em janelas. Registros
+        vindos do índice do corpus já trazem `n_tokens`, então textos curtos
+        são descartados sem leitura nem tokenização.
         """
         print("\n" + "="*60)
         print("EXTRAINDO MÉTRICAS WINDOWED LÉXICAS")
         print("="*60)
         
-        # Filtrar textos válidos
-        valid_texts = []
-        for idx, row in df.iterrows():
-            is_valid, reason = validate_text_for_windowed_analysis(
-                row['text'], row['lang'], self.min_tokens_windowed
-            )
-            if is_valid:
-                valid_texts.append(row)
+        results = []
+        n_total = 0
+        n_valid = 0
+        n_failed = 0
+        total = len(records) if hasattr(records, '__len__') else None
         
-        print(f"📊 Textos válidos para windowed: {len(valid_texts)}/{len(df)}")
-        print(f"   Excluídos: {len(df) - len(valid_texts)} textos < {self.min_tokens_windowed} tokens")
+        for item in tqdm(records, total=total, desc="Processing windows"):
+            n_total += 1
+            with instrumented_text(f"{item.text_id}_{item.condition}", 'windowed',
+                                   item.metadata.get('n_tokens')) as timing:
+                window_records = self._windowed_records(item, timing)
+            if window_records is None:
+                continue
+            if not window_records:
+                n_failed += 1
+                continue
+            n_valid += 1
+            results.extend(window_records)
         
-        results = []
+        print(f"📊 Textos válidos para windowed: {n_valid}/{n_total}")
+        print(f"   Excluídos: {n_total - n_valid - n_failed} textos < {self.min_tokens_windowed} tokens")
+        if n_failed:
+            print(f"   ⚠️  Falha ao criar janelas: {n_failed} textos (ver ledger)")
         
-        for row in tqdm(valid_texts, desc="Processing windows"):
-            text = row['text']
-            lang = row['lang']
-            text_id = row['text_id']
-            
-            # Criar janelas
-            wa = WindowedAnalysis(
-                text=text,
-                lang=lang,
-                n_windows=self.n_windows_lexical,
-                respect_sentences=False  # Divisão por tokens para léxicas
-            )
-            windows = wa.create_windows()
+        with span('windowed/assemble'):
+            df_windowed = pd.DataFrame(results)
+        print(f"\n✅ Métricas windowed extraídas: {len(df_windowed)} janelas")
+        return df_windowed
+    
+    def _windowed_records(self, item: TextRecord, timing: dict) -> Optional[List[dict]]:
+        """
+        Métricas léxicas das janelas de um texto (None se o texto for curto
+        demais; lista vazia se a divisão em janelas falhar, com a falha no ledger).
+        """
+        lang = item.lang
+        text_id = item.text_id
+        
+        # Filtrar textos curtos (contagem do índice, se disponível)
+        n_tokens = item.metadata.get('n_tokens')
+        if n_tokens is not None:
+            if n_tokens < self.min_tokens_windowed:
+                return None
+            with span('read'):
+                text = item.text
+        else:
+            with span('read'):
+                text = item.text
+            with span('validate'):
+                is_valid, reason = validate_text_for_windowed_analysis(
+                    text, lang, self.min_tokens_windowed
+                )
+            if not is_valid:
+                return None
+        if self.instrumentation is not None and timing['n_tokens'] is None:
+            timing['n_tokens'] = len(text.split())
+        
+        # Criar janelas (falha de tokenização vai para o ledger, não interrompe a extração)
+        ledger_id = f"{text_id}_{item.condition}"
+        try:
+            with span('windows'):
+                wa = WindowedAnalysis(
+                    text=text,
+                    lang=lang,
+                    n_windows=self.n_windows_lexical,
+                    respect_sentences=False  # Divisão por tokens para léxicas
+                )
+                windows = wa.create_windows()
+        except Exception as e:
+            print(f"\n⚠️  Erro ao criar janelas de {text_id}: {e}")
+            self.ledger.record(ledger_id, 'windowed', 'windows', e)
+            return []
+        self.ledger.resolve(ledger_id, 'windowed', 'windows')
+        
+        # Calcular métricas para cada janela
+        records = []
+        failed_windows = []
+        first_error = None
+        for window in windows:
+            record = {
+                'text_id': text_id,
+                'author': item.author,
+                'title': item.title,
+                'sample_idx': item.sample_idx,
+                'rep': item.rep,
+                'condition': item.condition,
+                'lang': lang,
+                'window_idx': window['idx'],
+                'window_position': window['position'],
+                'window_position_numeric': window['position_numeric'],
+                'window_n_tokens': window['n_tokens']
+            }
             
-            # Calcular métricas para cada janela
-            for window in windows:
-                record = {
-                    'text_id': text_id,
-                    'author': row['author'],
-                    'title': row['title'],
-                    'sample_idx': row['sample_idx'],
-                    'rep': row['rep'],
-                    'condition': row['condition'],
-                    'lang': lang,
-                    'window_idx': window['idx'],
-                    'window_position': window['position'],
-                    'window_position_numeric': window['position_numeric'],
-                    'window_n_tokens': window['n_tokens']
-                }
-                
-                # Calcular métricas básicas para a janela
-                try:
+            # Calcular métricas básicas para a janela
+            try:
+                with span('basic'):
                     basic = BasicMetrics(window['text'], lang=lang)
                     basic_results = basic.run()
-                    for k, v in basic_results.items():
-                        record[k] = v
-                except Exception as e:
-                    print(f"\n⚠️  Erro na janela {window['idx']} de {text_id}: {e}")
-                    for k in ['ttr', 'tokens_per_sentence_mean', 'chars_per_token_mean',
-                             'n_unique_unigrams', 'n_unique_bigrams', 'n_repeated_bigrams',
-                             'n_unique_trigrams', 'n_repeated_trigrams']:
-                        record[k] = np.nan
-                
-                results.append(record)
-        
-        df_windowed = pd.DataFrame(results)
-        print(f"\n✅ Métricas windowed extraídas: {len(df_windowed)} janelas")
-        return df_windowed
+                for k, v in basic_results.items():
+                    record[k] = v
+            except Exception as e:
+                print(f"\n⚠️  Erro na janela {window['idx']} de {text_id}: {e}")
+                failed_windows.append(str(window['idx']))
+                first_error = first_error or e
+                for k in ['ttr', 'tokens_per_sentence_mean', 'chars_per_token_mean',
+                         'n_unique_unigrams', 'n_unique_bigrams', 'n_repeated_bigrams',
+                         'n_unique_trigrams', 'n_repeated_trigrams']:
+                    record[k] = np.nan
+            
+            records.append(record)
+        
+        # Uma entrada por texto, com as janelas que falharam
+        if failed_windows:
+            self.ledger.record(ledger_id, 'windowed', 'basic', first_error,
+                               context=f"janelas {', '.join(failed_windows)}")
+        else:
+            self.ledger.resolve(ledger_id, 'windowed', 'basic')
+        return records
+    
+    def retry_failed(self, skip_windowed: bool = False) -> Optional[Tuple[pd.DataFrame, Optional[pd.DataFrame]]]:
+        """
+        Reprocessa apenas os textos com falha pendente no ledger.
+        
+        As linhas desses textos nos CSVs existentes (all_texts.csv e
+        lexical_windowed.csv) são substituídas pelas recalculadas; o resto é
+        mantido. Etapas que voltam a falhar têm `attempts` incrementado.
+        
+        Returns
+        -------
+        tuple or None
+            (df_full, df_windowed) completos para `save_results`, ou None se
+            não houver falhas pendentes
+        """
+        full_path = self.output_dir / 'full_text' / 'individual' / 'all_texts.csv'
+        windowed_path = self.output_dir / 'windowed' / 'lexical_windowed.csv'
+        if not full_path.exists():
+            raise FileNotFoundError(f"{full_path} não existe: rode a extração completa antes de --retry-failed")
+        
+        full_ids = self.ledger.text_ids('full_text')
+        windowed_ids = set() if skip_windowed else self.ledger.text_ids('windowed')
+        print(f"\n🧾 Falhas pendentes: {len(full_ids)} textos full text, {len(windowed_ids)} textos windowed")
+        if not full_ids and not windowed_ids:
+            print("✅ Nada a reprocessar")
+            return None
+        
+        records = self.collect_all_texts()
+        found = {f"{r.text_id}_{r.condition}": r for r in records}
+        missing = (full_ids | windowed_ids) - set(found)
+        if missing:
+            print(f"⚠️  {len(missing)} textos do ledger não estão mais no corpus (mantidos no ledger)")
+        
+        df_full = pd.read_csv(full_path, dtype={'text_id': str})
+        retry_full = [found[k] for k in sorted(full_ids) if k in found]
+        if retry_full:
+            df_new = self.extract_full_text_metrics(retry_full)
+            df_full = _replace_rows(df_full, df_new, {f"{r.text_id}_{r.condition}" for r in retry_full}, 'full_text')
+        
+        df_windowed = pd.read_csv(windowed_path, dtype={'text_id': str}) if windowed_path.exists() else None
+        retry_windowed = [found[k] for k in sorted(windowed_ids) if k in found]
+        if retry_windowed:
+            df_new = self.extract_windowed_lexical_metrics(retry_windowed)
+            if df_windowed is None:
+                df_windowed = df_new
+            else:
+                keys = {f"{r.text_id}_{r.condition}" for r in retry_windowed}
+                df_windowed = _replace_rows(df_windowed, df_new, keys, 'windowed')
+        close_sources(records)
+        
+        return df_full, df_windowed
     
     def save_results(
         self,
@@ -344,6 +504,56 @@ class MetricsExtractor:
             print(f"  └─ {len(df_windowed)} janelas")
         
         print("\n✅ Todos os resultados salvos!")
+    
+    def report_failures(self) -> None:
+        """Resumo do ledger: falhas pendentes por fase/etapa/exceção."""
+        print("\n" + "="*60)
+        print("FALHAS")
+        print("="*60)
+        print_failure_summary(self.ledger)
+        print(f"✓ Ledger: {self.ledger.path}")
+    
+    def save_profile(self) -> Optional[dict]:
+        """
+        Grava o relatório de instrumentação em `profile/extraction_profile.json`
+        (totais por sub-etapa, textos mais lentos, tokens/s) e imprime um resumo.
+        A instrumentação é desativada no processo em seguida.
+        """
+        if self.instrumentation is None:
+            return None
+        deactivate(self.instrumentation)
+        print("\n" + "="*60)
+        print("PROFILING")
+        print("="*60)
+        output_path = self.profile_dir / 'extraction_profile.json'
+        report = self.instrumentation.save(output_path)
+        print_summary(report)
+        print(f"✓ Relatório de profiling: {output_path}")
+        if report['profile_files']:
+            print(f"✓ Perfis por texto: {self.profile_dir / 'texts'} ({report['profile_files']} arquivos)")
+        return report
+    
+    def memory_stage(self, label: str) -> None:
+        """Marca o início de uma etapa na contabilidade de memória (sem efeito sem `memory`)."""
+        if self.memory_tracker is not None:
+            self.memory_tracker.start(label)
+    
+    def save_memory_profile(self) -> Optional[dict]:
+        """
+        Fecha a última etapa e grava `profile/memory_profile.json` (memória
+        rastreada, crescimento, pico de RSS e principais locais de alocação
+        por etapa).
+        """
+        if self.memory_tracker is None:
+            return None
+        print("\n" + "="*60)
+        print("MEMÓRIA POR ETAPA")
+        print("="*60)
+        output_path = self.profile_dir / 'memory_profile.json'
+        report = self.memory_tracker.save(output_path)
+        print_memory_summary(report)
+        print(f"✓ Relatório de memória: {output_path}")
+        return report
 
 
 def main():
@@ -371,29 +581,100 @@ def main():
         default=100,
         help='Minimum tokens for windowed analysis'
     )
+    parser.add_argument(
+        '--no-index',
+        action='store_true',
+        help='Scan data/ directly instead of building/querying the corpus index'
+    )
+    parser.add_argument(
+        '--index-workers',
+        type=int,
+        default=None,
+        help='Worker processes for building the corpus index (default: CPU count)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Time each extraction sub-stage and write metrics/profile/extraction_profile.json'
+    )
+    parser.add_argument(
+        '--profiler',
+        choices=['cprofile', 'pyinstrument'],
+        default=None,
+        help='Also capture a profile per text (implies --profile)'
+    )
+    parser.add_argument(
+        '--memory',
+        action='store_true',
+        help='Track memory per stage (tracemalloc + peak RSS) into metrics/profile/memory_profile.json'
+    )
+    parser.add_argument(
+        '--parser-url',
+        type=str,
+        default=None,
+        help='UDPipe /process endpoint, e.g. a local udpipe_server.py (default: $UDPIPE_URL or LINDAT)'
+    )
+    parser.add_argument(
+        '--retry-failed',
+        action='store_true',
+        help='Reprocess only the texts listed in metrics/failures.csv and update existing CSVs'
+    )
+    parser.add_argument(
+        '--fast-tokenizer',
+        action='store_true',
+        help='Split-based tokenization for pre-tokenized texts, identical to Punkt/Treebank '
+             '(sets TOKENIZER_FAST_PATH=1; check with tokenizer_agreement.py)'
+    )
     
     args = parser.parse_args()
     
+    if args.fast_tokenizer:
+        # Via ambiente para valer também nos workers do índice
+        os.environ['TOKENIZER_FAST_PATH'] = '1'
+    
     # Inicializar extractor
     extractor = MetricsExtractor(
         data_dir=Path(args.data_dir),
         output_dir=Path(args.output_dir),
-        min_tokens_windowed=args.min_tokens
+        min_tokens_windowed=args.min_tokens,
+        use_index=not args.no_index,
+        index_workers=args.index_workers,
+        profile=args.profile,
+        profiler=args.profiler,
+        memory=args.memory,
+        parser_url=args.parser_url
     )
     
-    # Coletar textos
-    df_texts = extractor.collect_all_texts()
-    
-    # Extrair métricas full text
-    df_full = extractor.extract_full_text_metrics(df_texts)
-    
-    # Extrair métricas windowed
-    df_windowed = None
-    if not args.skip_windowed:
-        df_windowed = extractor.extract_windowed_lexical_metrics(df_texts)
+    if args.retry_failed:
+        # Reprocessar apenas os textos do ledger
+        extractor.memory_stage('retry')
+        retried = extractor.retry_failed(skip_windowed=args.skip_windowed)
+        if retried is None:
+            extractor.save_memory_profile()
+            return
+        df_full, df_windowed = retried
+    else:
+        # Coletar textos (apenas caminhos e metadados; conteúdo lido sob demanda)
+        extractor.memory_stage('collect')
+        records = extractor.collect_all_texts()
+        
+        # Extrair métricas full text
+        extractor.memory_stage('full_text')
+        df_full = extractor.extract_full_text_metrics(records)
+        
+        # Extrair métricas windowed
+        df_windowed = None
+        if not args.skip_windowed:
+            extractor.memory_stage('windowed')
+            df_windowed = extractor.extract_windowed_lexical_metrics(records)
+        close_sources(records)
     
     # Salvar resultados
+    extractor.memory_stage('save')
     extractor.save_results(df_full, df_windowed)
+    extractor.report_failures()
+    extractor.save_profile()
+    extractor.save_memory_profile()
     
     print("\n" + "="*60)
     print("EXTRAÇÃO CONCLUÍDA COM SUCESSO! 🎉")
@@ -0,0 +1,121 @@
+"""
+Registro persistente de falhas da extração (ledger).
+
+Cada falha vira uma linha em `metrics/failures.csv`, identificada por
+(text_id, fase, etapa):
+- text_id: id do texto com a condição (mesmo `text_id` de all_texts.csv)
+- phase: 'full_text' ou 'windowed'
+- stage: 'basic' ou 'syntactic' (em 'windowed', só 'basic')
+- error: classe da exceção; message: mensagem (truncada)
+- attempts: quantas execuções falharam nessa etapa; last_attempt: data/hora
+
+Uma etapa que volta a ter sucesso sai do ledger. Assim, um NaN em uma métrica
+`basic_*`/`synt_*` de um texto listado aqui significa "etapa falhou", e não
+"métrica ausente no texto" (ex.: relação sintática que não ocorre).
+`extract_all_metrics.py --retry-failed` reprocessa apenas os textos do ledger.
+
+Uso:
+    ledger = FailureLedger(Path('metrics/failures.csv'))
+    try:
+        ...
+        ledger.resolve('t1_original', 'full_text', 'syntactic')
+    except Exception as e:
+        ledger.record('t1_original', 'full_text', 'syntactic', e)
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+import pandas as pd
+
+LEDGER_COLUMNS = ['text_id', 'phase', 'stage', 'error', 'message', 'attempts', 'last_attempt']
+
+_MAX_MESSAGE = 300
+
+
+class FailureLedger:
+    """
+    Falhas pendentes por (text_id, fase, etapa), gravadas em CSV a cada mudança.
+
+    Parameters
+    ----------
+    path : Path
+        Arquivo CSV do ledger (lido se existir)
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: Dict[Tuple[str, str, str], Dict] = {}
+        if self.path.exists():
+            df = pd.read_csv(self.path, dtype={'text_id': str, 'message': str}, keep_default_na=False)
+            for row in df.to_dict('records'):
+                row['attempts'] = int(row['attempts'])
+                self.entries[(row['text_id'], row['phase'], row['stage'])] = row
+        self.n_recorded = 0
+        self.n_resolved = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def record(self, text_id: str, phase: str, stage: str, error: BaseException, context: str = '') -> Dict:
+        """
+        Registra (ou incrementa) a falha de `stage` para `text_id`.
+
+        `context` vai no início da mensagem (ex.: janelas que falharam).
+        """
+        key = (text_id, phase, stage)
+        message = ' '.join(str(error).split())
+        message = (f"{context}: {message}" if context else message)[:_MAX_MESSAGE]
+        entry = self.entries.get(key) or {'text_id': text_id, 'phase': phase, 'stage': stage, 'attempts': 0}
+        entry.update({
+            'error': type(error).__name__,
+            'message': message,
+            'attempts': entry['attempts'] + 1,
+            'last_attempt': datetime.now().isoformat(timespec='seconds')
+        })
+        self.entries[key] = entry
+        self.n_recorded += 1
+        self.save()
+        return entry
+
+    def resolve(self, text_id: str, phase: str, stage: str) -> bool:
+        """Remove a falha de `stage` para `text_id` (etapa concluída com sucesso)."""
+        if self.entries.pop((text_id, phase, stage), None) is None:
+            return False
+        self.n_resolved += 1
+        self.save()
+        return True
+
+    def text_ids(self, phase: str) -> Set[str]:
+        """Textos com alguma falha pendente na fase."""
+        return {text_id for (text_id, p, _) in self.entries if p == phase}
+
+    def failed_stages(self, phase: str = 'full_text') -> Dict[str, Set[str]]:
+        """{etapa: textos com falha pendente} na fase."""
+        stages: Dict[str, Set[str]] = {}
+        for (text_id, p, stage) in self.entries:
+            if p == phase:
+                stages.setdefault(stage, set()).add(text_id)
+        return stages
+
+    def to_frame(self) -> pd.DataFrame:
+        rows: List[Dict] = sorted(self.entries.values(), key=lambda e: (e['phase'], e['stage'], e['text_id']))
+        return pd.DataFrame(rows, columns=LEDGER_COLUMNS)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame().to_csv(self.path, index=False)
+
+
+def print_failure_summary(ledger: FailureLedger) -> None:
+    """Falhas pendentes por fase/etapa/exceção (+ o que mudou nesta execução)."""
+    print(f"   • Nesta execução: {ledger.n_recorded} falhas registradas, {ledger.n_resolved} resolvidas")
+    if not ledger.entries:
+        print("   ✓ Nenhuma falha pendente")
+        return
+    df = ledger.to_frame()
+    for (phase, stage, error), group in df.groupby(['phase', 'stage', 'error']):
+        print(f"   ⚠️  {phase}/{stage}: {len(group)} textos com {error} "
+              f"(até {group['attempts'].max()} tentativas)")
+    print("   Reprocessar só essas: python extract_all_metrics.py --retry-failed")
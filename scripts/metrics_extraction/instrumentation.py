@@ -0,0 +1,268 @@
+"""
+Spans de tempo e profiling por texto para a extração de métricas.
+
+Os módulos de extração marcam suas sub-etapas com `span(nome)`. Sem uma
+`Instrumentation` ativa, `span` devolve um contexto vazio reutilizável (custo
+de uma chamada de função). Com uma ativa, cada span acumula tempo sob um
+caminho hierárquico formado pelos spans abertos, por exemplo:
+
+    full_text/basic/pre_lemmatization/punkt   sentenças (Punkt) em BasicMetrics
+    full_text/syntactic/parser   ida e volta ao UDPipe
+    windowed/basic/ngrams        n-gramas de uma janela
+
+Os tempos são inclusivos (o de `full_text/basic` contém o de
+`full_text/basic/pre_lemmatization/punkt`). `text(text_id, fase)` abre o span da fase e
+registra o tempo e os spans de cada texto, para apontar os mais lentos; com
+`profiler='cprofile'` (ou 'pyinstrument', se instalado) cada texto também é
+perfilado em um arquivo próprio.
+
+Uso:
+    instr = Instrumentation(profile_dir=Path('metrics/profile'))
+    with active(instr):
+        with text('t1', 'full_text', n_tokens=800):
+            with span('basic'):
+                ...
+    instr.save(Path('metrics/profile/extraction_profile.json'))
+
+`activate(instr)` / `deactivate(instr)` fazem o mesmo sem bloco `with`.
+"""
+
+import contextlib
+import cProfile
+import json
+import pstats
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+_NULL = contextlib.nullcontext()
+_ACTIVE: Optional['Instrumentation'] = None
+
+
+class Instrumentation:
+    """
+    Acumula spans, tempos por texto e (opcionalmente) perfis por texto.
+
+    Parameters
+    ----------
+    profiler : str, optional
+        'cprofile' ou 'pyinstrument' para perfilar cada texto (padrão: nenhum)
+    profile_dir : Path, optional
+        Diretório dos perfis por texto (obrigatório com `profiler`)
+    n_outliers : int
+        Textos mais lentos listados por fase no relatório
+    """
+
+    def __init__(self, profiler: Optional[str] = None, profile_dir: Optional[Path] = None, n_outliers: int = 10):
+        if profiler is not None and profiler not in PROFILERS:
+            raise ValueError(f"Profiler desconhecido: {profiler} (use {', '.join(PROFILERS)})")
+        if profiler is not None and profile_dir is None:
+            raise ValueError("profile_dir é obrigatório com profiler")
+        if profiler == 'pyinstrument':
+            import pyinstrument  # noqa: F401  (falha cedo se não estiver instalado)
+        self.profiler = profiler
+        self.profile_dir = None if profile_dir is None else Path(profile_dir)
+        self.n_outliers = n_outliers
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.texts: List[Dict] = []
+        self.profile_files: List[str] = []
+        self._stack: List[str] = []
+        self._current: Optional[Dict] = None
+
+    @contextlib.contextmanager
+    def span(self, name: str):
+        """Cronometra um bloco sob o caminho dos spans abertos + `name`."""
+        path = '/'.join(self._stack + [name])
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self.totals[path] += elapsed
+            self.calls[path] += 1
+            if self._current is not None:
+                spans = self._current['spans']
+                spans[path] = spans.get(path, 0.0) + elapsed
+
+    @contextlib.contextmanager
+    def text(self, text_id: str, phase: str, n_tokens: Optional[int] = None):
+        """
+        Processamento de um texto: span `phase` + registro por texto + perfil.
+
+        `n_tokens` pode ser preenchido depois (ex.: após ler o texto) pelo
+        dicionário devolvido no `with`.
+        """
+        record = {'text_id': text_id, 'phase': phase, 'n_tokens': n_tokens, 'seconds': 0.0, 'spans': {}}
+        self._current = record
+        profiler = self._start_profiler()
+        start = time.perf_counter()
+        try:
+            with self.span(phase):
+                yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._stop_profiler(profiler, f"{phase}_{text_id}")
+            self._current = None
+            self.texts.append(record)
+
+    def _start_profiler(self):
+        if self.profiler == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            return profiler
+        if self.profiler == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+        return None
+
+    def _stop_profiler(self, profiler, name: str) -> None:
+        if profiler is None:
+            return
+        out_dir = self.profile_dir / 'texts'
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if self.profiler == 'cprofile':
+            profiler.disable()
+            path = out_dir / f"{name}.prof"
+            profiler.dump_stats(path)
+        else:
+            profiler.stop()
+            path = out_dir / f"{name}.html"
+            path.write_text(profiler.output_html(), encoding='utf-8')
+        self.profile_files.append(str(path))
+
+    def report(self) -> Dict:
+        """
+        Relatório: totais por fase, por span e textos mais lentos.
+
+        Returns
+        -------
+        dict
+            phases: {fase: n_texts, seconds, n_tokens, tokens_per_second,
+            latency_ms {p50, p90, p99, max}}; spans: [{span, calls, seconds,
+            share_of_phase}]; outliers: {fase: [textos mais lentos com os 3
+            spans mais caros]}
+        """
+        phases = {}
+        outliers = {}
+        by_phase: Dict[str, List[Dict]] = defaultdict(list)
+        for record in self.texts:
+            by_phase[record['phase']].append(record)
+
+        for phase, records in by_phase.items():
+            seconds = np.array([r['seconds'] for r in records])
+            tokens = sum(r['n_tokens'] or 0 for r in records)
+            total = float(seconds.sum())
+            phases[phase] = {
+                'n_texts': len(records),
+                'seconds': total,
+                'n_tokens': tokens,
+                'tokens_per_second': tokens / total if total > 0 and tokens else None,
+                'latency_ms': {
+                    'p50': float(np.percentile(seconds, 50) * 1000),
+                    'p90': float(np.percentile(seconds, 90) * 1000),
+                    'p99': float(np.percentile(seconds, 99) * 1000),
+                    'max': float(seconds.max() * 1000)
+                }
+            }
+            slowest = sorted(records, key=lambda r: r['seconds'], reverse=True)[:self.n_outliers]
+            outliers[phase] = [{
+                'text_id': r['text_id'],
+                'seconds': r['seconds'],
+                'n_tokens': r['n_tokens'],
+                'tokens_per_second': r['n_tokens'] / r['seconds'] if r['n_tokens'] and r['seconds'] > 0 else None,
+                'top_spans': dict(sorted(((k, v) for k, v in r['spans'].items() if k != phase),
+                                         key=lambda kv: kv[1], reverse=True)[:3])
+            } for r in slowest]
+
+        spans = []
+        for path in sorted(self.totals):
+            phase_total = self.totals.get(path.split('/')[0], 0.0)
+            spans.append({
+                'span': path,
+                'calls': self.calls[path],
+                'seconds': self.totals[path],
+                'share_of_phase': self.totals[path] / phase_total if phase_total > 0 else None
+            })
+
+        return {'phases': phases, 'spans': spans, 'outliers': outliers,
+                'profiler': self.profiler, 'profile_files': len(self.profile_files)}
+
+    def save(self, path: Path) -> Dict:
+        """Grava o relatório em JSON (e, com cProfile, o perfil somado de todos os textos)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        if self.profiler == 'cprofile' and self.profile_files:
+            combined = path.parent / 'all_texts.prof'
+            pstats.Stats(*self.profile_files).dump_stats(combined)
+            report['combined_profile'] = str(combined)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+
+def activate(instrumentation: Optional[Instrumentation]) -> None:
+    """Define a instrumentação usada por `span`/`text` no processo (None desativa)."""
+    global _ACTIVE
+    _ACTIVE = instrumentation
+
+
+def deactivate(instrumentation: Optional[Instrumentation] = None) -> None:
+    """
+    Desativa a instrumentação do processo.
+
+    Com `instrumentation`, só desativa se ela for a ativa (outra ativada
+    depois continua valendo).
+    """
+    global _ACTIVE
+    if instrumentation is None or _ACTIVE is instrumentation:
+        _ACTIVE = None
+
+
+@contextlib.contextmanager
+def active(instrumentation: Optional[Instrumentation]):
+    """Ativa `instrumentation` dentro do bloco e restaura a anterior ao sair."""
+    global _ACTIVE
+    previous = _ACTIVE
+    _ACTIVE = instrumentation
+    try:
+        yield instrumentation
+    finally:
+        _ACTIVE = previous
+
+
+def get_active() -> Optional[Instrumentation]:
+    return _ACTIVE
+
+
+def span(name: str):
+    """Span na instrumentação ativa (contexto vazio se não houver)."""
+    return _NULL if _ACTIVE is None else _ACTIVE.span(name)
+
+
+def text(text_id: str, phase: str, n_tokens: Optional[int] = None):
+    """Registro de um texto na instrumentação ativa (sem ela, o `with` recebe um dict descartável)."""
+    return contextlib.nullcontext({}) if _ACTIVE is None else _ACTIVE.text(text_id, phase, n_tokens)
+
+
+def print_summary(report: Dict, max_spans: int = 20) -> None:
+    """Resumo legível do relatório (fases e spans mais caros)."""
+    for phase, stats in report['phases'].items():
+        tps = stats['tokens_per_second']
+        print(f"   • {phase}: {stats['n_texts']} textos em {stats['seconds']:.1f}s"
+              + (f" ({tps:,.0f} tokens/s)" if tps else "")
+              + f", p90 {stats['latency_ms']['p90']:.0f} ms")
+    spans = sorted((s for s in report['spans'] if '/' in s['span']), key=lambda s: s['seconds'], reverse=True)
+    for s in spans[:max_spans]:
+        share = f"{100 * s['share_of_phase']:5.1f}%" if s['share_of_phase'] is not None else "    -"
+        print(f"     {s['span']:<40} {s['seconds']:8.2f}s {share}  ({s['calls']} chamadas)")
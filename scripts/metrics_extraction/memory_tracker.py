@@ -0,0 +1,195 @@
+"""
+Contabilidade de memória por etapa (tracemalloc + RSS).
+
+`MemoryTracker` divide uma execução em etapas consecutivas. Ao fechar cada
+etapa registra:
+- memória rastreada pelo Python ao final e pico durante a etapa (tracemalloc)
+- crescimento em relação ao início da etapa
+- RSS atual e pico de RSS durante a etapa
+- locais (arquivo:linha) com mais memória viva e com maior crescimento
+
+O pico de RSS por etapa usa `/proc/self/clear_refs` (Linux) para zerar o
+VmHWM no início de cada etapa; onde isso não é possível, o valor é o pico do
+processo até ali (`peak_rss_resettable = False` no relatório).
+
+tracemalloc deixa a execução mais lenta (tipicamente 1,5–3×); por isso é
+ligado só sob demanda (`--memory` na extração, `memory_profile.py` nas
+análises).
+
+Uso:
+    tracker = MemoryTracker()
+    tracker.start('full_text')
+    ...
+    tracker.start('windowed')     # fecha 'full_text'
+    ...
+    tracker.stop()
+    tracker.save(Path('metrics/profile/memory_profile.json'))
+"""
+
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_MB = 2 ** 20
+
+# Frames de importação, do tracemalloc e deste módulo não interessam como locais de alocação
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+]
+
+
+def _proc_status() -> Dict[str, int]:
+    """VmRSS e VmHWM (bytes) de /proc/self/status; vazio fora do Linux."""
+    values = {}
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    key, value = line.split(':', 1)
+                    values[key] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return values
+
+
+def current_rss() -> Optional[int]:
+    """RSS atual em bytes (None se indisponível)."""
+    return _proc_status().get('VmRSS')
+
+
+def peak_rss() -> int:
+    """Pico de RSS em bytes (desde o início ou desde o último `reset_peak_rss`)."""
+    hwm = _proc_status().get('VmHWM')
+    if hwm is not None:
+        return hwm
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def reset_peak_rss() -> bool:
+    """Zera o VmHWM do processo (Linux). Devolve False se não suportado."""
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryTracker:
+    """
+    Etapas consecutivas com snapshots de memória nas fronteiras.
+
+    Parameters
+    ----------
+    top_n : int
+        Locais de alocação listados por etapa
+    trace : bool
+        Liga o tracemalloc (False = apenas RSS, sem custo extra)
+    frames : int
+        Profundidade do traceback guardado pelo tracemalloc
+    """
+
+    def __init__(self, top_n: int = 10, trace: bool = True, frames: int = 1):
+        self.top_n = top_n
+        self.trace = trace
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.stages: List[Dict] = []
+        self.peak_rss_resettable = True
+        self._label: Optional[str] = None
+        self._start_time = 0.0
+        self._start_traced = 0
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        if not self.trace:
+            return None
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def start(self, label: str) -> None:
+        """Fecha a etapa aberta (se houver) e abre `label`."""
+        self.stop()
+        self._label = label
+        self.peak_rss_resettable = reset_peak_rss() and self.peak_rss_resettable
+        if self.trace:
+            tracemalloc.reset_peak()
+            self._start_traced = tracemalloc.get_traced_memory()[0]
+        self._start_time = time.perf_counter()
+
+    def stop(self) -> Optional[Dict]:
+        """Fecha a etapa aberta e devolve seu registro."""
+        if self._label is None:
+            return None
+        seconds = time.perf_counter() - self._start_time
+        record = {
+            'stage': self._label,
+            'seconds': seconds,
+            'rss_mb': (current_rss() or 0) / _MB,
+            'peak_rss_mb': peak_rss() / _MB
+        }
+        if self.trace:
+            traced, traced_peak = tracemalloc.get_traced_memory()
+            snapshot = self._take_snapshot()
+            record.update({
+                'traced_mb': traced / _MB,
+                'traced_peak_mb': traced_peak / _MB,
+                'growth_mb': (traced - self._start_traced) / _MB,
+                'top_allocations': [
+                    {'site': _site(s), 'size_mb': s.size / _MB, 'count': s.count}
+                    for s in snapshot.statistics('lineno')[:self.top_n]
+                ],
+                'top_growth': [
+                    {'site': _site(s), 'size_diff_mb': s.size_diff / _MB, 'count_diff': s.count_diff}
+                    for s in snapshot.compare_to(self._snapshot, 'lineno')[:self.top_n]
+                    if s.size_diff >= 1024
+                ]
+            })
+            self._snapshot = snapshot
+        self.stages.append(record)
+        self._label = None
+        return record
+
+    def report(self) -> Dict:
+        return {
+            'tracemalloc': self.trace,
+            'peak_rss_resettable': self.peak_rss_resettable,
+            'stages': self.stages
+        }
+
+    def save(self, path: Path, **extra) -> Dict:
+        """Fecha a etapa aberta e grava o relatório (+ campos `extra`) em JSON."""
+        self.stop()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = {**extra, **self.report()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+
+def print_memory_summary(report: Dict, top_sites: int = 3) -> None:
+    """Tabela por etapa (RSS, pico, memória rastreada) + principais locais de crescimento."""
+    peak_label = 'Pico RSS' if report['peak_rss_resettable'] else 'Pico RSS*'
+    print(f"   {'Etapa':<36} {'Tempo':>8} {'RSS':>8} {peak_label:>10} {'Python':>8} {'Δ':>8}")
+    for s in report['stages']:
+        traced = f"{s['traced_mb']:7.1f}M" if 'traced_mb' in s else f"{'-':>8}"
+        growth = f"{s['growth_mb']:+7.1f}M" if 'growth_mb' in s else f"{'-':>8}"
+        print(f"   {s['stage'][:36]:<36} {s['seconds']:7.1f}s {s['rss_mb']:7.0f}M {s['peak_rss_mb']:9.0f}M {traced} {growth}")
+        for site in s.get('top_growth', [])[:top_sites]:
+            print(f"      + {site['size_diff_mb']:7.2f}M  {site['site']}")
+    if not report['peak_rss_resettable']:
+        print("   * pico do processo até o fim da etapa (VmHWM não pôde ser zerado)")
@@ -0,0 +1,210 @@
+"""
+Caminho rápido de tokenização para textos já tokenizados por espaço.
+
+Os originais em `data/original` vêm separados por espaço
+(`“ Here we left it , ” she said .`). Neles, Punkt + Treebank só reencontram
+os tokens que já estão lá, e o `FastPath` devolve a mesma saída sem rodá-los:
+
+- palavras: cada token (separado por espaço) é passado uma vez pelo Treebank
+  instalado, sozinho e no início, meio e fim de uma sentença de teste; a
+  saída de cada posição fica em cache (ex.: `'COMEÇA` → `'`, `COMEÇA`). Uma
+  sentença com algum token cuja saída depende dos vizinhos (`them.` seguido
+  de `”`) vai inteira para o Treebank.
+- sentenças: quebra depois de cada token `.`, `?` ou `!` isolado, que o
+  Punkt sempre trata como fim de sentença, e realinha aspas/parênteses de
+  fechamento com o próprio Punkt. Só os trechos com outros candidatos a fim
+  de sentença (`them.`, `Sr.`, `...`) passam pelo Punkt, que decide por
+  abreviações e contexto ortográfico.
+
+Assim a saída é idêntica à de `nltk.sent_tokenize`/`nltk.word_tokenize` por
+construção; `tokenizer_agreement.py` confere isso por corpus e mede quanto
+do corpus de fato passa pelo caminho rápido.
+
+O caminho rápido continua exato em prosa comum, mas quase tudo volta para
+a referência; por isso só é tentado quando `is_pretokenized` reconhece o
+texto.
+
+Uso (normalmente via `tokenizer_registry`, com `TOKENIZER_FAST_PATH=1`):
+    fast = FastPath(punkt, treebank)
+    if is_pretokenized(text):
+        sentences = fast.split_sentences(text)   # None → usar o Punkt
+        tokens = fast.tokenize(sentences[0])     # None → usar o Treebank
+"""
+
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+# Tokens que o Punkt sempre trata como fim de sentença quando isolados
+SENTENCE_ENDS = frozenset(('.', '?', '!'))
+
+# `.`/`?`/`!` isolado seguido de outro token: quebra certa (a próxima sentença começa em m.end())
+_SENTENCE_BREAK = re.compile(r'(?<!\S)[.?!]\s+(?=\S)')
+
+# Outro candidato a fim de sentença, dentro/no fim de um token ('them.', 'wake.”', '...', 'Yahoo!')
+_SENTENCE_END_RISK = re.compile(r'(?<=\S)[.?!](?!\w)|[.?!](?=[^\w\s])')
+
+# Ponto final de token (+ fechamentos): o Treebank só o separa no fim da
+# sentença, mesmo com outros tokens de fechamento depois ('them. ”')
+_PERIOD_FINAL = re.compile(r'.\.[^\w\s]*$')
+
+# Tokens com pontuação e, entre eles, os com pontuação colada a uma palavra
+# no fim ('said,', 'end.') — marca de texto não tokenizado
+_PUNCTUATION_TOKEN = re.compile(r'\S*[.,;:!?]\S*')
+_ATTACHED = re.compile(r'\w[.,;:!?]+(?!\S)')
+
+# Só letras/dígitos/_: saída do Treebank não depende da posição
+_WORD = re.compile(r'\w+')
+
+# Vizinho usado para testar cada token em cada posição da sentença
+_PROBE = 'x'
+
+# Posições de um token na sentença
+ALONE, START, MIDDLE, END = range(4)
+
+
+def is_pretokenized(text: str, max_attached: float = 0.1, sample: int = 2000) -> bool:
+    """
+    Detecta texto já tokenizado por espaço.
+
+    Considera os tokens com pontuação (`.,;:!?`): em texto tokenizado, quase
+    todos são a pontuação isolada; em prosa comum, quase todos são palavras
+    com pontuação colada (`said,`). Texto sem pontuação conta como tokenizado.
+    Só decide se o caminho rápido vale a pena (a saída é exata de todo modo),
+    então basta olhar o início do texto.
+
+    Parameters
+    ----------
+    text : str
+        Texto ou sentença
+    max_attached : float
+        Fração máxima de tokens com pontuação colada a uma palavra
+    sample : int
+        Caracteres examinados a partir do início
+    """
+    text = text[:sample]
+    n_attached = len(_ATTACHED.findall(text))
+    return n_attached == 0 or n_attached <= max_attached * len(_PUNCTUATION_TOKEN.findall(text))
+
+
+class FastPath:
+    """
+    Tokenização por split com saída idêntica ao Punkt + Treebank instalados.
+
+    Parameters
+    ----------
+    punkt : PunktSentenceTokenizer
+        Tokenizador de sentenças do idioma (mesmo usado na referência)
+    treebank : NLTKWordTokenizer
+        Tokenizador de palavras (mesmo usado na referência)
+
+    Attributes
+    ----------
+    stats : Counter
+        Sentenças e trechos pelo caminho rápido ('*_fast') e devolvidos à
+        referência ('*_fallback')
+    """
+
+    def __init__(self, punkt, treebank):
+        self.punkt = punkt
+        self.treebank = treebank
+        self._token_map: Dict[str, Tuple[Optional[Tuple[str, ...]], ...]] = {}
+        # Tokens que o Treebank devolve intactos em qualquer posição
+        self._unchanged: Set[str] = set()
+        self.stats = Counter()
+        # Uma colocação ('.', próxima palavra) aprendida pelo Punkt desfaria a
+        # quebra depois de '.' isolado; nesse modelo, sentenças sempre pelo Punkt
+        params = getattr(punkt, '_params', None)
+        collocations = getattr(params, 'collocations', ())
+        self.splits_sentences = not any(first == '.' for first, _ in collocations)
+
+    def _probe(self, text: str, before: int, after: int) -> Optional[Tuple[str, ...]]:
+        """Saída do Treebank sem os vizinhos de teste (None se eles foram alterados)."""
+        output = self.treebank.tokenize(text)
+        if output[:before] != [_PROBE] * before or output[len(output) - after:] != [_PROBE] * after:
+            return None
+        return tuple(output[before:len(output) - after])
+
+    def _token_outputs(self, token: str) -> Tuple[Optional[Tuple[str, ...]], ...]:
+        """Saída do Treebank para `token` em cada posição (em cache; None = depende do contexto)."""
+        outputs = self._token_map.get(token)
+        if outputs is None:
+            if token != '.' and _PERIOD_FINAL.search(token):
+                outputs = (None,) * 4
+            elif _WORD.fullmatch(token):
+                outputs = (self._probe(token, 0, 0),) * 4
+            else:
+                outputs = (
+                    self._probe(token, 0, 0),
+                    self._probe(f"{token} {_PROBE}", 0, 1),
+                    self._probe(f"{_PROBE} {token} {_PROBE}", 1, 1),
+                    self._probe(f"{_PROBE} {token}", 1, 0)
+                )
+            self._token_map[token] = outputs
+            if outputs == ((token,),) * 4:
+                self._unchanged.add(token)
+        return outputs
+
+    def _learn_words(self, words: List[str]) -> None:
+        """Testa de uma vez (uma chamada ao Treebank) as palavras simples ainda não vistas."""
+        new = [w for w in set(words) if w not in self._token_map and _WORD.fullmatch(w)]
+        if len(new) > 1 and self.treebank.tokenize(' '.join(new)) == new:
+            # Palavras só com \w não se combinam entre si: todas intactas
+            for word in new:
+                self._token_map[word] = ((word,),) * 4
+            self._unchanged.update(new)
+
+    def tokenize(self, sentence: str) -> Optional[List[str]]:
+        """
+        Tokens da sentença (= Treebank), ou None se algum token depende do contexto.
+
+        `sentence` deve ser uma sentença do Punkt (ou um texto inteiro com
+        `preserve_line`), como na referência.
+        """
+        words = sentence.split()
+        if self._unchanged.issuperset(words):
+            self.stats['sentences_fast'] += 1
+            return words
+        self._learn_words(words)
+        last = len(words) - 1
+        tokens: List[str] = []
+        for i, word in enumerate(words):
+            position = ALONE if last == 0 else START if i == 0 else END if i == last else MIDDLE
+            output = self._token_outputs(word)[position]
+            if output is None:
+                self.stats['sentences_fallback'] += 1
+                return None
+            tokens.extend(output)
+        self.stats['sentences_fast'] += 1
+        return tokens
+
+    def _segment_slices(self, text: str, start: int, stop: int) -> List[slice]:
+        """Fatias (sem realinhamento) de text[start:stop]; trechos com outros candidatos vão ao Punkt."""
+        if not _SENTENCE_END_RISK.search(text, start, stop):
+            self.stats['segments_fast'] += 1
+            return [slice(start, stop)]
+        self.stats['segments_fallback'] += 1
+        return [slice(start + s.start, start + s.stop)
+                for s in self.punkt._slices_from_text(text[start:stop])]
+
+    def split_sentences(self, text: str) -> Optional[List[str]]:
+        """
+        Sentenças do texto (= Punkt), ou None se o modelo Punkt não permite.
+
+        O texto é cortado depois de cada `.`/`?`/`!` isolado. Cada decisão do
+        Punkt depende só do candidato e dos tokens vizinhos, então os trechos
+        entre esses cortes que têm outros candidatos (`Mrs.`, `...`) passam
+        sozinhos pelo Punkt com o mesmo resultado que teriam no texto inteiro.
+        """
+        if not self.splits_sentences:
+            self.stats['texts_fallback'] += 1
+            return None
+        self.stats['texts_fast'] += 1
+        slices: List[slice] = []
+        segment_start = 0
+        for match in _SENTENCE_BREAK.finditer(text):
+            slices.extend(self._segment_slices(text, segment_start, match.start() + 1))
+            segment_start = match.end()
+        slices.extend(self._segment_slices(text, segment_start, len(text.rstrip())))
+        # Aspas/parênteses de fechamento depois do fim voltam para a sentença anterior
+        return [text[s] for s in self.punkt._realign_boundaries(text, iter(slices))]
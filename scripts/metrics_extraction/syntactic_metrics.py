@@ -7,9 +7,23 @@ import os
 import re
 import shlex
 import subprocess
+import sys
 from typing import Dict, List, Optional
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+
+from instrumentation import span
+
+DEFAULT_PARSER_URL = "http://lindat.mff.cuni.cz/services/udpipe/api/process"
+
+
+class ParseError(RuntimeError):
+    """
+    O UDPipe não devolveu uma análise utilizável (falha na chamada, resposta
+    inválida ou CoNLL-U sem sentenças para um texto não vazio).
+    """
+
 
 class SyntacticMetrics:
     """
@@ -25,8 +39,9 @@ class SyntacticMetrics:
         Identificador único do texto (para nomear arquivo CoNLL-U)
     conllu_path : str
         Caminho para salvar arquivos CoNLL-U
-    parser_url : str
-        URL da API UDPipe
+    parser_url : str, optional
+        URL da API UDPipe (padrão: variável de ambiente `UDPIPE_URL` ou o
+        serviço do LINDAT; `udpipe_server.py` sobe um substituto local)
     
     Attributes
     ----------
@@ -35,6 +50,12 @@ class SyntacticMetrics:
     sentence_tree : list
         Árvore de sentenças parseada do CoNLL-U
     
+    Raises
+    ------
+    ParseError
+        Se o parsing falhar; antes, uma falha virava uma árvore vazia e
+        métricas aparentemente válidas (ex.: MDD = 0)
+    
     Métricas calculadas
     -------------------
     - mean_dependency_distance: Distância média de dependência sintática
@@ -54,13 +75,13 @@ class SyntacticMetrics:
         lang: str = 'eng',
         text_id: str = 'text',
         conllu_path: str = 'udpipe_output',
-        parser_url: str = "http://lindat.mff.cuni.cz/services/udpipe/api/process"
+        parser_url: Optional[str] = None
     ):
         self.text = text
         self.lang = lang
         self.text_id = text_id
         self.final_results = {}
-        self.parser_url = parser_url
+        self.parser_url = parser_url or os.environ.get('UDPIPE_URL', DEFAULT_PARSER_URL)
         self.conllu_path = Path(conllu_path)
         
         # Selecionar modelo baseado no idioma
@@ -94,7 +115,8 @@ class SyntacticMetrics:
             )
             
             # Executar comando
-            output = subprocess.check_output(command, shell=True, text=True)
+            with span('parser'):
+                output = subprocess.check_output(command, shell=True, text=True)
             
             # Salvar output
             output_filename = f"{self.text_id}.conllu"
@@ -104,12 +126,14 @@ class SyntacticMetrics:
                 f.write(output)
             
             # Processar output
-            self.process_udpipe_output(output_file_path)
+            with span('conllu'):
+                self.process_udpipe_output(output_file_path)
             
         except subprocess.CalledProcessError as e:
-            print(f"Erro ao processar texto {self.text_id}: {e}")
-            # Inicializar com valores vazios
-            self.sentence_tree = []
+            # Sem o comando na mensagem (contém o texto inteiro)
+            raise ParseError(
+                f"UDPipe falhou para {self.text_id} ({self.parser_url}): código de saída {e.returncode}"
+            ) from e
 
     def process_udpipe_output(self, output_file_path: Path) -> None:
         """
@@ -152,6 +176,9 @@ class SyntacticMetrics:
         if temporary_tree:
             sentence_tree.append(self.process_tree(temporary_tree))
         
+        if not sentence_tree and self.text.strip():
+            raise ParseError(f"CoNLL-U sem sentenças para {self.text_id}: {output_file_path}")
+        
         self.sentence_tree = sentence_tree
 
     def process_tree(self, tree: Dict) -> Dict:
@@ -248,6 +275,10 @@ class SyntacticMetrics:
         dict
             Dicionário com todas as métricas calculadas
         """
+        with span('metrics'):
+            return self._compute_metrics()
+
+    def _compute_metrics(self) -> Dict[str, float]:
         # Distância média de dependência
         mdd = self.mean_dependency_distance()
         self.final_results.update({'mean_dependency_distance': mdd})
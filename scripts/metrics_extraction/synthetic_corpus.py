@@ -0,0 +1,280 @@
+"""
+Corpus sintético determinístico (PT/EN) e parser local para benchmarks.
+
+Textos são gerados a partir de um vocabulário fixo por idioma (palavras
+funcionais reais + pseudo-palavras formadas por sílabas) com frequências
+de Zipf e sentenças de comprimento variável. A mesma semente produz sempre o
+mesmo texto, e o i-ésimo texto não depende da escala pedida: o corpus de
+100k tokens é um prefixo do de 1M.
+
+`synthetic_conllu` é um substituto local do UDPipe: produz CoNLL-U válido e
+determinístico (UPOS por tabela/hash, árvore com raiz no primeiro verbo),
+suficiente para exercitar `SyntacticMetrics` sem rede. Os valores das
+métricas sintáticas obtidos com ele não têm significado linguístico.
+
+Uso:
+    python synthetic_corpus.py --tokens 100k --lang pt --output /tmp/corpus_sintetico
+"""
+
+import argparse
+import re
+import sys
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent))
+
+from instrumentation import span
+from syntactic_metrics import SyntacticMetrics
+
+
+FUNCTION_WORDS = {
+    'pt': {
+        'DET': ['o', 'a', 'os', 'as', 'um', 'uma', 'este', 'essa', 'seu', 'sua'],
+        'ADP': ['de', 'em', 'para', 'com', 'por', 'sem', 'entre', 'até', 'sobre'],
+        'PRON': ['ele', 'ela', 'eu', 'nós', 'você', 'eles', 'quem', 'isso', 'me', 'lhe'],
+        'CCONJ': ['e', 'mas', 'ou', 'nem'],
+        'SCONJ': ['que', 'quando', 'se', 'como', 'porque'],
+        'AUX': ['é', 'foi', 'era', 'tinha', 'está', 'havia'],
+        'ADV': ['não', 'mais', 'muito', 'já', 'também', 'só', 'depois', 'ainda']
+    },
+    'eng': {
+        'DET': ['the', 'a', 'an', 'this', 'that', 'his', 'her', 'their', 'some'],
+        'ADP': ['of', 'in', 'to', 'for', 'with', 'on', 'at', 'from', 'by', 'into'],
+        'PRON': ['he', 'she', 'it', 'they', 'we', 'I', 'you', 'him', 'them', 'who'],
+        'CCONJ': ['and', 'but', 'or', 'nor'],
+        'SCONJ': ['that', 'when', 'if', 'as', 'because'],
+        'AUX': ['is', 'was', 'had', 'were', 'has', 'would'],
+        'ADV': ['not', 'very', 'then', 'now', 'only', 'also', 'still', 'there']
+    }
+}
+
+SYLLABLES = {
+    'pt': ['ca', 'me', 'ti', 'lo', 'sa', 'ra', 'ção', 'ne', 'di', 'pu', 'vo', 'ga',
+           'lhe', 'nho', 'ma', 'te', 're', 'são', 'cu', 'fi', 'bra', 'tro', 'mão', 'des'],
+    'eng': ['ing', 'er', 'in', 'the', 'ar', 'on', 'ly', 'ed', 'ment', 'al', 'ter', 'ow',
+            'ea', 'st', 'ble', 'ro', 'wa', 'ness', 'ch', 'ful', 'sh', 'ight', 'con', 'pre']
+}
+
+CONTENT_TAGS = ['NOUN', 'VERB', 'ADJ', 'ADV']
+CONTENT_WEIGHTS = [0.45, 0.3, 0.15, 0.1]
+
+# Relação sintática atribuída a cada UPOS pelo parser local
+UPOS_DEPREL = {
+    'DET': 'det', 'ADP': 'case', 'PRON': 'nsubj', 'CCONJ': 'cc', 'SCONJ': 'mark',
+    'AUX': 'aux', 'ADV': 'advmod', 'NOUN': 'obj', 'ADJ': 'amod', 'VERB': 'conj',
+    'PUNCT': 'punct'
+}
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+LANG_CODES = {'pt': 1, 'eng': 2}
+LANG_AUTHORS = {'pt': 'wikipedia_pt', 'eng': 'wikipedia_eng'}
+
+
+def parse_scale(value: str) -> int:
+    """Converte '1k', '2.5M', '10000' em número de tokens."""
+    value = str(value).strip().lower()
+    factor = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    number = value[:-1] if factor > 1 else value
+    return int(float(number) * factor)
+
+
+def format_scale(n_tokens: int) -> str:
+    """Inverso de `parse_scale` para escalas redondas (10000 → '10k')."""
+    for suffix, factor in (('M', 1_000_000), ('k', 1_000)):
+        if n_tokens >= factor and n_tokens % factor == 0:
+            return f"{n_tokens // factor}{suffix}"
+    return str(n_tokens)
+
+
+class SyntheticCorpus:
+    """
+    Gerador de textos sintéticos de um idioma.
+
+    Parameters
+    ----------
+    lang : str
+        'pt' ou 'eng'
+    seed : int
+        Semente (mesma semente = mesmos textos)
+    vocab_size : int
+        Número de pseudo-palavras de conteúdo
+    zipf_exponent : float
+        Expoente da distribuição de frequências
+    """
+
+    def __init__(self, lang: str = 'eng', seed: int = 42, vocab_size: int = 5000, zipf_exponent: float = 1.1):
+        if lang not in FUNCTION_WORDS:
+            raise ValueError(f"Idioma desconhecido: {lang} (use {', '.join(FUNCTION_WORDS)})")
+        self.lang = lang
+        self.seed = seed
+        rng = np.random.default_rng([seed, LANG_CODES[lang]])
+
+        function_words = [w for words in FUNCTION_WORDS[lang].values() for w in words]
+        syllables = SYLLABLES[lang]
+        content = []
+        seen = set(function_words)
+        while len(content) < vocab_size:
+            n_syl = rng.integers(1, 5)
+            word = ''.join(syllables[i] for i in rng.integers(0, len(syllables), n_syl))
+            if word not in seen:
+                seen.add(word)
+                content.append(word)
+
+        # Palavras funcionais nas primeiras posições (mais frequentes)
+        self.vocab = np.array(function_words + content, dtype=object)
+        ranks = np.arange(1, len(self.vocab) + 1)
+        weights = 1.0 / ranks ** zipf_exponent
+        self.probabilities = weights / weights.sum()
+
+    def text(self, index: int, n_tokens: int) -> str:
+        """
+        Texto `index` com `n_tokens` palavras (pontuação não conta).
+
+        Sentenças de 4 a 30 palavras, vírgulas ocasionais e ponto final.
+        """
+        rng = np.random.default_rng([self.seed, LANG_CODES[self.lang], index])
+        words = rng.choice(self.vocab, size=n_tokens, p=self.probabilities)
+        commas = rng.random(n_tokens) < 0.06
+        sentences = []
+        start = 0
+        while start < n_tokens:
+            length = int(rng.integers(4, 31))
+            chunk = [w + ',' if c else w for w, c in zip(words[start:start + length], commas[start:start + length])]
+            chunk[-1] = chunk[-1].rstrip(',') + '.'
+            chunk[0] = chunk[0][:1].upper() + chunk[0][1:]
+            sentences.append(' '.join(chunk))
+            start += length
+        return ' '.join(sentences)
+
+    def texts(self, total_tokens: int, text_tokens: int = 500) -> Iterator[Tuple[str, str]]:
+        """
+        Gera (text_id, texto) até somar `total_tokens` palavras.
+
+        Todos os textos têm `text_tokens` palavras, exceto o último (resto).
+        """
+        index = 0
+        remaining = total_tokens
+        while remaining > 0:
+            n = min(text_tokens, remaining)
+            yield f"synthetic_{self.lang}__s{index}", self.text(index, n)
+            remaining -= n
+            index += 1
+
+
+def write_corpus(
+    output_dir: Path,
+    total_tokens: int,
+    langs: List[str],
+    text_tokens: int = 500,
+    seed: int = 42
+) -> Dict[str, int]:
+    """
+    Grava o corpus no layout de `corpus_reader` (`data/original/{autor}/*.txt`).
+
+    O autor de cada idioma (`wikipedia_pt`, `wikipedia_eng`) faz o idioma ser
+    inferido corretamente por `parse_text_path`.
+
+    Returns
+    -------
+    dict
+        Número de textos gravados por idioma
+    """
+    counts = {}
+    for lang in langs:
+        author_dir = Path(output_dir) / 'data' / 'original' / LANG_AUTHORS[lang]
+        author_dir.mkdir(parents=True, exist_ok=True)
+        counts[lang] = 0
+        for text_id, text in SyntheticCorpus(lang, seed).texts(total_tokens, text_tokens):
+            (author_dir / f"{text_id}.txt").write_text(text, encoding='utf-8')
+            counts[lang] += 1
+    return counts
+
+
+def _upos(token: str, lang: str) -> str:
+    """UPOS determinístico: tabela de palavras funcionais, senão hash do token."""
+    if not token[0].isalnum():
+        return 'PUNCT'
+    lower = token.lower()
+    for tag, words in FUNCTION_WORDS[lang].items():
+        if lower in words:
+            return tag
+    h = zlib.crc32(lower.encode('utf-8')) % 100
+    cumulative = 0
+    for tag, weight in zip(CONTENT_TAGS, CONTENT_WEIGHTS):
+        cumulative += weight * 100
+        if h < cumulative:
+            return tag
+    return CONTENT_TAGS[-1]
+
+
+def synthetic_conllu(text: str, lang: str = 'eng') -> str:
+    """
+    Parse CoNLL-U determinístico de `text` (substituto local do UDPipe).
+
+    Sentenças terminam em . ! ?; tokens são palavras ou pontuação isolada.
+    A raiz é o primeiro verbo (ou o primeiro token); palavras funcionais
+    e adjetivos se ligam à palavra seguinte, pontuação e conteúdo à raiz.
+    """
+    lines = []
+    for s, sentence in enumerate(SENTENCE_PATTERN.split(text.strip()), 1):
+        tokens = TOKEN_PATTERN.findall(sentence)
+        if not tokens:
+            continue
+        tags = [_upos(t, lang) for t in tokens]
+        root = next((i for i, tag in enumerate(tags) if tag == 'VERB'), 0) + 1
+        lines.append(f"# sent_id = {s}")
+        lines.append(f"# text = {sentence}")
+        for i, (token, tag) in enumerate(zip(tokens, tags), 1):
+            if i == root:
+                head, deprel = 0, 'root'
+            elif tag in ('DET', 'ADP', 'ADJ', 'CCONJ', 'SCONJ', 'AUX') and i < len(tokens):
+                head, deprel = i + 1, UPOS_DEPREL[tag]
+            else:
+                head, deprel = root, UPOS_DEPREL[tag]
+            lines.append(f"{i}\t{token}\t{token.lower()}\t{tag}\t_\t_\t{head}\t{deprel}\t_\t_")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+class LocalSyntacticMetrics(SyntacticMetrics):
+    """
+    `SyntacticMetrics` com o parser local no lugar da API UDPipe.
+
+    Grava e relê o CoNLL-U como a classe original, então o custo medido
+    inclui E/S e parsing do CoNLL-U; só a ida à rede é substituída.
+    """
+
+    def collect_udpipe_output(self) -> None:
+        output_file_path = self.conllu_path / f"{self.text_id}.conllu"
+        with span('parser'):
+            output = synthetic_conllu(self.text, self.lang)
+        with open(output_file_path, "w", encoding="utf-8") as f:
+            f.write(output)
+        with span('conllu'):
+            self.process_udpipe_output(output_file_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a deterministic synthetic corpus in the data/original layout')
+    parser.add_argument('--tokens', type=str, default='100k', help='Tokens per language, e.g. 1k, 10M (default: 100k)')
+    parser.add_argument('--lang', nargs='+', choices=list(FUNCTION_WORDS), default=['pt', 'eng'],
+                        help='Languages (default: pt eng)')
+    parser.add_argument('--text-tokens', type=int, default=500, help='Tokens per text (default: 500)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--output', type=str, required=True, help='Output directory (receives data/original/)')
+
+    args = parser.parse_args()
+
+    total = parse_scale(args.tokens)
+    counts = write_corpus(Path(args.output), total, args.lang, args.text_tokens, args.seed)
+    for lang, n in counts.items():
+        print(f"✓ {lang}: {n} textos, {total} tokens → {Path(args.output) / 'data' / 'original' / LANG_AUTHORS[lang]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -131,7 +131,7 @@ def test_syntactic_metrics():
         
     except Exception as e:
         print(f"\n❌ Erro ao testar métricas sintáticas: {e}")
-        print("    Verifique conexão com API UDPipe")
+        print("    Verifique conexão com API UDPipe (ou UDPIPE_URL com udpipe_server.py)")
         return False
 
 
@@ -0,0 +1,205 @@
+"""
+Relatório de concordância do caminho rápido de tokenização, por corpus.
+
+Para cada texto, compara o caminho rápido (`pretokenized.FastPath`, via
+`tokenizer_registry`) com a referência Punkt + Treebank, exatamente como a
+extração usa os tokenizadores:
+- sentenças: `sent_tokenize(texto)`
+- tokens por sentença: `word_tokenize(sentença)` (métricas básicas)
+- tokens do texto inteiro: `word_tokenize(texto)` (janelas, validação)
+
+Por corpus (condição × autor) o relatório traz:
+- pct_pretokenized: textos reconhecidos como pré-tokenizados
+- pct_segments_fast / pct_sentences_fast: quanto foi resolvido sem Punkt /
+  sem Treebank (o resto voltou para a referência)
+- sentence_agreement / token_agreement: % de textos com saída idêntica
+- split_agreement: % de textos em que um `str.split()` puro já daria os
+  tokens da referência (mostra o que o caminho rápido evita errar)
+- ref_seconds / fast_seconds: tempo das duas versões
+
+`safe` = concordância de 100% em sentenças e tokens. Sai com código 1 se
+algum corpus divergir.
+
+Uso:
+    python tokenizer_agreement.py [--data-dir ../..] [--conditions original]
+        [--output ../../metrics/tokenizer_agreement.csv]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent))
+
+from corpus_reader import iter_corpus
+from pretokenized import is_pretokenized
+from tokenizer_registry import get_tokenizers
+
+BASE_DIR = Path(__file__).parent.parent.parent
+
+
+def _tokenize_all(tokenizers, text: str):
+    sentences = tokenizers.sent_tokenize(text)
+    per_sentence = [tokenizers.word_tokenize(sent) for sent in sentences]
+    return sentences, per_sentence, tokenizers.word_tokenize(text)
+
+
+def compare_text(text: str, lang: str) -> Dict:
+    """
+    Compara caminho rápido e referência em um texto.
+
+    Returns
+    -------
+    dict
+        Concordâncias, contadores do caminho rápido e tempos
+    """
+    reference = get_tokenizers(lang, fast_path=False)
+    if reference.fallback:
+        raise LookupError(f"Resource punkt ({reference.language}) not found (NLTK_OFFLINE=1 fallback)")
+    fast = get_tokenizers(lang, fast_path=True)
+    stats_before = Counter(fast.fast_path.stats)
+
+    start = time.perf_counter()
+    ref_sentences, ref_per_sentence, ref_tokens = _tokenize_all(reference, text)
+    ref_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast_sentences, fast_per_sentence, fast_tokens = _tokenize_all(fast, text)
+    fast_seconds = time.perf_counter() - start
+
+    stats = Counter(fast.fast_path.stats)
+    stats.subtract(stats_before)
+    return {
+        'pretokenized': is_pretokenized(text),
+        'sentences_equal': ref_sentences == fast_sentences,
+        'tokens_equal': ref_per_sentence == fast_per_sentence and ref_tokens == fast_tokens,
+        'split_equal': text.split() == ref_tokens,
+        'segments_fast': stats['segments_fast'],
+        'segments_fallback': stats['segments_fallback'],
+        'sentences_fast': stats['sentences_fast'],
+        'sentences_fallback': stats['sentences_fallback'],
+        'ref_seconds': ref_seconds,
+        'fast_seconds': fast_seconds
+    }
+
+
+def _pct(part: float, total: float) -> float:
+    return 100 * part / total if total else 100.0
+
+
+def agreement_report(
+    data_dir: Path,
+    conditions: Optional[List[str]] = None,
+    max_texts: int = 0
+) -> pd.DataFrame:
+    """
+    Concordância por corpus (condição × autor).
+
+    Parameters
+    ----------
+    data_dir : Path
+        Diretório que contém a pasta `data/`
+    conditions : list of str, optional
+        Condições a examinar (padrão: todas)
+    max_texts : int
+        Máximo de textos por corpus (0 = todos)
+    """
+    rows = []
+    seen = Counter()
+    for record in iter_corpus(data_dir, conditions):
+        key = (record.condition, record.author)
+        if max_texts and seen[key] >= max_texts:
+            continue
+        seen[key] += 1
+        result = compare_text(record.text, record.lang)
+        rows.append({'condition': record.condition, 'author': record.author,
+                     'text_id': record.text_id, **result})
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+
+    corpora = []
+    for (condition, author), group in df.groupby(['condition', 'author'], sort=False):
+        mismatches = group.loc[~(group['sentences_equal'] & group['tokens_equal']), 'text_id']
+        segments = group['segments_fast'].sum() + group['segments_fallback'].sum()
+        sentences = group['sentences_fast'].sum() + group['sentences_fallback'].sum()
+        corpora.append({
+            'condition': condition,
+            'author': author,
+            'n_texts': len(group),
+            'pct_pretokenized': _pct(group['pretokenized'].sum(), len(group)),
+            'pct_segments_fast': _pct(group['segments_fast'].sum(), segments),
+            'pct_sentences_fast': _pct(group['sentences_fast'].sum(), sentences),
+            'sentence_agreement': _pct(group['sentences_equal'].sum(), len(group)),
+            'token_agreement': _pct(group['tokens_equal'].sum(), len(group)),
+            'split_agreement': _pct(group['split_equal'].sum(), len(group)),
+            'ref_seconds': group['ref_seconds'].sum(),
+            'fast_seconds': group['fast_seconds'].sum(),
+            'safe': mismatches.empty,
+            'first_mismatch': mismatches.iloc[0] if not mismatches.empty else ''
+        })
+    return pd.DataFrame(corpora)
+
+
+def print_agreement(report: pd.DataFrame) -> None:
+    print(f"   {'Corpus':<36} {'Textos':>6} {'Pré-tok':>8} {'Rápido':>7} {'Sent.':>7} {'Tokens':>7} {'split':>7} {'Ganho':>6}")
+    for row in report.itertuples():
+        speedup = row.ref_seconds / row.fast_seconds if row.fast_seconds else float('nan')
+        flag = '✓' if row.safe else '⚠️'
+        print(f" {flag} {row.condition + '/' + row.author:<36} {row.n_texts:>6} "
+              f"{row.pct_pretokenized:7.0f}% {row.pct_sentences_fast:6.0f}% "
+              f"{row.sentence_agreement:6.1f}% {row.token_agreement:6.1f}% "
+              f"{row.split_agreement:6.1f}% {speedup:5.1f}×")
+    print("   Rápido = sentenças tokenizadas sem Treebank; split = str.split() puro igual à referência")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the pre-tokenized fast path against Punkt/Treebank, per corpus')
+    parser.add_argument('--data-dir', type=str, default=str(BASE_DIR),
+                        help='Directory containing data/ folder')
+    parser.add_argument('--conditions', nargs='+', default=None,
+                        help='Conditions to check (default: all), e.g. original baseline')
+    parser.add_argument('--max-texts', type=int, default=0,
+                        help='Maximum texts per corpus (default: all)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Report CSV (default: {data-dir}/metrics/tokenizer_agreement.csv)')
+
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    output = Path(args.output) if args.output else data_dir / 'metrics' / 'tokenizer_agreement.csv'
+
+    print("=" * 70)
+    print("CONCORDÂNCIA DO CAMINHO RÁPIDO DE TOKENIZAÇÃO")
+    print("=" * 70)
+    try:
+        report = agreement_report(data_dir, args.conditions, args.max_texts)
+    except LookupError as e:
+        reason = next((line.strip() for line in str(e).splitlines() if 'Resource' in line), str(e).strip())
+        print(f"❌ Modelo Punkt indisponível (a referência precisa dele): {reason}")
+        sys.exit(1)
+    if report.empty:
+        print("⚠️  Nenhum texto encontrado")
+        sys.exit(1)
+
+    print_agreement(report)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    report.to_csv(output, index=False)
+    print(f"\n✓ Relatório: {output}")
+
+    unsafe = report[~report['safe']]
+    if not unsafe.empty:
+        print(f"⚠️  {len(unsafe)} corpora divergem da referência; não use TOKENIZER_FAST_PATH neles")
+        for row in unsafe.itertuples():
+            print(f"   • {row.condition}/{row.author}: ex. {row.first_mismatch}")
+        sys.exit(1)
+    print("✅ Caminho rápido idêntico à referência em todos os corpora")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Registro de tokenizadores por idioma (um conjunto por processo).
+
+`nltk.sent_tokenize`/`nltk.word_tokenize` resolvem o modelo Punkt pelo nome
+do idioma a cada chamada, e a extração chama os dois por sentença. Aqui o
+Punkt de cada idioma e o tokenizador de palavras (Treebank melhorado do NLTK)
+são carregados uma vez e reutilizados por `BasicMetrics`, `WindowedAnalysis`
+e `validate_text_for_windowed_analysis`.
+
+A saída é idêntica à das funções do NLTK: `word_tokenize` segmenta em
+sentenças com o Punkt do idioma e aplica o Treebank a cada uma.
+
+Com `TOKENIZER_FAST_PATH=1`, textos já tokenizados por espaço passam pelo
+caminho rápido de `pretokenized.py` (mesma saída, sem rodar Punkt/Treebank
+onde não é preciso). A variável é lida ao carregar os tokenizadores e vale
+também para processos filhos.
+
+Sem o modelo Punkt, o registro segue `NLTK_OFFLINE` (ver `basic_metrics`):
+com `1`, o idioma passa a usar `FallbackTokenizers` (texto inteiro como uma
+sentença, tokens por espaço), o mesmo fallback das métricas básicas, e o
+Punkt não é procurado de novo no processo; sem a variável ou com `strict`,
+`get_tokenizers` levanta LookupError.
+
+Uso:
+    tokenizers = get_tokenizers('pt')
+    for sent in tokenizers.sent_tokenize(text):
+        tokens = tokenizers.word_tokenize(sent)
+
+    # Carregar antes do primeiro texto em cada worker
+    ProcessPoolExecutor(initializer=load_tokenizers, initargs=(('pt', 'eng'),))
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import nltk
+from nltk.tokenize import NLTKWordTokenizer
+
+try:
+    from nltk.tokenize.punkt import PunktTokenizer
+except ImportError:  # NLTK < 3.8.2: modelos em pickle
+    PunktTokenizer = None
+
+sys.path.append(str(Path(__file__).parent))
+from pretokenized import FastPath, is_pretokenized
+
+# Código do corpus → nome do idioma no NLTK
+LANGUAGES = {'pt': 'portuguese', 'eng': 'english'}
+
+
+def offline_mode() -> str:
+    """'' (downloads permitidos), 'fallback' ou 'strict', conforme `NLTK_OFFLINE`."""
+    value = os.environ.get('NLTK_OFFLINE', '').strip().lower()
+    if value == 'strict':
+        return 'strict'
+    return 'fallback' if value not in ('', '0', 'false', 'no') else ''
+
+
+def fast_path_enabled() -> bool:
+    """Caminho rápido para texto pré-tokenizado ligado (`TOKENIZER_FAST_PATH`)."""
+    return os.environ.get('TOKENIZER_FAST_PATH', '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+def nltk_language(lang: str) -> str:
+    """'pt'/'eng' → 'portuguese'/'english' (nomes do NLTK passam direto)."""
+    return LANGUAGES.get(lang, lang)
+
+
+class LanguageTokenizers:
+    """
+    Punkt + tokenizador de palavras de um idioma.
+
+    Parameters
+    ----------
+    language : str
+        Idioma no NLTK ('portuguese', 'english')
+    fast_path : bool
+        Usa `FastPath` em textos pré-tokenizados (saída idêntica)
+
+    Raises
+    ------
+    LookupError
+        Modelo Punkt do idioma não instalado
+    """
+
+    fallback = False
+
+    def __init__(self, language: str, fast_path: bool = False):
+        self.language = language
+        if PunktTokenizer is not None:
+            self.sentences = PunktTokenizer(language)
+        else:
+            self.sentences = nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+        self.words = NLTKWordTokenizer()
+        self.fast_path = FastPath(self.sentences, self.words) if fast_path else None
+
+    @property
+    def mode(self) -> str:
+        """Tokenização em uso: 'punkt' ou 'punkt_fast' (caminho rápido ligado)."""
+        return 'punkt' if self.fast_path is None else 'punkt_fast'
+
+    def _use_fast_path(self, text: str) -> bool:
+        return self.fast_path is not None and is_pretokenized(text)
+
+    def _split(self, text: str, fast: bool) -> List[str]:
+        sentences = self.fast_path.split_sentences(text) if fast else None
+        return self.sentences.tokenize(text) if sentences is None else sentences
+
+    def sent_tokenize(self, text: str) -> List[str]:
+        """Equivalente a `nltk.sent_tokenize(text, language)`."""
+        return self._split(text, self._use_fast_path(text))
+
+    def word_tokenize(self, text: str, preserve_line: bool = False) -> List[str]:
+        """Equivalente a `nltk.word_tokenize(text, language, preserve_line)`."""
+        fast = self._use_fast_path(text)
+        sentences = [text] if preserve_line else self._split(text, fast)
+        if not fast:
+            return [token for sent in sentences for token in self.words.tokenize(sent)]
+        tokens = []
+        for sent in sentences:
+            sent_tokens = self.fast_path.tokenize(sent)
+            tokens.extend(self.words.tokenize(sent) if sent_tokens is None else sent_tokens)
+        return tokens
+
+
+class FallbackTokenizers:
+    """
+    Tokenização sem Punkt (`NLTK_OFFLINE=1`): texto inteiro como uma
+    sentença, tokens por espaço. Mesma interface de `LanguageTokenizers`.
+    """
+
+    fallback = True
+    fast_path = None
+    mode = 'split'
+
+    def __init__(self, language: str):
+        self.language = language
+
+    def sent_tokenize(self, text: str) -> List[str]:
+        return [text]
+
+    def word_tokenize(self, text: str, preserve_line: bool = False) -> List[str]:
+        return text.split()
+
+
+_REGISTRY: Dict[Tuple[str, bool], Union[LanguageTokenizers, FallbackTokenizers]] = {}
+
+
+def get_tokenizers(lang: str, fast_path: Optional[bool] = None) -> Union[LanguageTokenizers, FallbackTokenizers]:
+    """
+    Tokenizadores do idioma, carregados no primeiro pedido do processo.
+
+    Aceita o código do corpus ('pt', 'eng') ou o nome do NLTK ('portuguese').
+    `fast_path=None` segue `TOKENIZER_FAST_PATH`. Sem Punkt e com
+    `NLTK_OFFLINE=1`, registra e devolve `FallbackTokenizers` (avisa uma
+    vez); nos demais modos a falha (LookupError) não fica registrada.
+    """
+    key = (nltk_language(lang), fast_path_enabled() if fast_path is None else fast_path)
+    tokenizers = _REGISTRY.get(key)
+    if tokenizers is None:
+        try:
+            tokenizers = LanguageTokenizers(*key)
+        except LookupError:
+            if offline_mode() != 'fallback':
+                raise
+            if not any(t.fallback and t.language == key[0] for t in _REGISTRY.values()):
+                print(f"⚠️  Punkt ({key[0]}) indisponível com NLTK_OFFLINE=1: tokenização por espaço")
+            tokenizers = FallbackTokenizers(key[0])
+        _REGISTRY[key] = tokenizers
+    return tokenizers
+
+
+def sent_tokenize(text: str, lang: str) -> List[str]:
+    return get_tokenizers(lang).sent_tokenize(text)
+
+
+def word_tokenize(text: str, lang: str, preserve_line: bool = False) -> List[str]:
+    return get_tokenizers(lang).word_tokenize(text, preserve_line)
+
+
+def load_tokenizers(langs: Iterable[str] = ('pt', 'eng')) -> Dict[str, bool]:
+    """
+    Carrega os tokenizadores de cada idioma; serve de `initializer` de pools.
+
+    Returns
+    -------
+    dict
+        {idioma: carregado} — False se o modelo Punkt não estiver instalado
+        (inclusive quando o idioma caiu em `FallbackTokenizers`)
+    """
+    loaded = {}
+    for lang in langs:
+        try:
+            loaded[lang] = not get_tokenizers(lang).fallback
+        except LookupError:
+            loaded[lang] = False
+    return loaded
+
+
+def loaded_languages() -> List[str]:
+    """Idiomas com Punkt já carregado neste processo."""
+    return sorted({language for (language, _), t in _REGISTRY.items() if not t.fallback})
@@ -0,0 +1,365 @@
+"""
+Servidor local compatível com a API REST do UDPipe (`/process`), para testes
+e benchmarks sem rede.
+
+Aceita os mesmos parâmetros que `SyntacticMetrics` envia (`data`, `model`,
+`tokenizer`, `tagger`, `parser`; multipart, urlencoded ou query string) e
+responde no mesmo formato do serviço real: JSON com `model`,
+`acknowledgements` e `result` (CoNLL-U). Para cada texto:
+
+1. se `--cache-dir` tiver `{sha1 do texto}.conllu`, devolve esse CoNLL-U
+   (parses reais gravados de uma extração anterior, ver subcomando `cache`)
+2. senão, sintetiza um parse determinístico com `synthetic_conllu`
+   (valores sem significado linguístico)
+
+Sem `tagger`, as colunas LEMMA/UPOS/XPOS/FEATS vêm como `_`; sem `parser`,
+HEAD/DEPREL. Para exercitar concorrência e retentativas é possível injetar
+latência (`--latency-ms`, `--jitter-ms`) e erros (`--error-rate`: fração
+das requisições; `--fail-first N`: as N primeiras requisições de cada
+texto). Erros respondem com `--error-status` (padrão 503) e corpo em texto,
+como o serviço real, e viram `ParseError` em `SyntacticMetrics`.
+
+`GET /models` lista os modelos; `GET /stats` devolve contadores.
+
+Uso:
+    python udpipe_server.py serve [--port 8001] [--cache-dir metrics/udpipe_cache] [--latency-ms 50] [--error-rate 0.05]
+    python extract_all_metrics.py --parser-url http://127.0.0.1:8001/process
+    UDPIPE_URL=http://127.0.0.1:8001/process python test_modules.py
+
+    # Cache de replay a partir dos CoNLL-U de uma extração (chave: hash do texto)
+    python udpipe_server.py cache --data-dir ../.. --conllu-dir ../../metrics/udpipe_output --cache-dir ../../metrics/udpipe_cache
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import random
+import shutil
+import sys
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+sys.path.append(str(Path(__file__).parent))
+
+from synthetic_corpus import synthetic_conllu
+
+MODELS = {
+    'portuguese-petrogold-ud-2.12-230717': 'pt',
+    'english-gum-ud-2.12-230717': 'eng'
+}
+DEFAULT_MODEL = 'english-gum-ud-2.12-230717'
+ACKNOWLEDGEMENTS = ['http://ufal.mff.cuni.cz/udpipe/2#udpipe2_acknowledgements']
+
+# Colunas CoNLL-U zeradas quando o componente está desligado
+TAGGER_COLUMNS = (2, 3, 4, 5)
+PARSER_COLUMNS = (6, 7)
+
+
+def text_key(text: str) -> str:
+    """Chave do cache: SHA-1 do texto sem espaços nas pontas (o `echo` do cliente acrescenta '\\n')."""
+    return hashlib.sha1(text.strip().encode('utf-8')).hexdigest()
+
+
+def resolve_model(name: Optional[str]) -> Tuple[str, str]:
+    """
+    (modelo, idioma) para o nome pedido. Como no UDPipe, aceita prefixos
+    ('portuguese', 'english-gum'); ausente usa o modelo padrão.
+    """
+    if not name:
+        return DEFAULT_MODEL, MODELS[DEFAULT_MODEL]
+    for model, lang in MODELS.items():
+        if model.startswith(name):
+            return model, lang
+    raise ValueError(f"Unknown model '{name}'")
+
+
+def blank_columns(conllu: str, columns) -> str:
+    """Substitui as colunas indicadas por `_` nas linhas de tokens."""
+    lines = []
+    for line in conllu.split('\n'):
+        fields = line.split('\t')
+        if len(fields) == 10:
+            for c in columns:
+                fields[c] = '_'
+            line = '\t'.join(fields)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def _parse_params(handler: BaseHTTPRequestHandler) -> Dict[str, str]:
+    """Parâmetros da requisição (query string + corpo multipart/urlencoded)."""
+    params = {k: v[0] for k, v in parse_qs(urlparse(handler.path).query, keep_blank_values=True).items()}
+    length = int(handler.headers.get('Content-Length') or 0)
+    if not length:
+        return params
+    body = handler.rfile.read(length)
+    content_type = handler.headers.get('Content-Type', '')
+    if content_type.startswith('multipart/form-data'):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('latin-1') + body
+        )
+        for part in message.iter_parts():
+            name = part.get_param('name', header='content-disposition')
+            if name:
+                params[name] = (part.get_payload(decode=True) or b'').decode('utf-8')
+    else:
+        params.update({k: v[0] for k, v in parse_qs(body.decode('utf-8'), keep_blank_values=True).items()})
+    return params
+
+
+class UDPipeStandIn(ThreadingHTTPServer):
+    """
+    Servidor `/process` com replay por hash, parse sintético e falhas injetadas.
+
+    Parameters
+    ----------
+    address : tuple
+        (host, porta); porta 0 escolhe uma livre (ver `url`)
+    cache_dir : Path, optional
+        Diretório com `{sha1}.conllu` para replay
+    latency_ms, jitter_ms : float
+        Atraso por requisição: latency_ms ± jitter_ms (uniforme)
+    error_rate : float
+        Fração das requisições que falham (sorteio com `seed`)
+    fail_first : int
+        Número de requisições iniciais que falham para cada texto
+    error_status : int
+        Status HTTP das falhas injetadas
+    seed : int
+        Semente do sorteio de latência e erros
+    verbose : bool
+        Uma linha de log por requisição
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ('127.0.0.1', 8001),
+        cache_dir: Optional[Path] = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        fail_first: int = 0,
+        error_status: int = 503,
+        seed: int = 42,
+        verbose: bool = False
+    ):
+        super().__init__(address, _Handler)
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.error_status = error_status
+        self.verbose = verbose
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._seen: Dict[str, int] = {}
+        self.stats = {'requests': 0, 'replayed': 0, 'synthesized': 0, 'errors_injected': 0, 'bad_requests': 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/process"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def plan(self, key: str) -> Tuple[float, bool]:
+        """(atraso em s, falhar?) para uma requisição do texto `key`."""
+        with self._lock:
+            self.stats['requests'] += 1
+            attempt = self._seen.get(key, 0)
+            self._seen[key] = attempt + 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            fail = attempt < self.fail_first or self._rng.random() < self.error_rate
+        return delay, fail
+
+    def process(self, params: Dict[str, str]) -> Dict:
+        """Resposta JSON de `/process` (ValueError para parâmetros inválidos)."""
+        model, lang = resolve_model(params.get('model'))
+        if 'tokenizer' not in params:
+            raise ValueError("Input must be tokenized by the stand-in server: pass 'tokenizer'")
+        text = params.get('data', '')
+        key = text_key(text)
+        cached = None if self.cache_dir is None else self.cache_dir / f"{key}.conllu"
+        if cached is not None and cached.exists():
+            result = cached.read_text(encoding='utf-8')
+            self._count('replayed')
+        else:
+            result = synthetic_conllu(text, lang)
+            self._count('synthesized')
+        if 'tagger' not in params:
+            result = blank_columns(result, TAGGER_COLUMNS)
+        if 'parser' not in params:
+            result = blank_columns(result, PARSER_COLUMNS)
+        return {'model': model, 'acknowledgements': ACKNOWLEDGEMENTS, 'result': result}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: UDPipeStandIn
+
+    def do_GET(self):
+        route = urlparse(self.path).path.rstrip('/')
+        if route.endswith('/models'):
+            self._send(200, {'models': {m: ['tokenizer', 'tagger', 'parser'] for m in MODELS},
+                             'default_model': DEFAULT_MODEL})
+        elif route.endswith('/stats'):
+            self._send(200, dict(self.server.stats))
+        elif route.endswith('/process'):
+            self._process()
+        else:
+            self._send(404, 'Not found')
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip('/').endswith('/process'):
+            self._process()
+        else:
+            self._send(404, 'Not found')
+
+    def _process(self):
+        params = _parse_params(self)
+        delay, fail = self.server.plan(text_key(params.get('data', '')))
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self.server._count('errors_injected')
+            self._send(self.server.error_status, 'Injected failure (udpipe_server.py)')
+            return
+        try:
+            response = self.server.process(params)
+        except ValueError as e:
+            self.server._count('bad_requests')
+            self._send(400, str(e))
+            return
+        self._send(200, response)
+
+    def _send(self, status: int, payload) -> None:
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; charset=utf-8'
+        else:
+            body, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), 'application/json'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+@contextlib.contextmanager
+def serve_in_background(**kwargs) -> Iterator[UDPipeStandIn]:
+    """
+    Sobe o servidor em uma thread (porta livre por padrão) durante o `with`.
+
+    Uso:
+        with serve_in_background(latency_ms=20) as server:
+            SyntacticMetrics(texto, parser_url=server.url)
+    """
+    kwargs.setdefault('address', ('127.0.0.1', 0))
+    server = UDPipeStandIn(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def build_cache(data_dir: Path, conllu_dir: Path, cache_dir: Path) -> Dict[str, int]:
+    """
+    Copia os CoNLL-U de uma extração (`{text_id}_{condição}.conllu`) para
+    `cache_dir/{sha1 do texto}.conllu`, que o servidor reproduz.
+
+    Returns
+    -------
+    dict
+        cached (copiados), missing (textos sem CoNLL-U ou com CoNLL-U vazio)
+    """
+    from corpus_reader import iter_corpus
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    counts = {'cached': 0, 'missing': 0}
+    for record in iter_corpus(Path(data_dir)):
+        source = Path(conllu_dir) / f"{record.text_id}_{record.condition}.conllu"
+        if not source.exists() or source.stat().st_size == 0:
+            counts['missing'] += 1
+            continue
+        shutil.copyfile(source, cache_dir / f"{text_key(record.text)}.conllu")
+        counts['cached'] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local UDPipe-compatible /process server for offline runs')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the server')
+    serve_parser.add_argument('--host', type=str, default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8001, help='Port (default: 8001)')
+    serve_parser.add_argument('--cache-dir', type=str, default=None,
+                              help='Directory of {sha1}.conllu files to replay (default: synthesize all parses)')
+    serve_parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay per request (default: 0)')
+    serve_parser.add_argument('--jitter-ms', type=float, default=0.0, help='Uniform jitter around the delay (default: 0)')
+    serve_parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail (default: 0)')
+    serve_parser.add_argument('--fail-first', type=int, default=0,
+                              help='Fail the first N requests for each text (default: 0)')
+    serve_parser.add_argument('--error-status', type=int, default=503, help='HTTP status of injected failures (default: 503)')
+    serve_parser.add_argument('--seed', type=int, default=42, help='Seed for latency/error draws (default: 42)')
+    serve_parser.add_argument('--verbose', action='store_true', help='Log every request')
+
+    cache_parser = subparsers.add_parser('cache', help='Build a replay cache from an extraction\'s CoNLL-U files')
+    cache_parser.add_argument('--data-dir', type=str, default='.', help='Directory containing data/ folder')
+    cache_parser.add_argument('--conllu-dir', type=str, default='metrics/udpipe_output',
+                              help='CoNLL-U files named {text_id}_{condition}.conllu')
+    cache_parser.add_argument('--cache-dir', type=str, default='metrics/udpipe_cache', help='Output cache directory')
+
+    args = parser.parse_args()
+
+    if args.command == 'cache':
+        counts = build_cache(Path(args.data_dir), Path(args.conllu_dir), Path(args.cache_dir))
+        print(f"✓ {counts['cached']} CoNLL-U em {args.cache_dir} ({counts['missing']} textos sem parse)")
+        return
+
+    server = UDPipeStandIn(
+        address=(args.host, args.port),
+        cache_dir=args.cache_dir,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        fail_first=args.fail_first,
+        error_status=args.error_status,
+        seed=args.seed,
+        verbose=args.verbose
+    )
+    print(f"🌐 UDPipe local em {server.url}")
+    if server.cache_dir is not None:
+        print(f"   • Replay: {server.cache_dir} ({len(list(server.cache_dir.glob('*.conllu')))} parses)")
+    print(f"   • Latência: {args.latency_ms:g} ± {args.jitter_ms:g} ms; erros: {args.error_rate:.0%}"
+          + (f" + {args.fail_first} primeiras por texto" if args.fail_first else ""))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n✓ {json.dumps(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
 """
 Módulo para análise temporal (windowed) de métricas.
 Divide textos em janelas e calcula métricas para cada janela.
+Tokenização via `tokenizer_registry` (Punkt carregado uma vez por idioma).
 """
 
-import nltk
+import sys
 from typing import List, Dict, Tuple
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent))
+from tokenizer_registry import get_tokenizers
+
 
 class WindowedAnalysis:
     """
@@ -65,7 +69,7 @@ class WindowedAnalysis:
         Usado para métricas léxicas.
         """
         # Tokenizar
-        tokens = nltk.word_tokenize(self.text, language=self.nltk_lang)
+        tokens = get_tokenizers(self.nltk_lang).word_tokenize(self.text)
         total_tokens = len(tokens)
         
         if total_tokens == 0:
@@ -101,7 +105,8 @@ class WindowedAnalysis:
         Usado para métricas sintáticas (preserva integridade da árvore).
         """
         # Tokenizar sentenças
-        sentences = nltk.sent_tokenize(self.text, language=self.nltk_lang)
+        tokenizers = get_tokenizers(self.nltk_lang)
+        sentences = tokenizers.sent_tokenize(self.text)
         
         if not sentences:
             return []
@@ -109,7 +114,7 @@ class WindowedAnalysis:
         # Calcular tamanho de cada sentença em tokens
         sent_lens = []
         for sent in sentences:
-            tokens = nltk.word_tokenize(sent, language=self.nltk_lang)
+            tokens = tokenizers.word_tokenize(sent)
             sent_lens.append(len(tokens))
         
         total_tokens = sum(sent_lens)
@@ -176,7 +181,7 @@ def validate_text_for_windowed_analysis(text: str, lang: str, min_tokens: int =
     nltk_lang = "portuguese" if lang == "pt" else "english"
     
     try:
-        tokens = nltk.word_tokenize(text, language=nltk_lang)
+        tokens = get_tokenizers(nltk_lang).word_tokenize(text)
         n_tokens = len(tokens)
         
         if n_tokens < min_tokens:
@@ -12,11 +12,14 @@ Calcula divergência média de baseline em cada dimensão.
 
 import pandas as pd
 import numpy as np
+import sys
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent / "analysis"))
+from feature_store import get_store
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent.parent
-METRICS_FILE = BASE_DIR / "metrics_filtered/all_texts_filtered.csv"
 DIVERGENCE_FILE = BASE_DIR / "analysis/03_method_comparison/data/metrics_divergence.csv"
 OUTPUT_FILE = BASE_DIR / "scripts/plots_on_demand/divergence_by_dimension.csv"
 
@@ -26,12 +29,10 @@ print("=" * 70)
 
 # Carregar dados
 print("\n[1/3] Carregando dados...")
-df_metrics = pd.read_csv(METRICS_FILE)
 df_divergence = pd.read_csv(DIVERGENCE_FILE)
 
 # Separar métricas por dimensão
-metadata_cols = ['text_id', 'author', 'title', 'sample_idx', 'rep', 'condition', 'lang']
-all_metrics = [col for col in df_metrics.columns if col not in metadata_cols]
+all_metrics = get_store(BASE_DIR).metric_cols
 
 lexical_metrics = [m for m in all_metrics if m.startswith('basic_')]
 syntactic_upos = [m for m in all_metrics if 'UPOS_' in m and '_prop' in m]